@@ -1,4 +1,44 @@
+from collections.abc import Iterator
+from pathlib import Path
+
 import pytest
 
+from qecc.instrumentation import Instrumentation, instrument
+
 # Let pytest make assertion errors nice, even when the assert isn't in the test file
 pytest.register_assert_rewrite("tests.utils")
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption("--trace-output", type=Path, default=None, help="write a Chrome trace of every instrumented stage run by the tests to this path")
+    parser.addoption("--trace-memory", action="store_true", help="with --trace-output, also record the memory allocated in each stage")
+    parser.addoption("--result-cache", type=Path, default=None, help="seed sampled simulations, and cache their results in this directory")
+    parser.addoption("--result-cache-max-bytes", type=int, default=64 * 2**20)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _trace(request: pytest.FixtureRequest) -> Iterator[None]:
+    trace_output = request.config.getoption("--trace-output")
+    if trace_output is None:
+        yield
+        return
+    with instrument(Instrumentation(track_memory=request.config.getoption("--trace-memory"))) as instrumentation:
+        yield
+    instrumentation.write_chrome_trace(trace_output)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _result_cache(request: pytest.FixtureRequest) -> Iterator[None]:
+    result_cache_dir = request.config.getoption("--result-cache")
+    if result_cache_dir is None:
+        yield
+        return
+    # Imported here, so tests.utils is imported after its asserts are registered for rewriting
+    from qecc.result_cache import use_result_cache
+    from tests.utils import QuantumCircuitTest
+
+    use_result_cache(result_cache_dir, max_bytes=request.config.getoption("--result-cache-max-bytes"))
+    QuantumCircuitTest.SIMULATION_SEED = 0
+    yield
+    QuantumCircuitTest.SIMULATION_SEED = None
+    use_result_cache(None)
@@ -1,33 +1,188 @@
-from .nine_qubit_shors_code import (
-    apply_nine_qubit_shors_code_bit_flip_correction,
-    apply_nine_qubit_shors_code_phase_flip_correction,
-    get_nine_qubit_shors_code_bit_flip_syndrome_extraction_circuit,
-    get_nine_qubit_shors_code_decoding_circuit,
-    get_nine_qubit_shors_code_encoding_circuit,
-    get_nine_qubit_shors_code_phase_flip_syndrome_extraction_circuit,
-    get_nine_qubit_shors_code_syndrome_extraction_circuit,
-)
-from .three_qubit_bit_flip import apply_three_qubit_bit_flip_correction, get_three_qubit_bit_flip_encoding_decoding_circuit, get_three_qubit_bit_flip_syndrome_extraction_circuit
-from .three_qubit_phase_flip import (
-    apply_three_qubit_phase_flip_correction,
-    get_three_qubit_phase_flip_decoding_circuit,
-    get_three_qubit_phase_flip_encoding_circuit,
-    get_three_qubit_phase_flip_syndrome_extraction_circuit,
-)
+"""
+Every public name is resolved lazily, on first access, so importing `qecc` doesn't import Qiskit (or any of the code
+  modules) until something that needs it is used
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .artifact_store import ArtifactStore
+    from .cache import CircuitCacheInfo, cached_circuit, circuit_cache_info, clear_circuit_cache, use_artifact_store
+    from .codes import NINE_QUBIT_SHORS_CODE, SEVEN_QUBIT_STEANE_CODE, THREE_QUBIT_BIT_FLIP_CODE, THREE_QUBIT_PHASE_FLIP_CODE, StabilizerCode
+    from .concatenation import get_concatenated_decoding_circuit, get_concatenated_encoding_circuit
+    from .fault_enumeration import FaultEnumerationResult, enumerate_faults
+    from .fingerprint import circuit_fingerprint
+    from .gate_list import GateList
+    from .instrumentation import Instrumentation, instrument
+    from .logical_error_rate import LogicalErrorRateEstimate, estimate_logical_error_rate
+    from .measurement_record import MeasurementRecord
+    from .memory_experiment import DetectorRound, MemoryExperiment
+    from .nine_qubit_shors_code import (
+        apply_nine_qubit_shors_code_bit_flip_correction,
+        apply_nine_qubit_shors_code_phase_flip_correction,
+        get_nine_qubit_shors_code_bit_flip_coherent_correction_circuit,
+        get_nine_qubit_shors_code_bit_flip_syndrome_extraction_circuit,
+        get_nine_qubit_shors_code_coherent_correction_circuit,
+        get_nine_qubit_shors_code_decoding_circuit,
+        get_nine_qubit_shors_code_encoding_circuit,
+        get_nine_qubit_shors_code_phase_flip_coherent_correction_circuit,
+        get_nine_qubit_shors_code_phase_flip_syndrome_extraction_circuit,
+        get_nine_qubit_shors_code_syndrome_extraction_circuit,
+    )
+    from .parity_check import ParityCheckMatrix
+    from .pauli_frame import PauliFrameSimulator
+    from .repetition_code import (
+        apply_repetition_code_correction,
+        decode_repetition_code_syndromes,
+        get_repetition_code,
+        get_repetition_code_decoding_circuit,
+        get_repetition_code_encoding_circuit,
+        get_repetition_code_syndrome_extraction_circuit,
+    )
+    from .result_cache import ResultCache, ResultCacheInfo, use_result_cache
+    from .sequential_test import SequentialTestResult, run_sequential_ratio_test
+    from .three_qubit_bit_flip import (
+        apply_three_qubit_bit_flip_correction,
+        get_three_qubit_bit_flip_coherent_correction_circuit,
+        get_three_qubit_bit_flip_encoding_decoding_circuit,
+        get_three_qubit_bit_flip_syndrome_extraction_circuit,
+    )
+    from .three_qubit_phase_flip import (
+        apply_three_qubit_phase_flip_correction,
+        get_three_qubit_phase_flip_coherent_correction_circuit,
+        get_three_qubit_phase_flip_decoding_circuit,
+        get_three_qubit_phase_flip_encoding_circuit,
+        get_three_qubit_phase_flip_syndrome_extraction_circuit,
+    )
+    from .transpile_cache import TranspileCache, TranspileCacheInfo, transpile_cache
+
+# The public names defined in each submodule
+_SUBMODULE_EXPORTS = {
+    "artifact_store": ("ArtifactStore",),
+    "cache": ("CircuitCacheInfo", "cached_circuit", "circuit_cache_info", "clear_circuit_cache", "use_artifact_store"),
+    "codes": ("NINE_QUBIT_SHORS_CODE", "SEVEN_QUBIT_STEANE_CODE", "THREE_QUBIT_BIT_FLIP_CODE", "THREE_QUBIT_PHASE_FLIP_CODE", "StabilizerCode"),
+    "concatenation": ("get_concatenated_decoding_circuit", "get_concatenated_encoding_circuit"),
+    "fault_enumeration": ("FaultEnumerationResult", "enumerate_faults"),
+    "fingerprint": ("circuit_fingerprint",),
+    "gate_list": ("GateList",),
+    "instrumentation": ("Instrumentation", "instrument"),
+    "logical_error_rate": ("LogicalErrorRateEstimate", "estimate_logical_error_rate"),
+    "measurement_record": ("MeasurementRecord",),
+    "memory_experiment": ("DetectorRound", "MemoryExperiment"),
+    "nine_qubit_shors_code": (
+        "apply_nine_qubit_shors_code_bit_flip_correction",
+        "apply_nine_qubit_shors_code_phase_flip_correction",
+        "get_nine_qubit_shors_code_bit_flip_coherent_correction_circuit",
+        "get_nine_qubit_shors_code_bit_flip_syndrome_extraction_circuit",
+        "get_nine_qubit_shors_code_coherent_correction_circuit",
+        "get_nine_qubit_shors_code_decoding_circuit",
+        "get_nine_qubit_shors_code_encoding_circuit",
+        "get_nine_qubit_shors_code_phase_flip_coherent_correction_circuit",
+        "get_nine_qubit_shors_code_phase_flip_syndrome_extraction_circuit",
+        "get_nine_qubit_shors_code_syndrome_extraction_circuit",
+    ),
+    "parity_check": ("ParityCheckMatrix",),
+    "pauli_frame": ("PauliFrameSimulator",),
+    "repetition_code": (
+        "apply_repetition_code_correction",
+        "decode_repetition_code_syndromes",
+        "get_repetition_code",
+        "get_repetition_code_decoding_circuit",
+        "get_repetition_code_encoding_circuit",
+        "get_repetition_code_syndrome_extraction_circuit",
+    ),
+    "result_cache": ("ResultCache", "ResultCacheInfo", "use_result_cache"),
+    "sequential_test": ("SequentialTestResult", "run_sequential_ratio_test"),
+    "three_qubit_bit_flip": (
+        "apply_three_qubit_bit_flip_correction",
+        "get_three_qubit_bit_flip_coherent_correction_circuit",
+        "get_three_qubit_bit_flip_encoding_decoding_circuit",
+        "get_three_qubit_bit_flip_syndrome_extraction_circuit",
+    ),
+    "three_qubit_phase_flip": (
+        "apply_three_qubit_phase_flip_correction",
+        "get_three_qubit_phase_flip_coherent_correction_circuit",
+        "get_three_qubit_phase_flip_decoding_circuit",
+        "get_three_qubit_phase_flip_encoding_circuit",
+        "get_three_qubit_phase_flip_syndrome_extraction_circuit",
+    ),
+    "transpile_cache": ("TranspileCache", "TranspileCacheInfo", "transpile_cache"),
+}
+_EXPORT_SUBMODULES = {name: submodule for submodule, names in _SUBMODULE_EXPORTS.items() for name in names}
 
 __all__ = [
+    "NINE_QUBIT_SHORS_CODE",
+    "SEVEN_QUBIT_STEANE_CODE",
+    "THREE_QUBIT_BIT_FLIP_CODE",
+    "THREE_QUBIT_PHASE_FLIP_CODE",
+    "ArtifactStore",
+    "CircuitCacheInfo",
+    "DetectorRound",
+    "FaultEnumerationResult",
+    "GateList",
+    "Instrumentation",
+    "LogicalErrorRateEstimate",
+    "MeasurementRecord",
+    "MemoryExperiment",
+    "ParityCheckMatrix",
+    "PauliFrameSimulator",
+    "ResultCache",
+    "ResultCacheInfo",
+    "SequentialTestResult",
+    "StabilizerCode",
+    "TranspileCache",
+    "TranspileCacheInfo",
     "apply_nine_qubit_shors_code_bit_flip_correction",
     "apply_nine_qubit_shors_code_phase_flip_correction",
+    "apply_repetition_code_correction",
     "apply_three_qubit_bit_flip_correction",
     "apply_three_qubit_phase_flip_correction",
+    "cached_circuit",
+    "circuit_cache_info",
+    "circuit_fingerprint",
+    "clear_circuit_cache",
+    "decode_repetition_code_syndromes",
+    "enumerate_faults",
+    "estimate_logical_error_rate",
+    "get_concatenated_decoding_circuit",
+    "get_concatenated_encoding_circuit",
+    "get_nine_qubit_shors_code_bit_flip_coherent_correction_circuit",
     "get_nine_qubit_shors_code_bit_flip_syndrome_extraction_circuit",
+    "get_nine_qubit_shors_code_coherent_correction_circuit",
     "get_nine_qubit_shors_code_decoding_circuit",
     "get_nine_qubit_shors_code_encoding_circuit",
+    "get_nine_qubit_shors_code_phase_flip_coherent_correction_circuit",
     "get_nine_qubit_shors_code_phase_flip_syndrome_extraction_circuit",
     "get_nine_qubit_shors_code_syndrome_extraction_circuit",
+    "get_repetition_code",
+    "get_repetition_code_decoding_circuit",
+    "get_repetition_code_encoding_circuit",
+    "get_repetition_code_syndrome_extraction_circuit",
+    "get_three_qubit_bit_flip_coherent_correction_circuit",
     "get_three_qubit_bit_flip_encoding_decoding_circuit",
     "get_three_qubit_bit_flip_syndrome_extraction_circuit",
+    "get_three_qubit_phase_flip_coherent_correction_circuit",
     "get_three_qubit_phase_flip_decoding_circuit",
     "get_three_qubit_phase_flip_encoding_circuit",
     "get_three_qubit_phase_flip_syndrome_extraction_circuit",
+    "instrument",
+    "run_sequential_ratio_test",
+    "transpile_cache",
+    "use_artifact_store",
+    "use_result_cache",
 ]
+
+
+def __getattr__(name: str) -> object:
+    submodule = _EXPORT_SUBMODULES.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    # Cache it as a real module attribute, so __getattr__ isn't called for it again
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,107 @@
+"""
+On-disk store of built (and transpiled) circuits, so a new process can load them rather than rebuilding them
+
+Each circuit is saved as a QPY (or OpenQASM 3) file, alongside a JSON file recording the store version and Qiskit
+  version that wrote it, a hash of `qecc`'s source, and a hash of its contents. A circuit is only loaded if all of those
+  match, so a stale or partially written artifact is treated as missing (and rebuilt and overwritten by the caller).
+  Hashing the whole package's source, rather than just each builder's, means changing any helper a builder calls (e.g.
+  the CNOT schedule of syndrome extraction) also invalidates its circuits
+"""
+
+import functools
+import hashlib
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import qiskit
+from qiskit import QuantumCircuit, qasm3, qpy
+
+# Bumped whenever the layout of the store changes, invalidating every existing artifact
+STORE_VERSION = 1
+ARTIFACT_FORMATS = ("qpy", "qasm3")
+
+
+def _hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@functools.cache
+def get_source_hash() -> str:
+    """
+    A hash of the source of every module of `qecc`, computed once per process
+    """
+    package = Path(__file__).parent
+    hasher = hashlib.blake2b(digest_size=16)
+    for path in sorted(package.rglob("*.py")):
+        hasher.update(path.relative_to(package).as_posix().encode())
+        hasher.update(_hash(path.read_bytes()).encode())
+    return hasher.hexdigest()
+
+
+def _write_atomically(path: Path, data: bytes) -> None:
+    # Write to a file of our own then rename, so concurrent readers never see a partial file, and concurrent writers of
+    #  the same artifact don't clobber each other's temporary files
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    Path(tmp_name).replace(path)
+
+
+class ArtifactStore:
+    """
+    A directory of circuits, keyed by arbitrary strings
+
+    OpenQASM 3 artifacts are human-readable, but lose register names and anything OpenQASM 3 can't express, and loading
+      them needs the optional `qiskit_qasm3_import` package
+    """
+
+    def __init__(self, directory: Path, *, artifact_format: str = "qpy") -> None:
+        if artifact_format not in ARTIFACT_FORMATS:
+            raise ValueError(f"Unknown artifact format: {artifact_format}")
+        self.directory = directory
+        self.artifact_format = artifact_format
+        self.loads = 0
+        self.saves = 0
+
+    def _get_paths(self, key: str) -> tuple[Path, Path]:
+        # Keys can contain anything, so files are named by their hash
+        name = _hash(key.encode())
+        return self.directory / f"{name}.{self.artifact_format}", self.directory / f"{name}.json"
+
+    def _get_metadata(self, key: str, data: bytes) -> dict[str, object]:
+        return {"key": key, "store_version": STORE_VERSION, "qiskit_version": qiskit.__version__, "source_hash": get_source_hash(), "format": self.artifact_format, "hash": _hash(data)}
+
+    def save(self, key: str, qc: QuantumCircuit) -> None:
+        if self.artifact_format == "qpy":
+            buffer = io.BytesIO()
+            qpy.dump(qc, buffer)
+            data = buffer.getvalue()
+        else:
+            data = qasm3.dumps(qc).encode()
+        data_path, metadata_path = self._get_paths(key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _write_atomically(data_path, data)
+        _write_atomically(metadata_path, json.dumps(self._get_metadata(key, data)).encode())
+        self.saves += 1
+
+    def load(self, key: str) -> QuantumCircuit | None:
+        """
+        Load the circuit saved under the key, or return None if there isn't one, or it fails validation
+        """
+        data_path, metadata_path = self._get_paths(key)
+        try:
+            metadata = json.loads(metadata_path.read_bytes())
+            data = data_path.read_bytes()
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if metadata != self._get_metadata(key, data):
+            return None
+        if self.artifact_format == "qpy":
+            (out,) = qpy.load(io.BytesIO(data))
+        else:
+            out = qasm3.loads(data.decode())
+        self.loads += 1
+        return out
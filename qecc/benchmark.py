@@ -0,0 +1,134 @@
+"""
+Benchmarks of each stage of error correcting each code: building its full error correction circuit, transpiling it,
+  simulating it under noise (at several shot counts), and decoding batches of syndromes (at several batch sizes)
+
+Results are written as JSON, and can be compared against a stored baseline, flagging any stage that has become slower
+  by more than a given factor
+"""
+
+import json
+import platform
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import qiskit
+import qiskit_aer
+from qiskit import transpile
+
+from .cache import clear_circuit_cache
+from .codes import CODES
+from .logical_error_rate import get_logical_failures, sample_depolarizing_errors
+from .simulation import statevector_simulator
+from .threshold import CODE_NAMES, get_noisy_error_correction_circuit, run_threshold_point
+
+STAGES = ("build", "transpile", "simulate", "decode")
+PHYSICAL_ERROR_RATE = 0.01
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    code: str
+    stage: str
+    # The number of shots (simulate) or trials (decode), or the number of instructions in the circuit (build, transpile)
+    size: int
+    seconds: float
+
+    @property
+    def key(self) -> tuple[str, str, int]:
+        return self.code, self.stage, self.size
+
+
+class Regression(NamedTuple):
+    result: BenchmarkResult
+    baseline_seconds: float
+
+    @property
+    def slowdown(self) -> float:
+        return self.result.seconds / self.baseline_seconds
+
+
+def _time(function: Callable[[], object], repeats: int) -> float:
+    # The minimum is the least noisy estimate, since anything else running only ever makes a repeat slower
+    out = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        out = min(out, time.perf_counter() - start)
+    return out
+
+
+def _build(code_name: str) -> qiskit.QuantumCircuit:
+    # Every builder the circuit is assembled from would otherwise be served from the cache
+    clear_circuit_cache()
+    return get_noisy_error_correction_circuit(code_name)
+
+
+def run_benchmarks(
+    code_names: Sequence[str] = CODE_NAMES,
+    *,
+    shot_counts: Sequence[int] = (100, 1_000, 10_000),
+    trial_counts: Sequence[int] = (1_000, 100_000, 1_000_000),
+    repeats: int = 3,
+    seed: int = 0,
+) -> list[BenchmarkResult]:
+    """
+    Time each stage for each code, taking the fastest of the given number of repeats
+
+    Simulation runs the noisy error correction circuit under depolarizing noise on the stabilizer simulator, and decoding
+      runs the code's lookup table decoder over a batch of sampled depolarizing errors
+    """
+    codes = {code.name: code for code in CODES}
+    out = []
+    for code_name in code_names:
+        qc = _build(code_name)
+        out.append(BenchmarkResult(code_name, "build", qc.size(), _time(lambda code_name=code_name: _build(code_name), repeats)))
+        out.append(BenchmarkResult(code_name, "transpile", qc.size(), _time(lambda qc=qc: transpile(qc, statevector_simulator), repeats)))
+        for num_shots in shot_counts:
+            seconds = _time(lambda code_name=code_name, num_shots=num_shots: run_threshold_point(code_name, "depolarizing", "z", PHYSICAL_ERROR_RATE, num_shots, seed=seed), repeats)
+            out.append(BenchmarkResult(code_name, "simulate", num_shots, seconds))
+        code = codes[code_name]
+        for num_trials in trial_counts:
+            x_errors, z_errors = sample_depolarizing_errors(np.random.default_rng(seed), num_trials, code.num_data_qubits, PHYSICAL_ERROR_RATE)
+            seconds = _time(lambda code=code, x_errors=x_errors, z_errors=z_errors: get_logical_failures(code, x_errors, z_errors), repeats)
+            out.append(BenchmarkResult(code_name, "decode", num_trials, seconds))
+    return out
+
+
+def get_environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.machine(),
+        "numpy": np.__version__,
+        "qiskit": qiskit.__version__,
+        "qiskit_aer": qiskit_aer.__version__,
+    }
+
+
+def write_benchmark_results(path: Path, results: Sequence[BenchmarkResult]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"environment": get_environment(), "results": [asdict(result) for result in results]}, indent=2) + "\n")
+
+
+def read_benchmark_results(path: Path) -> list[BenchmarkResult]:
+    return [BenchmarkResult(**result) for result in json.loads(path.read_text())["results"]]
+
+
+def compare_to_baseline(results: Sequence[BenchmarkResult], baseline: Sequence[BenchmarkResult], *, tolerance: float = 1.5, min_seconds: float = 1e-3) -> list[Regression]:
+    """
+    Return every result more than tolerance times slower than the baseline result with the same code, stage, and size
+
+    Results without a baseline are skipped, as are differences of less than min_seconds, which are within timer noise
+      for the quickest stages
+    """
+    baseline_seconds = {result.key: result.seconds for result in baseline}
+    out = []
+    for result in results:
+        seconds = baseline_seconds.get(result.key)
+        if seconds is not None and result.seconds > seconds * tolerance and result.seconds - seconds > min_seconds:
+            out.append(Regression(result, seconds))
+    return out
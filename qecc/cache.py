@@ -0,0 +1,150 @@
+"""
+Cache of built circuit templates, so each `get_*_circuit` builder only constructs its circuit once
+
+With an artifact store attached (see `use_artifact_store`), templates are also saved to disk, so later processes load
+  them rather than building them again
+"""
+
+import inspect
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from functools import wraps
+from pathlib import Path
+from typing import NamedTuple
+
+from qiskit import QuantumCircuit
+
+from .artifact_store import ArtifactStore
+from .instrumentation import span
+from .transpile_cache import transpile_cache
+
+
+class CircuitCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+class CircuitTemplateCache:
+    """
+    LRU cache of circuit templates, keyed by builder name and arguments
+
+    Templates are never handed out directly, every lookup returns a copy, so callers are free to mutate (e.g.
+      `compose(..., inplace=True)` into) whatever they get back without corrupting the cache
+    """
+
+    def __init__(self, maxsize: int | None = None, artifact_store: ArtifactStore | None = None) -> None:
+        self.maxsize = maxsize
+        self.artifact_store = artifact_store
+        self.hits = 0
+        self.misses = 0
+        self._templates: OrderedDict[tuple[str, Hashable], QuantumCircuit] = OrderedDict()
+
+    def get(self, name: str, args: Hashable, build: Callable[[], QuantumCircuit]) -> QuantumCircuit:
+        key = (name, args)
+        template = self._templates.get(key)
+        if template is None:
+            self.misses += 1
+            with span("build", builder=name) as build_span:
+                template = self._load_or_build(key, build)
+                if build_span is not None:
+                    build_span.record_circuit(template)
+            self._templates[key] = template
+            self._evict_overflow()
+        else:
+            self.hits += 1
+            self._templates.move_to_end(key)
+        return template.copy()
+
+    def _load_or_build(self, key: tuple[str, Hashable], build: Callable[[], QuantumCircuit]) -> QuantumCircuit:
+        if self.artifact_store is None:
+            return build()
+        name, args = key
+        artifact_key = f"{name}{args!r}"
+        template = self.artifact_store.load(artifact_key)
+        if template is None:
+            template = build()
+            self.artifact_store.save(artifact_key, template)
+        return template
+
+    def invalidate(self, name: str | None = None) -> int:
+        """
+        Drop every template built by the named builder (or every template, if no name is given), returning the
+          number of templates dropped
+        """
+        if name is None:
+            num_dropped = len(self._templates)
+            self._templates.clear()
+            return num_dropped
+        keys = [key for key in self._templates if key[0] == name]
+        for key in keys:
+            del self._templates[key]
+        return len(keys)
+
+    def resize(self, maxsize: int | None) -> None:
+        self.maxsize = maxsize
+        self._evict_overflow()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> CircuitCacheInfo:
+        return CircuitCacheInfo(self.hits, self.misses, self.maxsize, len(self._templates))
+
+    def _evict_overflow(self) -> None:
+        if self.maxsize is None:
+            return
+        while len(self._templates) > self.maxsize:
+            self._templates.popitem(last=False)
+
+
+circuit_template_cache = CircuitTemplateCache()
+
+
+def cached_circuit[**P](builder: Callable[P, QuantumCircuit]) -> Callable[P, QuantumCircuit]:
+    """
+    Decorator for circuit builders, which builds each distinct circuit once, and returns a fresh copy of it on every call
+    """
+    name = _builder_name(builder)
+    signature = inspect.signature(builder)
+
+    @wraps(builder)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> QuantumCircuit:
+        # Keyed on the value of every parameter, defaults included, so f(3), f(distance=3), and (with a default of 3) f()
+        #  share a template
+        arguments = signature.bind(*args, **kwargs)
+        arguments.apply_defaults()
+        return circuit_template_cache.get(name, tuple(arguments.arguments.items()), lambda: builder(*args, **kwargs))
+
+    return wrapper
+
+
+def use_artifact_store(directory: Path | None, *, artifact_format: str = "qpy") -> ArtifactStore | None:
+    """
+    Back both the built circuit cache and the transpiled circuit cache with an artifact store in the given directory
+      (or detach them from any store, if it's None), returning the store
+    """
+    store = None if directory is None else ArtifactStore(directory, artifact_format=artifact_format)
+    circuit_template_cache.artifact_store = store
+    transpile_cache.artifact_store = store
+    return store
+
+
+def circuit_cache_info() -> CircuitCacheInfo:
+    return circuit_template_cache.info()
+
+
+def clear_circuit_cache(builder: Callable[..., QuantumCircuit] | None = None) -> int:
+    """
+    Drop the cached templates for the given builder, or for every builder if none is given
+    """
+    if builder is None:
+        return circuit_template_cache.invalidate()
+    return circuit_template_cache.invalidate(_builder_name(builder))
+
+
+def _builder_name(builder: Callable[..., QuantumCircuit]) -> str:
+    # `wraps` copies these across, so a decorated builder has the same name as the function it wraps
+    return f"{builder.__module__}.{builder.__qualname__}"
@@ -0,0 +1,82 @@
+"""
+Descriptions of each code over GF(2), for classical (rather than circuit-based) processing of errors, and for
+  generating the codes' circuits
+
+A Pauli error on n qubits is stored as a pair of length n bit vectors, the X part and the Z part (so Y is a 1 in both)
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .parity_check import ParityCheckMatrix
+
+
+@dataclass(frozen=True, eq=False)
+class StabilizerCode:
+    """
+    - z_checks: Z-type stabilizers, measured by the bit-flip syndrome extraction, which detect X errors
+    - x_checks: X-type stabilizers, measured by the phase-flip syndrome extraction, which detect Z errors
+    - logical_x/logical_z: logical operators, as a (2, n) array with the X part in row 0 and the Z part in row 1
+
+    Row i of each check matrix is bit i of the corresponding syndrome, matching the order of the syndrome registers
+      in the circuits
+    """
+
+    name: str
+    z_checks: ParityCheckMatrix
+    x_checks: ParityCheckMatrix
+    logical_x: np.ndarray
+    logical_z: np.ndarray
+
+    @property
+    def num_data_qubits(self) -> int:
+        return self.z_checks.num_qubits
+
+
+def _logical(x_part: list[int], z_part: list[int]) -> np.ndarray:
+    return np.array([x_part, z_part], dtype=np.uint8)
+
+
+def _hamming_checks(num_checks: int) -> ParityCheckMatrix:
+    # Check i covers the qubits whose (1-indexed) position has bit i set, so the syndrome of an error is its position
+    num_qubits = 2**num_checks - 1
+    return ParityCheckMatrix.from_supports(([qubit for qubit in range(num_qubits) if (qubit + 1) >> check & 1] for check in range(num_checks)), num_qubits)
+
+
+THREE_QUBIT_BIT_FLIP_CODE = StabilizerCode(
+    name="three_qubit_bit_flip",
+    z_checks=ParityCheckMatrix([[1, 0, 1], [0, 1, 1]], 3),
+    x_checks=ParityCheckMatrix([], 3),
+    logical_x=_logical([1, 1, 1], [0, 0, 0]),
+    logical_z=_logical([0, 0, 0], [1, 1, 1]),
+)
+
+# |0> is encoded as |+++>, so the logical operators are swapped relative to the bit flip code
+THREE_QUBIT_PHASE_FLIP_CODE = StabilizerCode(
+    name="three_qubit_phase_flip",
+    z_checks=ParityCheckMatrix([], 3),
+    x_checks=ParityCheckMatrix([[1, 0, 1], [0, 1, 1]], 3),
+    logical_x=_logical([0, 0, 0], [1, 1, 1]),
+    logical_z=_logical([1, 1, 1], [0, 0, 0]),
+)
+
+NINE_QUBIT_SHORS_CODE = StabilizerCode(
+    name="nine_qubit_shors_code",
+    # The three qubit bit flip code's checks, on each block of 3
+    z_checks=ParityCheckMatrix.from_supports(((3 * block + offset, 3 * block + 2) for block in range(3) for offset in range(2)), 9),
+    # Block 1 gives syndrome 01, block 2 10, and block 3 11
+    x_checks=ParityCheckMatrix.from_supports(((0, 1, 2, 6, 7, 8), (3, 4, 5, 6, 7, 8)), 9),
+    logical_x=_logical([0] * 9, [1] * 9),
+    logical_z=_logical([1] * 9, [0] * 9),
+)
+
+SEVEN_QUBIT_STEANE_CODE = StabilizerCode(
+    name="seven_qubit_steane_code",
+    z_checks=_hamming_checks(3),
+    x_checks=_hamming_checks(3),
+    logical_x=_logical([1] * 7, [0] * 7),
+    logical_z=_logical([0] * 7, [1] * 7),
+)
+
+CODES = (THREE_QUBIT_BIT_FLIP_CODE, THREE_QUBIT_PHASE_FLIP_CODE, NINE_QUBIT_SHORS_CODE, SEVEN_QUBIT_STEANE_CODE)
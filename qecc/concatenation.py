@@ -0,0 +1,94 @@
+"""
+Concatenated codes, where every qubit of an outer code's codeword is itself encoded in an inner code
+
+Each code's encoder encodes the state of its first qubit, so a concatenated encoder applies the outermost encoder on the
+  first qubit of each of its blocks, then the next encoder on the first qubit of each of that block's sub-blocks, and so
+  on, down to the innermost encoder on each block of contiguous qubits. e.g. Shor's code is the three qubit phase flip
+  code, with each of its qubits encoded in the three qubit bit flip code
+
+Circuits are built by appending each gate of the base encoders straight onto a single gate list, at its qubit's offset
+  in the final layout, rather than by composing nested sub-circuits, so building takes time linear in the size of the
+  final circuit, which is lowered to a `QuantumCircuit` once at the end
+"""
+
+from collections.abc import Callable, Sequence
+
+from qiskit import QuantumCircuit
+
+from .cache import cached_circuit
+from .codes import NINE_QUBIT_SHORS_CODE, SEVEN_QUBIT_STEANE_CODE, THREE_QUBIT_BIT_FLIP_CODE, THREE_QUBIT_PHASE_FLIP_CODE
+from .gate_list import GateInstruction, GateList
+from .seven_qubit_steane_code import get_seven_qubit_steane_code_encoding_circuit
+from .three_qubit_bit_flip import get_three_qubit_bit_flip_encoding_decoding_circuit
+from .three_qubit_phase_flip import get_three_qubit_phase_flip_encoding_circuit
+
+_ENCODING_CIRCUITS: dict[str, Callable[[], QuantumCircuit]] = {
+    THREE_QUBIT_BIT_FLIP_CODE.name: get_three_qubit_bit_flip_encoding_decoding_circuit,
+    THREE_QUBIT_PHASE_FLIP_CODE.name: get_three_qubit_phase_flip_encoding_circuit,
+    SEVEN_QUBIT_STEANE_CODE.name: get_seven_qubit_steane_code_encoding_circuit,
+}
+# Codes which are themselves concatenations, outermost first
+_CONCATENATED_CODES = {
+    NINE_QUBIT_SHORS_CODE.name: (THREE_QUBIT_PHASE_FLIP_CODE.name, THREE_QUBIT_BIT_FLIP_CODE.name),
+}
+
+
+def get_base_code_names(code_names: Sequence[str]) -> tuple[str, ...]:
+    """
+    Given the code at each level of a concatenation (outermost first), expand any codes which are themselves
+      concatenations (i.e. Shor's code) into their levels
+    """
+    out: list[str] = []
+    for code_name in code_names:
+        if code_name in _CONCATENATED_CODES:
+            out.extend(_CONCATENATED_CODES[code_name])
+        elif code_name in _ENCODING_CIRCUITS:
+            out.append(code_name)
+        else:
+            raise ValueError(f"Unknown code: {code_name}")
+    return tuple(out)
+
+
+def _append_concatenated_encoding(out: GateList, encodings: Sequence[GateList], block_sizes: Sequence[int], offset: int) -> None:
+    """
+    Append the encoding for the given levels onto the block of the output starting at offset, where block_sizes[i] is
+      the number of qubits in each block of level i (with one more entry than there are levels)
+    """
+    sub_block_size = block_sizes[1]
+    for instruction in encodings[0]:
+        out.instructions.append(GateInstruction(instruction.name, tuple(offset + qubit * sub_block_size for qubit in instruction.qubits)))
+    if len(encodings) > 1:
+        for start in range(offset, offset + block_sizes[0], sub_block_size):
+            _append_concatenated_encoding(out, encodings[1:], block_sizes[1:], start)
+
+
+def get_concatenated_encoding_gate_list(code_names: Sequence[str]) -> GateList:
+    """
+    Given the code at each level of a concatenation (outermost first), encode the first qubit in the concatenated code,
+      with the innermost blocks on contiguous qubits
+
+    e.g. ("seven_qubit_steane_code",) * 3 is the 343 qubit level-3 Steane code, and
+      ("three_qubit_phase_flip", "three_qubit_bit_flip") is the same circuit as Shor's code
+    """
+    base_code_names = get_base_code_names(code_names)
+    if not base_code_names:
+        raise ValueError("At least one code is needed")
+    encodings = [GateList.from_circuit(_ENCODING_CIRCUITS[code_name]()) for code_name in base_code_names]
+    # block_sizes[i] is the number of qubits in each block of level i, the last being the single qubits of the innermost
+    #  blocks
+    block_sizes = [1]
+    for encoding in reversed(encodings):
+        block_sizes.insert(0, block_sizes[0] * encoding.num_qubits)
+    out = GateList(block_sizes[0])
+    _append_concatenated_encoding(out, encodings, block_sizes, 0)
+    return out
+
+
+@cached_circuit
+def get_concatenated_encoding_circuit(code_names: tuple[str, ...]) -> QuantumCircuit:
+    return get_concatenated_encoding_gate_list(code_names).to_circuit()
+
+
+@cached_circuit
+def get_concatenated_decoding_circuit(code_names: tuple[str, ...]) -> QuantumCircuit:
+    return get_concatenated_encoding_gate_list(code_names).inverse().to_circuit()
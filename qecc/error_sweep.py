@@ -0,0 +1,57 @@
+"""
+Sweeping a deliberate error over every location in a circuit
+
+Every variant of the circuit is built up front, and all of them are simulated as one batch, rather than building and
+  running one circuit at a time
+"""
+
+from collections.abc import Callable, Iterable, Sequence
+from typing import NamedTuple
+
+from qiskit import QuantumCircuit
+
+from .simulation import simulate_circuits
+
+
+class ErrorLocation(NamedTuple):
+    """
+    A single-qubit Pauli error ("x", "y", or "z") on the given qubit, or no error if both are None
+    """
+
+    error: str | None
+    qubit: int | None
+
+
+NO_ERROR = ErrorLocation(None, None)
+
+
+def get_single_qubit_error_locations(num_qubits: int, errors: Sequence[str] = ("x", "z"), *, include_no_error: bool = False) -> list[ErrorLocation]:
+    """
+    Every single-qubit error of the given types on the given number of qubits, grouped by error type, then in qubit
+      order, optionally preceded by no error at all
+    """
+    out = [NO_ERROR] if include_no_error else []
+    out.extend(ErrorLocation(error, qubit) for error in errors for qubit in range(num_qubits))
+    return out
+
+
+def apply_error(qc: QuantumCircuit, location: ErrorLocation) -> None:
+    """
+    Given a quantum circuit, apply the error at the given location to it (doing nothing for `NO_ERROR`)
+    """
+    if location.error is not None:
+        getattr(qc, location.error)(location.qubit)
+
+
+def simulate_error_sweep(
+    build_circuit: Callable[[ErrorLocation], QuantumCircuit], locations: Iterable[ErrorLocation], num_shots: int = 1024, *, seed: int | None = None
+) -> dict[ErrorLocation, dict[str, int]]:
+    """
+    Given a function building the (measured) circuit with an error at a given location, build the circuit for each
+      location, simulate them all as one batch, and return the counts for each location
+
+    The results can be indexed by (error, qubit) tuples, e.g. `results["x", 3]`
+    """
+    locations = list(locations)
+    counts = simulate_circuits([build_circuit(location) for location in locations], num_shots=num_shots, seed=seed)
+    return dict(zip(locations, counts, strict=True))
@@ -0,0 +1,272 @@
+"""
+Exact (shot-free) outcome probabilities of the circuits built by `qecc`
+
+The circuit is run on a dense statevector, and every mid-circuit measurement (or reset) splits the simulation into a
+  branch per possible outcome, weighted by that outcome's probability, so `if_test` corrections can be applied to
+  each branch. The syndromes of the circuits in `qecc` are deterministic, so there is usually only a single branch
+
+Measurements at the very end of the circuit (e.g. from `measure_all`) aren't branched on, their joint distribution is
+  read straight off the final state of each branch
+"""
+
+import operator
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from qiskit import ClassicalRegister, QuantumCircuit
+from qiskit.circuit import Clbit, ControlledGate, Gate, IfElseOp, Store
+from qiskit.circuit.classical import expr, types
+from qiskit.circuit.exceptions import CircuitError
+from qiskit.quantum_info import Operator, Statevector
+
+from .instrumentation import span
+
+# Branches (and outcomes) less likely than this are dropped
+PROBABILITY_TOLERANCE = 1e-12
+
+
+@dataclass
+class _Branch:
+    probability: float
+    # The state, as a tensor with one axis per qubit, with qubit q on axis num_qubits - 1 - q (Qiskit's little-endian
+    #  ordering)
+    state: np.ndarray
+    clbits: list[int]
+
+
+def _get_matrix(gate: Gate) -> np.ndarray:
+    if isinstance(gate, ControlledGate):
+        # Built from the base gate, since synthesising multi-controlled gates is slow. The controls are the lowest
+        #  qubits, so the base gate acts on the indexes whose low bits are the control state
+        base_matrix = _get_matrix(gate.base_gate)
+        indexes = gate.ctrl_state + (np.arange(len(base_matrix)) << gate.num_ctrl_qubits)
+        out = np.eye(2**gate.num_qubits, dtype=complex)
+        out[np.ix_(indexes, indexes)] = base_matrix
+        return out
+    try:
+        return gate.to_matrix()
+    except CircuitError:
+        # Gates without a built-in matrix (e.g. state preparations) are synthesised from their definitions
+        return Operator(gate).data
+
+
+def _apply_matrix(state: np.ndarray, matrix: np.ndarray, qubits: Sequence[int]) -> np.ndarray:
+    num_qubits, num_targets = state.ndim, len(qubits)
+    # The matrix's rows and columns are indexed little-endian in its qubits, so its first tensor axis is the last qubit
+    axes = [num_qubits - 1 - qubit for qubit in reversed(qubits)]
+    out = np.tensordot(matrix.reshape((2,) * (2 * num_targets)), state, axes=(range(num_targets, 2 * num_targets), axes))
+    return np.moveaxis(out, range(num_targets), axes)
+
+
+def _project(state: np.ndarray, qubit: int, outcome: int) -> tuple[float, np.ndarray]:
+    """
+    Project the qubit onto the given outcome, returning the probability of the outcome, and the normalised state
+    """
+    axis = state.ndim - 1 - qubit
+    projected = np.zeros_like(state)
+    index = (slice(None),) * axis + (outcome,)
+    projected[index] = state[index]
+    probability = float(np.vdot(projected, projected).real)
+    if probability > PROBABILITY_TOLERANCE:
+        projected /= np.sqrt(probability)
+    return probability, projected
+
+
+_BINARY_OPERATIONS: dict[expr.Binary.Op, Callable[[int, int], int]] = {
+    expr.Binary.Op.BIT_AND: operator.and_,
+    expr.Binary.Op.BIT_OR: operator.or_,
+    expr.Binary.Op.BIT_XOR: operator.xor,
+    expr.Binary.Op.LOGIC_AND: lambda left, right: int(bool(left) and bool(right)),
+    expr.Binary.Op.LOGIC_OR: lambda left, right: int(bool(left) or bool(right)),
+    expr.Binary.Op.EQUAL: operator.eq,
+    expr.Binary.Op.NOT_EQUAL: operator.ne,
+    expr.Binary.Op.LESS: operator.lt,
+    expr.Binary.Op.LESS_EQUAL: operator.le,
+    expr.Binary.Op.GREATER: operator.gt,
+    expr.Binary.Op.GREATER_EQUAL: operator.ge,
+    expr.Binary.Op.SHIFT_LEFT: operator.lshift,
+    expr.Binary.Op.SHIFT_RIGHT: operator.rshift,
+}
+SUPPORTED_EXPRESSIONS = "clbits and registers, Bool and Uint values, casts between them, indexing, and the bitwise, logical, comparison, and shift operators"
+
+
+def _get_bits(qc: QuantumCircuit, target: Clbit | ClassicalRegister, clbit_map: Sequence[int]) -> list[int]:
+    """
+    The indexes of the target's clbits, least significant first
+    """
+    return [clbit_map[qc.find_bit(clbit).index] for clbit in ([target] if isinstance(target, Clbit) else target)]
+
+
+def _get_width(node: expr.Expr) -> int:
+    return 1 if node.type.kind is types.Bool else node.type.width
+
+
+def _evaluate(qc: QuantumCircuit, node: expr.Expr, clbits: list[int], clbit_map: Sequence[int]) -> int:
+    """
+    Evaluate a classical expression on a branch's clbits, with Bools as 0 or 1
+    """
+    if node.type.kind not in {types.Bool, types.Uint}:
+        raise NotImplementedError(f"Exact simulation only supports expressions on {SUPPORTED_EXPRESSIONS}, not {node}")
+    if isinstance(node, expr.Var) and isinstance(node.var, Clbit | ClassicalRegister):
+        return sum(clbits[clbit] << i for i, clbit in enumerate(_get_bits(qc, node.var, clbit_map)))
+    if isinstance(node, expr.Value):
+        return int(node.value)
+    if isinstance(node, expr.Cast):
+        value = _evaluate(qc, node.operand, clbits, clbit_map)
+        return int(bool(value)) if node.type.kind is types.Bool else value % 2 ** _get_width(node)
+    if isinstance(node, expr.Index):
+        return (_evaluate(qc, node.target, clbits, clbit_map) >> _evaluate(qc, node.index, clbits, clbit_map)) & 1
+    if isinstance(node, expr.Unary) and node.op in {expr.Unary.Op.BIT_NOT, expr.Unary.Op.LOGIC_NOT}:
+        value = _evaluate(qc, node.operand, clbits, clbit_map)
+        return int(not value) if node.op is expr.Unary.Op.LOGIC_NOT else ~value % 2 ** _get_width(node)
+    if isinstance(node, expr.Binary) and node.op in _BINARY_OPERATIONS:
+        value = _BINARY_OPERATIONS[node.op](_evaluate(qc, node.left, clbits, clbit_map), _evaluate(qc, node.right, clbits, clbit_map))
+        return int(value) % 2 ** _get_width(node)
+    raise NotImplementedError(f"Exact simulation only supports expressions on {SUPPORTED_EXPRESSIONS}, not {node}")
+
+
+def _condition_holds(qc: QuantumCircuit, condition: tuple | expr.Expr, clbits: list[int], clbit_map: Sequence[int]) -> bool:
+    if isinstance(condition, expr.Expr):
+        return bool(_evaluate(qc, condition, clbits, clbit_map))
+    target, value = condition
+    if isinstance(target, Clbit):
+        return clbits[clbit_map[qc.find_bit(target).index]] == int(value)
+    if isinstance(target, ClassicalRegister):
+        return all(clbits[clbit_map[qc.find_bit(clbit).index]] == (int(value) >> i) & 1 for i, clbit in enumerate(target))
+    raise ValueError("Only register and single-bit conditions are supported")
+
+
+def _store(qc: QuantumCircuit, store: Store, branches: list[_Branch], clbit_map: Sequence[int]) -> None:
+    """
+    Write the value of a store's expression into the clbit, or register, it stores to, in each branch
+    """
+    if not isinstance(store.lvalue, expr.Var) or not isinstance(store.lvalue.var, Clbit | ClassicalRegister):
+        raise NotImplementedError(f"Exact simulation only supports storing to clbits and registers, not {store.lvalue}")
+    target = _get_bits(qc, store.lvalue.var, clbit_map)
+    for branch in branches:
+        value = _evaluate(qc, store.rvalue, branch.clbits, clbit_map)
+        for i, clbit in enumerate(target):
+            branch.clbits[clbit] = (value >> i) & 1
+
+
+def _measure(branches: list[_Branch], qubit: int, clbit: int | None, *, reset: bool = False) -> list[_Branch]:
+    """
+    Split each branch into one branch per outcome of measuring the qubit, recording the outcome in the clbit, or (for
+      a reset) flipping the qubit back to |0>
+    """
+    out = []
+    for branch in branches:
+        for outcome in (0, 1):
+            probability, state = _project(branch.state, qubit, outcome)
+            if branch.probability * probability <= PROBABILITY_TOLERANCE:
+                continue
+            clbits = branch.clbits.copy()
+            if clbit is not None:
+                clbits[clbit] = outcome
+            if reset and outcome:
+                state = np.flip(state, axis=state.ndim - 1 - qubit)
+            out.append(_Branch(branch.probability * probability, state, clbits))
+    return out
+
+
+def _run(qc: QuantumCircuit, branches: list[_Branch], qubit_map: Sequence[int], clbit_map: Sequence[int]) -> list[_Branch]:
+    for circuit_instruction in qc.data:
+        operation = circuit_instruction.operation
+        qubits = [qubit_map[qc.find_bit(qubit).index] for qubit in circuit_instruction.qubits]
+        clbits = [clbit_map[qc.find_bit(clbit).index] for clbit in circuit_instruction.clbits]
+        if isinstance(operation, IfElseOp):
+            true_body, false_body = operation.blocks[0], operation.blocks[1] if len(operation.blocks) > 1 else None
+            taken, not_taken = [], []
+            for branch in branches:
+                (taken if _condition_holds(qc, operation.condition, branch.clbits, clbit_map) else not_taken).append(branch)
+            branches = _run(true_body, taken, qubits, clbits) if taken else []
+            branches += _run(false_body, not_taken, qubits, clbits) if false_body is not None and not_taken else not_taken
+        elif isinstance(operation, Store):
+            _store(qc, operation, branches, clbit_map)
+        elif operation.name == "measure":
+            branches = _measure(branches, qubits[0], clbits[0])
+        elif operation.name == "reset":
+            branches = _measure(branches, qubits[0], None, reset=True)
+        elif operation.name in {"barrier", "delay"}:
+            continue
+        elif isinstance(operation, Gate):
+            matrix = _get_matrix(operation)
+            for branch in branches:
+                branch.state = _apply_matrix(branch.state, matrix, qubits)
+        elif operation.definition is not None:
+            # e.g. `initialize`, which is a reset followed by a state preparation
+            branches = _run(operation.definition, branches, qubits, clbits)
+        else:
+            raise ValueError(f"Unsupported instruction for exact simulation: {operation.name}")
+    return branches
+
+
+def _get_final_measurements(qc: QuantumCircuit) -> tuple[int, list[tuple[int, int]]]:
+    """
+    Return the index of the first of the measurements (and barriers) at the end of the circuit, and the (qubit, clbit)
+      of each of those measurements
+    """
+    start = len(qc.data)
+    while start > 0 and qc.data[start - 1].operation.name in {"measure", "barrier"}:
+        start -= 1
+    measurements = [
+        (qc.find_bit(circuit_instruction.qubits[0]).index, qc.find_bit(circuit_instruction.clbits[0]).index)
+        for circuit_instruction in qc.data[start:]
+        if circuit_instruction.operation.name == "measure"
+    ]
+    return start, measurements
+
+
+def _format_outcome(qc: QuantumCircuit, clbits: Sequence[int]) -> str:
+    """
+    Format the clbits the same way as Qiskit's `get_counts()`
+    """
+    return " ".join("".join(str(clbits[qc.find_bit(clbit).index]) for clbit in reversed(creg)) for creg in reversed(qc.cregs))
+
+
+def get_outcome_probabilities(qc: QuantumCircuit) -> dict[str, float]:
+    """
+    Return the exact probability of each measurement outcome of the circuit, keyed the same way as the counts from
+      Qiskit's `get_counts()`
+    """
+    with span("run", qc, simulator="exact"):
+        return _get_outcome_probabilities(qc)
+
+
+def _get_outcome_probabilities(qc: QuantumCircuit) -> dict[str, float]:
+    start, final_measurements = _get_final_measurements(qc)
+    body = qc.copy_empty_like()
+    for circuit_instruction in qc.data[:start]:
+        body.append(circuit_instruction)
+
+    state = np.zeros((2,) * qc.num_qubits, dtype=complex)
+    state[(0,) * qc.num_qubits] = 1
+    branches = _run(body, [_Branch(1.0, state, [0] * qc.num_clbits)], range(qc.num_qubits), range(qc.num_clbits))
+
+    measured_qubits = sorted({qubit for qubit, _ in final_measurements})
+    out: dict[str, float] = {}
+    for branch in branches:
+        # Joint distribution of the measured qubits, indexed little-endian in measured_qubits
+        probabilities = np.abs(branch.state) ** 2
+        other_axes = tuple(axis for axis in range(qc.num_qubits) if qc.num_qubits - 1 - axis not in measured_qubits)
+        joint = probabilities.sum(axis=other_axes).ravel() if measured_qubits else np.ones(1)
+        for index in np.flatnonzero(branch.probability * joint > PROBABILITY_TOLERANCE):
+            clbits = branch.clbits.copy()
+            for qubit, clbit in final_measurements:
+                # The remaining axes are in descending qubit order, so the flattened index is little-endian
+                clbits[clbit] = (int(index) >> measured_qubits.index(qubit)) & 1
+            key = _format_outcome(qc, clbits)
+            out[key] = out.get(key, 0.0) + branch.probability * float(joint[index])
+    return out
+
+
+def evolve_statevector(state: Statevector, qc: QuantumCircuit) -> Statevector:
+    """
+    Evolve a state through a unitary circuit (such as one with coherent corrections), which is equivalent to
+      `state.evolve(qc)`, but far faster for circuits with multi-controlled gates
+    """
+    if any(not isinstance(circuit_instruction.operation, Gate) and circuit_instruction.operation.name != "barrier" for circuit_instruction in qc.data):
+        raise ValueError("Only unitary circuits can be evolved exactly, use get_outcome_probabilities for anything else")
+    (branch,) = _run(qc, [_Branch(1.0, state.data.reshape((2,) * qc.num_qubits), [])], range(qc.num_qubits), range(qc.num_clbits))
+    return Statevector(branch.state.ravel())
@@ -0,0 +1,261 @@
+"""
+Exhaustive fault enumeration: every combination of up to t Pauli faults in a code's error correction gadget (the
+  syndrome extraction and correction of `threshold.get_noisy_error_correction_circuit`), checked classically, for
+  which ones the gadget fails to correct
+
+Faults are propagated through the gadget as Pauli frames (see `pauli_frame`), 64 fault patterns to a word. Every
+  measurement in the noiseless circuit is deterministic, and Pauli faults don't change which measurements are, so a
+  frame's effect on each outcome (and on which corrections fire) is exact, with no randomness involved. Propagation
+  stops at the end of the gadget, before the (non-fault-tolerant) decoding circuit, so the result depends only on the
+  code and its gadget: the residual error left on the data qubits is decoded ideally, and the pattern is uncorrectable
+  if what remains anticommutes with logical Z (so would flip |0>, basis "z") or logical X (so would flip |+>, basis
+  "x"), as in `logical_error_rate.get_logical_failures`
+
+Fault models (each including the locations of the previous one):
+- data: an X, Y, or Z on each data qubit, where the noise models of `threshold` act
+- qubits: an X, Y, or Z on each ancilla too, before syndrome extraction starts
+- circuit: any non-identity Pauli on the qubits of every gate of the gadget, just after it (or an X just before each
+  measurement, since that's the only fault a measurement is sensitive to)
+
+Patterns are split into one task per (weight, first location), which are spread across a process pool
+"""
+
+import itertools
+import multiprocessing
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+
+from .codes import CODES
+from .logical_error_rate import get_logical_failures
+from .parity_check import pack_bits
+from .pauli_frame import ALL_ONES, Operation, PauliFrameSimulator, apply_conditional_paulis_to_frames, apply_gate_to_frames, pack_shots, unpack_shots
+from .threshold import BASES, get_noisy_error_correction_circuit
+
+FAULT_MODELS = ("data", "qubits", "circuit")
+SINGLE_QUBIT_PAULIS = ("X", "Y", "Z")
+
+
+class Fault(NamedTuple):
+    """
+    - position: the index, counting from the first instruction of the gadget, of the instruction the fault happens
+      just before
+    - operation: the instruction the fault follows ("init" for an ancilla before syndrome extraction), or precedes, for
+      a measurement
+    - qubits/pauli: the Pauli, one letter per qubit, e.g. ((9, 0), "XZ")
+    """
+
+    position: int
+    operation: str
+    qubits: tuple[int, ...]
+    pauli: str
+
+
+class UncorrectablePattern(NamedTuple):
+    faults: tuple[Fault, ...]
+    # The bases the logical qubit is measured wrongly in
+    bases: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class FaultEnumerationResult:
+    code: str
+    fault_model: str
+    max_weight: int
+    num_patterns: int
+    uncorrectable: list[UncorrectablePattern]
+
+    @property
+    def min_uncorrectable_weight(self) -> int | None:
+        return min((len(pattern.faults) for pattern in self.uncorrectable), default=None)
+
+
+def _get_paulis(num_qubits: int) -> list[str]:
+    return ["".join(pauli) for pauli in itertools.product("IXYZ", repeat=num_qubits) if set(pauli) != {"I"}]
+
+
+def _get_operation_qubits(operation: Operation) -> tuple[int, ...]:
+    if operation[0] == "if":
+        _, _, _, true_paulis, false_paulis = operation
+        return tuple(dict.fromkeys(qubit for _, qubit in (*true_paulis, *false_paulis)))
+    if operation[0] == "measure":
+        return (operation[1],)
+    return tuple(operation[1:])
+
+
+class FaultEnumerator:
+    """
+    Every fault location of a code's error correction gadget under a fault model, and the faults possible at each
+    """
+
+    def __init__(self, code_name: str, *, fault_model: str = "data") -> None:
+        if fault_model not in FAULT_MODELS:
+            raise ValueError(f"Unknown fault model: {fault_model}")
+        self.code_name = code_name
+        self.code = {code.name: code for code in CODES}[code_name]
+        self.fault_model = fault_model
+        # Faults are only propagated through the gadget, which is the same in every basis
+        simulator = PauliFrameSimulator(get_noisy_error_correction_circuit(code_name))
+        self.operations = simulator.operations
+        self.reference = simulator.reference
+        self.num_qubits = simulator.num_qubits
+        self.num_clbits = simulator.num_clbits
+        # The gadget runs from the noise locations up to the last correction
+        self.start = next(index for index, operation in enumerate(self.operations) if operation[0] == "id")
+        self.end = max(index for index, operation in enumerate(self.operations) if operation[0] == "if") + 1
+        # The faults at each location
+        self.locations = self._get_locations()
+        self.faults = [fault for location in self.locations for fault in location]
+
+    def _get_locations(self) -> list[list[Fault]]:
+        gadget = self.operations[self.start : self.end]
+        num_ids = next(index for index, operation in enumerate(gadget) if operation[0] != "id")
+        data_qubits = [operation[1] for operation in gadget[:num_ids]]
+        out = [[Fault(position + 1, "id", (qubit,), pauli) for pauli in SINGLE_QUBIT_PAULIS] for position, qubit in enumerate(data_qubits)]
+        if self.fault_model == "data":
+            return out
+        ancillas = [qubit for qubit in range(self.num_qubits) if qubit not in data_qubits]
+        out += [[Fault(num_ids, "init", (qubit,), pauli) for pauli in SINGLE_QUBIT_PAULIS] for qubit in ancillas]
+        if self.fault_model == "qubits":
+            return out
+        for position, operation in enumerate(gadget[num_ids:], num_ids):
+            qubits = _get_operation_qubits(operation)
+            if operation[0] == "measure":
+                out.append([Fault(position, "measure", qubits, "X")])
+            else:
+                out.append([Fault(position + 1, operation[0], qubits, pauli) for pauli in _get_paulis(len(qubits))])
+        return out
+
+    def get_tasks(self, max_weight: int) -> list[tuple[int, int]]:
+        """
+        The (weight, first location) of each task
+        """
+        return [(weight, first) for weight in range(1, max_weight + 1) for first in range(len(self.locations) - weight + 1)]
+
+    def get_patterns(self, weight: int, first: int) -> np.ndarray:
+        """
+        Every pattern of faults at weight distinct locations, the first of which is the given one, as a (num_patterns,
+          weight) array of indexes into `faults`
+        """
+        offsets = np.cumsum([0, *(len(location) for location in self.locations)])
+        patterns = []
+        for rest in itertools.combinations(range(first + 1, len(self.locations)), weight - 1):
+            location_indexes = (first, *rest)
+            choices = [range(offsets[location], offsets[location + 1]) for location in location_indexes]
+            patterns.extend(itertools.product(*choices))
+        return np.array(patterns, dtype=np.int64).reshape(-1, weight)
+
+    def _inject_faults(self, x: np.ndarray, z: np.ndarray, fault_masks: np.ndarray, fault_indexes: Iterable[int]) -> None:
+        for fault_index in fault_indexes:
+            fault = self.faults[fault_index]
+            for qubit, pauli in zip(fault.qubits, fault.pauli, strict=True):
+                if pauli in {"X", "Y"}:
+                    x[qubit] ^= fault_masks[fault_index]
+                if pauli in {"Z", "Y"}:
+                    z[qubit] ^= fault_masks[fault_index]
+
+    def _get_residual_errors(self, fault_masks: np.ndarray, num_patterns: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Given a (num_faults, num_words) array of which patterns include each fault, packed as in `pack_shots`, return the
+          X and Z parts of the error each pattern leaves on the data qubits at the end of the gadget, packed as in
+          `parity_check.pack_bits`
+        """
+        injections: dict[int, list[int]] = {}
+        for fault_index, fault in enumerate(self.faults):
+            injections.setdefault(self.start + fault.position, []).append(fault_index)
+        num_words = fault_masks.shape[1]
+        x = np.zeros((self.num_qubits, num_words), dtype=np.uint64)
+        z = np.zeros_like(x)
+        record = np.zeros((self.num_clbits, num_words), dtype=np.uint64)
+        for index, operation in enumerate(self.operations[: self.end]):
+            self._inject_faults(x, z, fault_masks, injections.get(index, ()))
+            name = operation[0]
+            if name == "measure":
+                _, qubit, clbit = operation
+                record[clbit] = x[qubit] ^ (ALL_ONES if self.reference[clbit] else np.uint64(0))
+            elif name == "reset":
+                x[operation[1]] = 0
+                z[operation[1]] = 0
+            elif name == "if":
+                apply_conditional_paulis_to_frames(x, z, record, self.reference, operation)
+            else:
+                apply_gate_to_frames(x, z, operation)
+        # Faults just after the last correction
+        self._inject_faults(x, z, fault_masks, injections.get(self.end, ()))
+        # The data qubits come first
+        num_data_qubits = self.code.num_data_qubits
+        return pack_bits(unpack_shots(x[:num_data_qubits], num_patterns)), pack_bits(unpack_shots(z[:num_data_qubits], num_patterns))
+
+    def find_uncorrectable(self, patterns: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Given a (num_patterns, weight) array of patterns, return whether each one fails, in each basis
+        """
+        num_patterns = len(patterns)
+        included = np.zeros((len(self.faults), num_patterns), dtype=np.uint8)
+        for column in patterns.T:
+            included[column, np.arange(num_patterns)] = 1
+        x_residuals, z_residuals = self._get_residual_errors(pack_shots(included), num_patterns)
+        logicals = {"z": self.code.logical_z, "x": self.code.logical_x}
+        return {basis: get_logical_failures(self.code, x_residuals, z_residuals, logicals=(logicals[basis],)) for basis in BASES}
+
+    def run_task(self, weight: int, first: int, *, batch_size: int = 1 << 14) -> tuple[int, list[UncorrectablePattern]]:
+        """
+        Check every pattern of the task, returning the number of patterns, and the uncorrectable ones
+        """
+        patterns = self.get_patterns(weight, first)
+        out = []
+        for batch_start in range(0, len(patterns), batch_size):
+            batch = patterns[batch_start : batch_start + batch_size]
+            failed = self.find_uncorrectable(batch)
+            for index in np.flatnonzero(np.logical_or.reduce(list(failed.values()))):
+                bases = tuple(basis for basis in BASES if failed[basis][index])
+                out.append(UncorrectablePattern(tuple(self.faults[fault_index] for fault_index in batch[index]), bases))
+        return len(patterns), out
+
+
+# Each worker's enumerator, sent once when the worker starts (see `_initialize_worker`), rather than pickled along with
+#  every task
+_worker_enumerator: FaultEnumerator | None = None
+
+
+def _initialize_worker(enumerator: FaultEnumerator) -> None:
+    global _worker_enumerator
+    _worker_enumerator = enumerator
+
+
+def _run_task(task: tuple[int, int]) -> tuple[int, list[UncorrectablePattern]]:
+    if _worker_enumerator is None:
+        raise RuntimeError("The worker's enumerator hasn't been initialised")
+    return _worker_enumerator.run_task(*task)
+
+
+def _run_tasks(enumerator: FaultEnumerator, tasks: list[tuple[int, int]], max_workers: int | None) -> Iterator[tuple[int, list[UncorrectablePattern]]]:
+    if max_workers == 1:
+        for task in tasks:
+            yield enumerator.run_task(*task)
+        return
+    num_workers = max_workers or os.process_cpu_count() or 1
+    # Most tasks are small (all of weight 1, and those starting late in the gadget), so they're sent in chunks, of a
+    #  size leaving about 4 chunks per worker to balance the load
+    chunksize = max(1, len(tasks) // (4 * num_workers))
+    # Spawned rather than forked, as in `threshold.run_threshold_sweep`
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=multiprocessing.get_context("spawn"), initializer=_initialize_worker, initargs=(enumerator,)) as executor:
+        yield from executor.map(_run_task, tasks, chunksize=chunksize)
+
+
+def enumerate_faults(code_name: str, max_weight: int, *, fault_model: str = "data", max_workers: int | None = None) -> FaultEnumerationResult:
+    """
+    Check every pattern of between 1 and max_weight faults under the fault model, across a process pool (by default one
+      worker per core, or in this process, with max_workers=1), and return every uncorrectable pattern, in order of
+      weight, then location
+    """
+    enumerator = FaultEnumerator(code_name, fault_model=fault_model)
+    num_patterns, uncorrectable = 0, []
+    for task_num_patterns, task_uncorrectable in _run_tasks(enumerator, enumerator.get_tasks(max_weight), max_workers):
+        num_patterns += task_num_patterns
+        uncorrectable += task_uncorrectable
+    return FaultEnumerationResult(code_name, fault_model, max_weight, num_patterns, uncorrectable)
@@ -0,0 +1,70 @@
+"""
+Structural fingerprints of circuits, for use as cache keys
+
+Two circuits have the same fingerprint if they have the same shape (numbers of qubits and clbits, and register
+  sizes) and the same instructions on the same bits, regardless of the names or identities of their registers
+"""
+
+import hashlib
+
+from qiskit import ClassicalRegister, QuantumCircuit
+from qiskit.circuit import Clbit, ControlFlowOp
+
+STATE_PREPARATIONS = frozenset({"initialize"})
+
+
+def _describe_param(param: object) -> str:
+    if isinstance(param, complex):
+        return repr((param.real, param.imag))
+    return repr(param)
+
+
+def _describe_condition(qc: QuantumCircuit, condition: object) -> object:
+    if isinstance(condition, tuple):
+        target, value = condition
+        if isinstance(target, Clbit):
+            return ("clbit", qc.find_bit(target).index, int(value))
+        if isinstance(target, ClassicalRegister):
+            return ("creg", tuple(qc.find_bit(clbit).index for clbit in target), int(value))
+    return repr(condition)
+
+
+def _describe_circuit(qc: QuantumCircuit, *, ignore_state_preparations: bool) -> tuple:
+    instructions = []
+    for circuit_instruction in qc.data:
+        operation = circuit_instruction.operation
+        params: object
+        if isinstance(operation, ControlFlowOp):
+            # Nested state preparations are always part of the fingerprint, only top-level ones can be swapped out
+            params = tuple(_describe_circuit(block, ignore_state_preparations=False) for block in operation.blocks)
+            params += (_describe_condition(qc, getattr(operation, "condition", None)),)
+        elif ignore_state_preparations and operation.name in STATE_PREPARATIONS:
+            params = None
+        else:
+            params = tuple(_describe_param(param) for param in operation.params)
+        instructions.append(
+            (
+                operation.name,
+                tuple(qc.find_bit(qubit).index for qubit in circuit_instruction.qubits),
+                tuple(qc.find_bit(clbit).index for clbit in circuit_instruction.clbits),
+                params,
+            )
+        )
+    return (
+        qc.num_qubits,
+        qc.num_clbits,
+        tuple(creg.size for creg in qc.cregs),
+        _describe_param(qc.global_phase),
+        tuple(instructions),
+    )
+
+
+def circuit_fingerprint(qc: QuantumCircuit, *, ignore_state_preparations: bool = False) -> str:
+    """
+    A hex digest identifying the structure of the circuit
+
+    With ignore_state_preparations, the parameters of top-level `initialize` instructions aren't included, so circuits
+      which only differ in the states they're initialised to share a fingerprint
+    """
+    description = _describe_circuit(qc, ignore_state_preparations=ignore_state_preparations)
+    return hashlib.blake2b(repr(description).encode(), digest_size=16).hexdigest()
@@ -0,0 +1,182 @@
+"""
+A lightweight intermediate representation of the Clifford circuits built by `qecc`
+
+A `GateList` is a flat list of `GateInstruction` records, each just a gate name, qubit and clbit indexes, and an
+  optional classical condition, so building one costs a single small object per gate, rather than Qiskit's
+  per-instruction bookkeeping (and the copies made by each `compose`). It's lowered to a `QuantumCircuit` only when one
+  is asked for, and simulators can consume it directly, without going through Qiskit
+"""
+
+import functools
+from collections.abc import Iterator, Sequence
+
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+from qiskit.circuit import Clbit, IfElseOp, Qubit
+from qiskit.circuit.classical import expr
+from qiskit.circuit.library import get_standard_gate_name_mapping
+
+GATES = frozenset({"id", "x", "y", "z", "h", "s", "sdg", "sx", "sxdg", "cx", "cy", "cz", "swap"})
+NON_UNITARY_INSTRUCTIONS = frozenset({"measure", "reset"})
+# The inverse of each gate which isn't its own inverse
+_INVERSES = {"s": "sdg", "sdg": "s", "sx": "sxdg", "sxdg": "sx"}
+_QISKIT_INSTRUCTIONS = get_standard_gate_name_mapping()
+
+# (clbits, value), which holds when clbit i of clbits is bit i of value, as for a Qiskit `if_test` on a register
+type Condition = tuple[tuple[int, ...], int]
+
+
+class GateInstruction:
+    __slots__ = ("clbits", "condition", "name", "qubits")
+
+    def __init__(self, name: str, qubits: tuple[int, ...], clbits: tuple[int, ...] = (), condition: Condition | None = None) -> None:
+        self.name = name
+        self.qubits = qubits
+        self.clbits = clbits
+        self.condition = condition
+
+    def __repr__(self) -> str:
+        return f"GateInstruction({self.name!r}, {self.qubits}, {self.clbits}, {self.condition})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, GateInstruction):
+            return NotImplemented
+        return (self.name, self.qubits, self.clbits, self.condition) == (other.name, other.qubits, other.clbits, other.condition)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+class GateList:
+    """
+    A circuit on num_qubits qubits and num_clbits clbits, whose classical registers are given by the clbit indexes in
+      each of clregs, in the order Qiskit would list them
+    """
+
+    __slots__ = ("clregs", "instructions", "num_clbits", "num_qubits")
+
+    def __init__(self, num_qubits: int, clreg_sizes: Sequence[int] = ()) -> None:
+        self.num_qubits = num_qubits
+        self.num_clbits = 0
+        self.clregs: list[tuple[int, ...]] = []
+        self.instructions: list[GateInstruction] = []
+        for size in clreg_sizes:
+            self.add_register(size)
+
+    def __len__(self) -> int:
+        return len(self.instructions)
+
+    def __iter__(self) -> Iterator[GateInstruction]:
+        return iter(self.instructions)
+
+    def add_register(self, size: int) -> tuple[int, ...]:
+        """
+        Add a classical register of new clbits, returning their indexes
+        """
+        clreg = tuple(range(self.num_clbits, self.num_clbits + size))
+        self.num_clbits += size
+        self.clregs.append(clreg)
+        return clreg
+
+    def append(self, name: str, qubits: Sequence[int], clbits: Sequence[int] = (), condition: Condition | None = None) -> None:
+        if name not in GATES and name not in NON_UNITARY_INSTRUCTIONS:
+            raise ValueError(f"Unsupported instruction: {name}")
+        self.instructions.append(GateInstruction(name, tuple(qubits), tuple(clbits), condition))
+
+    def compose(self, other: "GateList", qubits: Sequence[int] | None = None, clbits: Sequence[int] | None = None) -> None:
+        """
+        Append every instruction of other, with its qubit (and clbit) i mapped to qubits[i] (and clbits[i])
+        """
+        qubit_map = range(other.num_qubits) if qubits is None else qubits
+        clbit_map = range(other.num_clbits) if clbits is None else clbits
+        for instruction in other.instructions:
+            condition = None
+            if instruction.condition is not None:
+                condition_clbits, value = instruction.condition
+                condition = (tuple(clbit_map[clbit] for clbit in condition_clbits), value)
+            self.instructions.append(GateInstruction(instruction.name, tuple(qubit_map[qubit] for qubit in instruction.qubits), tuple(clbit_map[clbit] for clbit in instruction.clbits), condition))
+
+    def inverse(self) -> "GateList":
+        out = GateList(self.num_qubits)
+        for instruction in reversed(self.instructions):
+            if instruction.name not in GATES or instruction.condition is not None:
+                raise ValueError("Only unconditional gates can be inverted")
+            out.instructions.append(GateInstruction(_INVERSES.get(instruction.name, instruction.name), instruction.qubits))
+        return out
+
+    def to_circuit(self) -> QuantumCircuit:
+        """
+        Lower to a `QuantumCircuit`, with a single quantum register, and the same classical registers
+        """
+        qubits = QuantumRegister(self.num_qubits)
+        clbits = [Clbit() for _ in range(self.num_clbits)]
+        clregs = {clreg: ClassicalRegister(bits=[clbits[clbit] for clbit in clreg]) for clreg in self.clregs}
+        out = QuantumCircuit(qubits, clbits, *clregs.values())
+        self._lower(out, qubits, clbits, clregs)
+        return out
+
+    def append_to(self, qc: QuantumCircuit) -> None:
+        """
+        Lower onto the end of qc, whose qubits and clbits the gate list's indexes refer to, so a gate list built over an
+          existing circuit (see `empty_like`) is added to it without an intermediate circuit or `compose`
+        """
+        self._lower(qc, qc.qubits, qc.clbits, {tuple(qc.find_bit(clbit).index for clbit in creg): creg for creg in qc.cregs})
+
+    def _lower(self, out: QuantumCircuit, qubits: Sequence[Qubit], clbits: Sequence[Clbit], clregs: dict[tuple[int, ...], ClassicalRegister]) -> None:
+        for instruction in self.instructions:
+            operation = _QISKIT_INSTRUCTIONS[instruction.name]
+            qargs, cargs = [qubits[qubit] for qubit in instruction.qubits], [clbits[clbit] for clbit in instruction.clbits]
+            if instruction.condition is None:
+                out.append(operation, qargs, cargs, copy=False)
+                continue
+            condition_clbits, value = instruction.condition
+            if condition_clbits in clregs:
+                condition = (clregs[condition_clbits], value)
+            elif len(condition_clbits) == 1:
+                condition = (clbits[condition_clbits[0]], bool(value))
+            else:
+                condition = functools.reduce(expr.logic_and, (clbits[clbit] if (value >> i) & 1 else expr.logic_not(clbits[clbit]) for i, clbit in enumerate(condition_clbits)))
+            with out.if_test(condition):
+                out.append(operation, qargs, cargs, copy=False)
+
+    @classmethod
+    def empty_like(cls, qc: QuantumCircuit) -> "GateList":
+        """
+        An empty gate list with the qubits, clbits and classical registers of qc
+        """
+        out = cls(qc.num_qubits)
+        out.num_clbits = qc.num_clbits
+        out.clregs = [tuple(qc.find_bit(clbit).index for clbit in creg) for creg in qc.cregs]
+        return out
+
+    @classmethod
+    def from_circuit(cls, qc: QuantumCircuit) -> "GateList":
+        """
+        Convert a circuit of the gates in `GATES`, measurements, resets, and `if_test`s on a register or a single clbit
+          (whose bodies are any of those), ignoring barriers and delays
+        """
+        out = cls.empty_like(qc)
+        out._append_circuit(qc, range(qc.num_qubits), range(qc.num_clbits), None)
+        return out
+
+    def _append_circuit(self, qc: QuantumCircuit, qubit_map: Sequence[int], clbit_map: Sequence[int], condition: Condition | None) -> None:
+        for circuit_instruction in qc.data:
+            operation = circuit_instruction.operation
+            qubits = [qubit_map[qc.find_bit(qubit).index] for qubit in circuit_instruction.qubits]
+            clbits = [clbit_map[qc.find_bit(clbit).index] for clbit in circuit_instruction.clbits]
+            if isinstance(operation, IfElseOp):
+                if condition is not None:
+                    raise ValueError("Nested if_tests are not supported")
+                # Anything else is a classical expression
+                target, value = operation.condition if isinstance(operation.condition, tuple) else (None, None)
+                if isinstance(target, Clbit):
+                    condition_clbits, value = (clbit_map[qc.find_bit(target).index],), int(value)
+                elif isinstance(target, ClassicalRegister):
+                    condition_clbits, value = tuple(clbit_map[qc.find_bit(clbit).index] for clbit in target), int(value)
+                else:
+                    raise ValueError("Only register and single-bit conditions are supported")
+                self._append_circuit(operation.blocks[0], qubits, clbits, (condition_clbits, value))
+                if len(operation.blocks) > 1:
+                    if len(condition_clbits) > 1:
+                        raise ValueError("else blocks are only supported for single-bit conditions")
+                    self._append_circuit(operation.blocks[1], qubits, clbits, (condition_clbits, 1 - value))
+            elif operation.name not in {"barrier", "delay"}:
+                self.append(operation.name, qubits, clbits, condition)
@@ -0,0 +1,142 @@
+"""
+Optional instrumentation of the hot paths: building, transpiling, running, and parsing the results of circuits
+
+Instrumented code wraps each stage in `span(name, qc)`, which does nothing unless an `Instrumentation` has been
+  installed with `instrument`. While one is, each span records its start and stop times, the size and depth of the
+  circuit it's working on, and (with track_memory) the memory allocated by Python during it, and listeners are called
+  as each span starts and stops. The recorded spans can be written out as a Chrome trace (viewable in Perfetto or
+  chrome://tracing)
+
+Memory is measured with `tracemalloc`, so only counts allocations made through Python's allocator (e.g. not those made
+  by Aer's C++ simulators), and slows everything down while it's tracing
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from qiskit import QuantumCircuit
+
+
+class Span:
+    __slots__ = ("args", "name", "start_ns", "stop_ns", "thread_id")
+
+    def __init__(self, name: str, args: dict[str, object]) -> None:
+        self.name = name
+        self.args = args
+        self.thread_id = threading.get_ident()
+        self.start_ns = time.perf_counter_ns()
+        self.stop_ns: int | None = None
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, {self.args}, seconds={self.seconds})"
+
+    @property
+    def seconds(self) -> float | None:
+        return None if self.stop_ns is None else (self.stop_ns - self.start_ns) / 1e9
+
+    def record_circuit(self, qc: "QuantumCircuit") -> None:
+        self.args |= {"num_qubits": qc.num_qubits, "size": qc.size(), "depth": qc.depth()}
+
+
+type SpanListener = Callable[[str, Span], None]
+
+
+class Instrumentation:
+    """
+    A recorder of spans, calling each listener with ("start", span) and ("stop", span) as spans start and stop
+    """
+
+    def __init__(self, *, track_memory: bool = False) -> None:
+        self.track_memory = track_memory
+        self.spans: list[Span] = []
+        self.listeners: list[SpanListener] = []
+
+    def add_listener(self, listener: SpanListener) -> None:
+        self.listeners.append(listener)
+
+    @contextmanager
+    def span(self, name: str, qc: "QuantumCircuit | None" = None, **args: object) -> Iterator[Span]:
+        span = Span(name, args)
+        if qc is not None:
+            span.record_circuit(qc)
+        self.spans.append(span)
+        for listener in self.listeners:
+            listener("start", span)
+        allocated_at_start = tracemalloc.get_traced_memory()[0] if self.track_memory else 0
+        try:
+            yield span
+        finally:
+            span.stop_ns = time.perf_counter_ns()
+            if self.track_memory:
+                span.args["allocated_bytes"] = tracemalloc.get_traced_memory()[0] - allocated_at_start
+            for listener in self.listeners:
+                listener("stop", span)
+
+    def get_total_seconds(self) -> dict[str, float]:
+        """
+        The total time spent in the spans of each name (including any spans nested in them)
+        """
+        out: defaultdict[str, float] = defaultdict(float)
+        for span in self.spans:
+            if span.seconds is not None:
+                out[span.name] += span.seconds
+        return dict(out)
+
+    def to_chrome_trace(self) -> dict[str, object]:
+        """
+        The finished spans, as complete ("X") events in the Chrome trace event format, with times in microseconds
+        """
+        pid = os.getpid()
+        events = [
+            {"name": span.name, "ph": "X", "ts": span.start_ns / 1000, "dur": (span.stop_ns - span.start_ns) / 1000, "pid": pid, "tid": span.thread_id, "args": span.args}
+            for span in self.spans
+            if span.stop_ns is not None
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace(), default=str))
+
+
+_active_instrumentation: Instrumentation | None = None
+
+
+@contextmanager
+def instrument(instrumentation: Instrumentation | None = None) -> Iterator[Instrumentation]:
+    """
+    Install the given instrumentation (or a new one) for the duration of the block, starting `tracemalloc` if it tracks
+      memory
+    """
+    global _active_instrumentation
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+    previous = _active_instrumentation
+    start_tracing = instrumentation.track_memory and not tracemalloc.is_tracing()
+    if start_tracing:
+        tracemalloc.start()
+    _active_instrumentation = instrumentation
+    try:
+        yield instrumentation
+    finally:
+        _active_instrumentation = previous
+        if start_tracing:
+            tracemalloc.stop()
+
+
+def span(name: str, qc: "QuantumCircuit | None" = None, **args: object) -> AbstractContextManager[Span | None]:
+    """
+    Record a span on the installed instrumentation, if there is one
+    """
+    if _active_instrumentation is None:
+        return nullcontext()
+    return _active_instrumentation.span(name, qc, **args)
@@ -0,0 +1,98 @@
+"""
+Monte Carlo estimation of logical error rates under independent depolarizing noise on the data qubits
+
+Trials are processed in batches, as arrays of packed bit vectors, rather than building and simulating a circuit per trial
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from math import sqrt
+from statistics import NormalDist
+
+import numpy as np
+
+from .codes import StabilizerCode
+from .parity_check import pack_bits, parity
+
+
+@dataclass(frozen=True)
+class LogicalErrorRateEstimate:
+    num_trials: int
+    num_failures: int
+    confidence: float
+    ci_low: float
+    ci_high: float
+
+    @property
+    def rate(self) -> float:
+        return self.num_failures / self.num_trials
+
+
+def wilson_interval(num_failures: int, num_trials: int, confidence: float = 0.95) -> tuple[float, float]:
+    """
+    Wilson score interval for a binomial proportion, which (unlike the normal approximation) behaves sensibly when
+      there are no, or very few, failures
+    """
+    if num_trials <= 0:
+        raise ValueError("At least one trial is needed")
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    rate = num_failures / num_trials
+    denominator = 1 + z**2 / num_trials
+    centre = (rate + z**2 / (2 * num_trials)) / denominator
+    half_width = z * sqrt(rate * (1 - rate) / num_trials + z**2 / (4 * num_trials**2)) / denominator
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+
+def sample_depolarizing_errors(rng: np.random.Generator, num_trials: int, num_qubits: int, physical_error_rate: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Each qubit independently gets an X, Y, or Z error, each with probability p/3
+
+    Returns the X and Z parts of the errors, as (num_trials, ceil(num_qubits / 8)) arrays of packed bits
+    """
+    # Double precision, since single precision would round small error rates to multiples of 2^-24
+    draws = rng.random((num_trials, num_qubits))
+    # [0, p/3) is X, [p/3, 2p/3) is Y, [2p/3, p) is Z
+    x_errors = draws < 2 * physical_error_rate / 3
+    z_errors = (draws >= physical_error_rate / 3) & (draws < physical_error_rate)
+    return pack_bits(x_errors), pack_bits(z_errors)
+
+
+def get_logical_failures(code: StabilizerCode, x_errors: np.ndarray, z_errors: np.ndarray, *, logicals: Sequence[np.ndarray] | None = None) -> np.ndarray:
+    """
+    Given a batch of packed errors, correct them with the code's lookup table decoder, and return which trials failed
+
+    A trial fails if the residual error is outside the codespace (the decoder didn't recognise the syndrome), or
+      anticommutes with any of the logicals (by default, both of the code's logical operators)
+    """
+    x_residual = x_errors ^ code.z_checks.lookup_table()[code.z_checks.syndromes(x_errors)]
+    z_residual = z_errors ^ code.x_checks.lookup_table()[code.x_checks.syndromes(z_errors)]
+    failed = (code.z_checks.syndromes(x_residual) != 0) | (code.x_checks.syndromes(z_residual) != 0)
+    for logical in (code.logical_x, code.logical_z) if logicals is None else logicals:
+        # The symplectic product of the residual and the logical
+        logical_x_part, logical_z_part = pack_bits(logical)
+        failed |= (parity(x_residual & logical_z_part) ^ parity(z_residual & logical_x_part)).astype(bool)
+    return failed
+
+
+def estimate_logical_error_rate(
+    code: StabilizerCode,
+    physical_error_rate: float,
+    num_trials: int,
+    *,
+    confidence: float = 0.95,
+    seed: int | None = None,
+    batch_size: int = 1 << 20,
+) -> LogicalErrorRateEstimate:
+    """
+    Estimate the probability that a round of error correction fails to protect the logical qubit, when each data qubit
+      independently suffers a depolarizing error with the given probability
+    """
+    if num_trials <= 0:
+        raise ValueError("At least one trial is needed")
+    rng = np.random.default_rng(seed)
+    num_failures = 0
+    for batch_start in range(0, num_trials, batch_size):
+        x_errors, z_errors = sample_depolarizing_errors(rng, min(batch_size, num_trials - batch_start), code.num_data_qubits, physical_error_rate)
+        num_failures += int(np.count_nonzero(get_logical_failures(code, x_errors, z_errors)))
+    ci_low, ci_high = wilson_interval(num_failures, num_trials, confidence)
+    return LogicalErrorRateEstimate(num_trials, num_failures, confidence, ci_low, ci_high)
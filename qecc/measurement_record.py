@@ -0,0 +1,174 @@
+"""
+Per-shot measurement records, as bit-packed NumPy arrays, rather than string-keyed counts
+
+Each shot is a row of ceil(num_clbits / 8) bytes, packed little-endian like `parity_check.pack_bits`, so clbit j is bit
+  j % 8 of byte j // 8. Registers are named slices of the clbits, so the data measurement and each syndrome can be
+  pulled out, histogrammed, or marginalised over as arrays, and strings are only built (for the few distinct outcomes)
+  if Qiskit-style counts are asked for
+"""
+
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+from qiskit import QuantumCircuit
+
+from .parity_check import pack_bits, unpack_bits
+
+# The value of each hex digit, indexed by its ASCII code
+_HEX_DIGIT_VALUES = np.zeros(256, dtype=np.uint8)
+for _value, _digit in enumerate(b"0123456789abcdef"):
+    _HEX_DIGIT_VALUES[_digit] = _HEX_DIGIT_VALUES[ord(chr(_digit).upper())] = _value
+
+
+def get_registers(qc: QuantumCircuit) -> dict[str, tuple[int, ...]]:
+    """
+    The clbit indexes of each of the circuit's classical registers, by name
+    """
+    return {creg.name: tuple(qc.find_bit(clbit).index for clbit in creg) for creg in qc.cregs}
+
+
+class MeasurementRecord:
+    """
+    A (num_shots, ceil(num_clbits / 8)) uint8 array of packed shots, and the clbits of each named register, in the
+      order Qiskit would list the registers
+    """
+
+    __slots__ = ("num_clbits", "packed", "registers")
+
+    def __init__(self, packed: np.ndarray, num_clbits: int, registers: Mapping[str, Sequence[int]]) -> None:
+        self.packed = packed
+        self.num_clbits = num_clbits
+        self.registers = {name: tuple(clbits) for name, clbits in registers.items()}
+
+    def __repr__(self) -> str:
+        return f"MeasurementRecord(num_shots={self.num_shots}, registers={self.registers})"
+
+    @classmethod
+    def from_bits(cls, bits: np.ndarray, registers: Mapping[str, Sequence[int]]) -> "MeasurementRecord":
+        """
+        From a (num_shots, num_clbits) array of bits
+        """
+        return cls(pack_bits(bits), bits.shape[1], registers)
+
+    @classmethod
+    def from_hex_memory(cls, memory: Sequence[str], num_clbits: int, registers: Mapping[str, Sequence[int]]) -> "MeasurementRecord":
+        """
+        From Aer's per-shot memory, as hex strings whose bit j is clbit j (`result.data()["memory"]`)
+
+        The strings are parsed all at once, from one buffer of them joined by newlines: each shot's hex digits are
+          gathered least significant first, counting back from the newline after it (anything from its "0x" back reads
+          as 0), then paired up into bytes
+        """
+        num_bytes = -(-num_clbits // 8)
+        if not memory:
+            return cls(np.zeros((0, num_bytes), dtype=np.uint8), num_clbits, registers)
+        chars = np.frombuffer(("\n".join(memory) + "\n").encode(), dtype=np.uint8)
+        ends = np.flatnonzero(chars == ord("\n"))
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        positions = ends[:, np.newaxis] - 1 - np.arange(2 * num_bytes)
+        digits = _HEX_DIGIT_VALUES[chars[np.maximum(positions, 0)]]
+        digits[positions < starts[:, np.newaxis] + 2] = 0
+        return cls(digits[:, 0::2] | (digits[:, 1::2] << 4), num_clbits, registers)
+
+    @classmethod
+    def from_hex_counts(cls, counts: Mapping[str, int], num_clbits: int, registers: Mapping[str, Sequence[int]]) -> "MeasurementRecord":
+        """
+        From Aer's counts keyed by hex outcomes, as for `from_hex_memory` (`result.data()["counts"]`), with the shots
+          grouped by outcome, so only the distinct outcomes are parsed
+        """
+        outcomes = cls.from_hex_memory(list(counts), num_clbits, registers)
+        return cls(np.repeat(outcomes.packed, list(counts.values()), axis=0), num_clbits, registers)
+
+    @classmethod
+    def from_packed_counts(cls, counts: Mapping[bytes, int], num_clbits: int, registers: Mapping[str, Sequence[int]]) -> "MeasurementRecord":
+        """
+        From counts keyed by packed outcomes, as given by `packed_counts`, with the shots grouped by outcome
+        """
+        outcomes = np.frombuffer(b"".join(counts), dtype=np.uint8).reshape(len(counts), -(-num_clbits // 8))
+        return cls(np.repeat(outcomes, list(counts.values()), axis=0), num_clbits, registers)
+
+    @classmethod
+    def from_outcomes(cls, outcomes: Sequence[str], num_clbits: int, registers: Mapping[str, Sequence[int]]) -> "MeasurementRecord":
+        """
+        One shot of each outcome, given in the format of `counts` (the inverse of `counts`, for outcomes seen once)
+        """
+        bits = np.zeros((len(outcomes), num_clbits), dtype=np.uint8)
+        clregs = list(registers.values())
+        for shot, outcome in enumerate(outcomes):
+            for clreg, clreg_outcome in zip(reversed(clregs), outcome.split(" "), strict=True):
+                bits[shot, list(clreg)] = [int(bit) for bit in reversed(clreg_outcome)]
+        return cls.from_bits(bits, registers)
+
+    @property
+    def num_shots(self) -> int:
+        return self.packed.shape[0]
+
+    def rename(self, names: Sequence[str]) -> "MeasurementRecord":
+        """
+        The same record, with the registers given the names, in order (e.g. "bit_flip_syndrome", "phase_flip_syndrome",
+          "data")
+        """
+        return MeasurementRecord(self.packed, self.num_clbits, dict(zip(names, self.registers.values(), strict=True)))
+
+    def _get_clbits(self, names: Sequence[str]) -> list[int]:
+        if not names:
+            return list(range(self.num_clbits))
+        return [clbit for name in names for clbit in self.registers[name]]
+
+    def bits(self, *names: str) -> np.ndarray:
+        """
+        A (num_shots, num_bits) array of the clbits of the named registers, in order (or of every clbit, if none are
+          named)
+        """
+        return unpack_bits(self.packed, self.num_clbits)[:, self._get_clbits(names)]
+
+    def values(self, name: str) -> np.ndarray:
+        """
+        The value of a register (of at most 63 clbits) in each shot, as an integer whose bit i is clbit i of the
+          register, as for a Qiskit `if_test` on it
+        """
+        bits = self.bits(name)
+        if bits.shape[1] > 63:
+            raise ValueError("Only registers of at most 63 clbits have integer values")
+        return bits.astype(np.int64) @ (np.int64(1) << np.arange(bits.shape[1], dtype=np.int64))
+
+    def marginal(self, *names: str) -> "MeasurementRecord":
+        """
+        The record of just the named registers
+        """
+        registers, num_clbits = {}, 0
+        for name in names:
+            size = len(self.registers[name])
+            registers[name] = tuple(range(num_clbits, num_clbits + size))
+            num_clbits += size
+        return MeasurementRecord.from_bits(self.bits(*names), registers)
+
+    def _unique(self) -> tuple[np.ndarray, np.ndarray]:
+        packed = np.ascontiguousarray(self.packed)
+        # Each shot viewed as a single opaque value, so np.unique compares whole rows at once
+        keys, counts = np.unique(packed.view(np.dtype((np.void, packed.shape[1]))).ravel(), return_counts=True)
+        return keys.view(np.uint8).reshape(len(keys), -1), counts
+
+    def histogram(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        The distinct outcomes, as a (num_outcomes, num_clbits) array of bits, and the number of shots with each
+        """
+        outcomes, counts = self._unique()
+        return unpack_bits(outcomes, self.num_clbits), counts
+
+    def packed_counts(self) -> dict[bytes, int]:
+        """
+        The number of shots with each distinct outcome, keyed by its packed row's bytes, so outcomes can be compared
+          (e.g. against `from_outcomes`) without formatting them as strings
+        """
+        outcomes, counts = self._unique()
+        return {outcome.tobytes(): int(count) for outcome, count in zip(outcomes, counts, strict=True)}
+
+    def counts(self) -> dict[str, int]:
+        """
+        Counts in the same format as Qiskit's `get_counts()`: one bitstring per register, in reverse order of the
+          registers, separated by spaces, with each register's highest bit first
+        """
+        outcomes, counts = self.histogram()
+        clregs = list(self.registers.values())
+        return {" ".join("".join(str(outcome[clbit]) for clbit in reversed(clreg)) for clreg in reversed(clregs)): int(count) for outcome, count in zip(outcomes, counts, strict=True)}
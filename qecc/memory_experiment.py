@@ -0,0 +1,183 @@
+"""
+Memory experiments: syndrome extraction repeated for many rounds on any `qecc` code, with detector events streamed out
+  round by round
+
+The data qubits start in |0...0> (basis "z") or |+...+> (basis "x"), each round measures every check onto its own
+  ancilla, which is reset ready for the next round, and after the last round the data qubits are measured in the same
+  basis. A detector is the XOR of a check's outcomes in consecutive rounds, which is 0 unless an error happened in
+  between. In the first round, only the checks of the same type as the basis have a deterministic outcome (the others
+  are random), so only they give detectors, and the final detectors compare the last round with those checks
+  recomputed from the data measurement
+
+Simulation propagates Pauli frames (see `pauli_frame`), with a depolarizing error on each data qubit before each round,
+  and only holds the current round's outcomes, so the record of a long run is never in memory at once
+"""
+
+from collections.abc import Iterator
+from typing import NamedTuple
+
+import numpy as np
+from qiskit import QuantumCircuit
+
+from .codes import StabilizerCode
+from .gate_list import GateList
+from .pauli_frame import SHOTS_PER_WORD, apply_gate_to_frames, pack_shots, unpack_shots
+from .stabilizer_circuits import schedule_check_cnots
+
+MEMORY_BASES = ("z", "x")
+
+
+class DetectorRound(NamedTuple):
+    """
+    - index: the round, where round num_rounds is the final data measurement
+    - events: a (num_shots, num_checks) array of detector events, with the Z-type checks first, then the X-type checks,
+      and 0 wherever a check has no detector
+    - logical_flips: only in the final round, a (num_shots,) array of whether the logical observable was flipped
+    """
+
+    index: int
+    events: np.ndarray
+    logical_flips: np.ndarray | None
+
+
+class MemoryExperiment:
+    """
+    num_rounds rounds of syndrome extraction on the code, with qubits ordered data, Z-type check ancillas, X-type check
+      ancillas
+    """
+
+    def __init__(self, code: StabilizerCode, num_rounds: int, *, basis: str = "z") -> None:
+        if basis not in MEMORY_BASES:
+            raise ValueError(f"Unknown basis: {basis}")
+        if num_rounds < 1:
+            raise ValueError("At least one round is needed")
+        self.code = code
+        self.num_rounds = num_rounds
+        self.basis = basis
+        self.num_data_qubits = code.num_data_qubits
+        self.num_checks = code.z_checks.num_checks + code.x_checks.num_checks
+        self.num_qubits = self.num_data_qubits + self.num_checks
+        self.observable = self._get_observable()
+        self.round_gate_list = self._get_round_gate_list()
+
+    def _get_observable(self) -> np.ndarray:
+        # The logical operator made only of the basis' Paulis, which is deterministic when every data qubit is prepared
+        #  and measured in that basis
+        part = 1 if self.basis == "z" else 0
+        for logical in (self.code.logical_z, self.code.logical_x):
+            if not logical[1 - part].any():
+                return np.flatnonzero(logical[part])
+        raise ValueError(f"The code has no logical operator made only of {self.basis.upper()}s")
+
+    def _get_round_gate_list(self) -> GateList:
+        """
+        One round, with an `id` on each data qubit (where noise acts) and the outcomes measured into a single register
+        """
+        num_z_checks = self.code.z_checks.num_checks
+        z_ancillas = range(self.num_data_qubits, self.num_data_qubits + num_z_checks)
+        x_ancillas = range(self.num_data_qubits + num_z_checks, self.num_qubits)
+        out = GateList(self.num_qubits, (self.num_checks,))
+        for qubit in range(self.num_data_qubits):
+            out.append("id", (qubit,))
+        for ancilla in x_ancillas:
+            out.append("h", (ancilla,))
+        for layer in schedule_check_cnots(self.code.z_checks):
+            for check, qubit in layer:
+                out.append("cx", (qubit, z_ancillas[check]))
+        for layer in schedule_check_cnots(self.code.x_checks):
+            for check, qubit in layer:
+                out.append("cx", (x_ancillas[check], qubit))
+        for ancilla in x_ancillas:
+            out.append("h", (ancilla,))
+        for index, ancilla in enumerate((*z_ancillas, *x_ancillas)):
+            out.append("measure", (ancilla,), (index,))
+            out.append("reset", (ancilla,))
+        return out
+
+    def get_gate_list(self) -> GateList:
+        """
+        The whole experiment, with one classical register per round, then one for the data measurement
+        """
+        out = GateList(self.num_qubits)
+        data_qubits = range(self.num_data_qubits)
+        if self.basis == "x":
+            for qubit in data_qubits:
+                out.append("h", (qubit,))
+        for _ in range(self.num_rounds):
+            out.compose(self.round_gate_list, clbits=out.add_register(self.num_checks))
+        data_measurement = out.add_register(self.num_data_qubits)
+        for qubit in data_qubits:
+            if self.basis == "x":
+                out.append("h", (qubit,))
+            out.append("measure", (qubit,), (data_measurement[qubit],))
+        return out
+
+    def get_circuit(self) -> QuantumCircuit:
+        return self.get_gate_list().to_circuit()
+
+    def _get_deterministic_checks(self) -> np.ndarray:
+        num_z_checks = self.code.z_checks.num_checks
+        out = np.zeros(self.num_checks, dtype=bool)
+        if self.basis == "z":
+            out[:num_z_checks] = True
+        else:
+            out[num_z_checks:] = True
+        return out
+
+    def stream_detector_events(self, num_shots: int, *, physical_error_rate: float = 0.0, seed: int | None = None) -> Iterator[DetectorRound]:
+        """
+        Simulate the experiment, with each data qubit independently suffering an X, Y, or Z error (each with probability
+          p/3) before each round, yielding each round's detector events as soon as the round has been simulated, then
+          those of the final data measurement
+        """
+        rng = np.random.default_rng(seed)
+        num_words = -(-num_shots // SHOTS_PER_WORD)
+
+        def random_words(num_rows: int) -> np.ndarray:
+            return np.frombuffer(rng.bytes(8 * num_words * num_rows), dtype=np.uint64).reshape(num_rows, num_words).copy()
+
+        x = np.zeros((self.num_qubits, num_words), dtype=np.uint64)
+        z = random_words(self.num_qubits)
+        data_qubits = range(self.num_data_qubits)
+        if self.basis == "x":
+            for qubit in data_qubits:
+                apply_gate_to_frames(x, z, ("h", qubit))
+        not_deterministic = ~self._get_deterministic_checks()
+        previous_flips = np.zeros((self.num_checks, num_words), dtype=np.uint64)
+        for round_index in range(self.num_rounds):
+            flips = np.zeros_like(previous_flips)
+            for instruction in self.round_gate_list:
+                if instruction.name == "id":
+                    if physical_error_rate:
+                        # [0, p/3) is X, [p/3, 2p/3) is Y, [2p/3, p) is Z
+                        (qubit,) = instruction.qubits
+                        draws = rng.random((1, num_shots), dtype=np.float32)
+                        x[qubit] ^= pack_shots(draws < 2 * physical_error_rate / 3)[0]
+                        z[qubit] ^= pack_shots((draws >= physical_error_rate / 3) & (draws < physical_error_rate))[0]
+                elif instruction.name == "measure":
+                    (ancilla,), (index,) = instruction.qubits, instruction.clbits
+                    flips[index] = x[ancilla]
+                    z[ancilla] = random_words(1)[0]
+                elif instruction.name == "reset":
+                    (ancilla,) = instruction.qubits
+                    x[ancilla], z[ancilla] = 0, random_words(1)[0]
+                else:
+                    apply_gate_to_frames(x, z, (instruction.name, *instruction.qubits))
+            events = flips ^ previous_flips
+            if round_index == 0:
+                events[not_deterministic] = 0
+            yield DetectorRound(round_index, unpack_shots(events, num_shots), None)
+            previous_flips = flips
+
+        if self.basis == "x":
+            for qubit in data_qubits:
+                apply_gate_to_frames(x, z, ("h", qubit))
+        data_flips = x[: self.num_data_qubits]
+        final_flips = np.zeros_like(previous_flips)
+        checks, offset = (self.code.z_checks, 0) if self.basis == "z" else (self.code.x_checks, self.code.z_checks.num_checks)
+        for check, support in enumerate(checks.supports()):
+            final_flips[offset + check] = np.bitwise_xor.reduce(data_flips[list(support)], axis=0)
+        events = final_flips ^ previous_flips
+        events[not_deterministic] = 0
+        logical_flips = np.bitwise_xor.reduce(data_flips[self.observable], axis=0, keepdims=True)
+        yield DetectorRound(self.num_rounds, unpack_shots(events, num_shots), unpack_shots(logical_flips, num_shots)[:, 0])
@@ -0,0 +1,67 @@
+"""
+Circuits whose input state is a parameter, bound when the circuit is run
+
+Any single-qubit state is, up to a global phase, U(theta, phi, 0)|0> = cos(theta/2)|0> + e^(i phi) sin(theta/2)|1>, so
+  preparing the input with a parameterised U gate rather than `initialize` lets a circuit be transpiled once, and run
+  against a whole batch of input states in a single simulator job
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit import ParameterVector
+from qiskit.quantum_info import Statevector
+
+from .result_cache import get_cached_counts
+from .simulation import statevector_simulator
+from .transpile_cache import transpile_cache
+
+# (theta, phi) of the U gate preparing the input state
+INITIAL_STATE_PARAMETERS = ParameterVector("initial_state", 2)
+
+
+def append_parameterized_state_preparation(qc: QuantumCircuit, qubit: int = 0) -> None:
+    """
+    Given a quantum circuit, prepare the given qubit (assumed to be in |0>) in the state described by
+      `INITIAL_STATE_PARAMETERS`
+    """
+    theta, phi = INITIAL_STATE_PARAMETERS
+    qc.u(theta, phi, 0, qubit)
+
+
+def get_state_parameter_values(state: Statevector) -> tuple[float, float]:
+    """
+    Given a (normalized) single-qubit state vector, return the (theta, phi) values preparing it, up to a global phase
+    """
+    alpha, beta = np.asarray(state.data, dtype=complex)
+    theta = 2 * float(np.arctan2(abs(beta), abs(alpha)))
+    phi = float(np.angle(beta) - np.angle(alpha)) if not np.isclose(abs(alpha) * abs(beta), 0) else 0.0
+    return theta, phi
+
+
+def bind_state(qc: QuantumCircuit, state: Statevector) -> QuantumCircuit:
+    """
+    Given a circuit parameterised by `INITIAL_STATE_PARAMETERS`, return a copy preparing the given state
+    """
+    return qc.assign_parameters(dict(zip(INITIAL_STATE_PARAMETERS, get_state_parameter_values(state), strict=True)))
+
+
+def simulate_circuit_for_states(qc: QuantumCircuit, states: Sequence[Statevector], num_shots: int = 1024, *, seed: int | None = None) -> list[dict[str, int]]:
+    """
+    Given a circuit parameterised by `INITIAL_STATE_PARAMETERS`, transpile it once, and run it for every input state in
+      one job, returning the counts for each state in order
+
+    Given a seed, the counts come from the result cache if one is installed (see `result_cache`)
+    """
+    if not states:
+        return []
+    theta, phi = INITIAL_STATE_PARAMETERS
+    thetas, phis = zip(*(get_state_parameter_values(state) for state in states), strict=True)
+
+    def simulate() -> list[dict[str, int]]:
+        transpiled = transpile_cache.transpile(qc, statevector_simulator)
+        result = statevector_simulator.run(transpiled, shots=num_shots, parameter_binds=[{theta: list(thetas), phi: list(phis)}], seed_simulator=seed).result()
+        return [result.get_counts(i) for i in range(len(states))]
+
+    return get_cached_counts([qc], "simulate_circuit_for_states", num_shots, seed, simulate, thetas=thetas, phis=phis)
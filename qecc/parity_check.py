@@ -0,0 +1,135 @@
+"""
+Bit-packed parity-check matrices
+
+Rows (and batches of error vectors) are packed 8 qubits to a byte, little-endian, so qubit j is bit j % 8 of byte j // 8
+"""
+
+from collections.abc import Iterable
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+def pack_bits(bits: ArrayLike) -> np.ndarray:
+    """
+    Pack a (..., num_qubits) array of bits into a (..., ceil(num_qubits / 8)) array of bytes
+    """
+    return np.packbits(np.asarray(bits, dtype=np.uint8), axis=-1, bitorder="little")
+
+
+def unpack_bits(packed: np.ndarray, num_qubits: int) -> np.ndarray:
+    return np.unpackbits(packed, axis=-1, count=num_qubits, bitorder="little")
+
+
+def parity(packed: np.ndarray) -> np.ndarray:
+    """
+    Parity of the number of set bits along the last axis of a packed array
+    """
+    # The parity of the XOR of the bytes is the parity of all of them, and there are few enough bytes that looping over
+    #  them is much faster than summing along a short axis
+    folded = packed[..., 0].copy()
+    for byte_index in range(1, packed.shape[-1]):
+        folded ^= packed[..., byte_index]
+    return np.bitwise_count(folded) & 1
+
+
+class ParityCheckMatrix:
+    """
+    A parity-check matrix over GF(2), with one row per check, where row i gives bit i of the syndrome
+    """
+
+    __slots__ = ("num_qubits", "packed")
+
+    def __init__(self, rows: ArrayLike, num_qubits: int) -> None:
+        self.num_qubits = num_qubits
+        self.packed = pack_bits(np.asarray(rows, dtype=np.uint8).reshape(-1, num_qubits))
+        self.packed.flags.writeable = False
+
+    @classmethod
+    def from_supports(cls, supports: Iterable[Iterable[int]], num_qubits: int) -> "ParityCheckMatrix":
+        supports = list(supports)
+        rows = np.zeros((len(supports), num_qubits), dtype=np.uint8)
+        for row, support in zip(rows, supports, strict=True):
+            row[list(support)] = 1
+        return cls(rows, num_qubits)
+
+    def __repr__(self) -> str:
+        return f"ParityCheckMatrix({self.dense().tolist()}, num_qubits={self.num_qubits})"
+
+    @property
+    def num_checks(self) -> int:
+        return self.packed.shape[0]
+
+    def dense(self) -> np.ndarray:
+        return unpack_bits(self.packed, self.num_qubits)
+
+    def supports(self) -> tuple[tuple[int, ...], ...]:
+        """
+        The qubits involved in each check
+        """
+        return tuple(tuple(int(qubit) for qubit in np.flatnonzero(row)) for row in self.dense())
+
+    def syndrome_weights(self) -> np.ndarray:
+        """
+        Multiplying a syndrome bit vector by these weights gives the syndrome as an integer
+        """
+        return (1 << np.arange(self.num_checks)).astype(np.int64)
+
+    def column_syndromes(self) -> np.ndarray:
+        """
+        The syndrome (as an integer) caused by an error on each qubit
+        """
+        return self.syndrome_weights() @ self.dense()
+
+    def syndrome_bits(self, packed_errors: np.ndarray) -> np.ndarray:
+        """
+        Given a (batch, num_bytes) array of packed error vectors, return the (batch, num_checks) array H @ e mod 2
+        """
+        return parity(packed_errors[..., np.newaxis, :] & self.packed)
+
+    def syndromes(self, packed_errors: np.ndarray) -> np.ndarray:
+        """
+        Given a (batch, num_bytes) array of packed error vectors, return each syndrome as an integer
+        """
+        return self.syndrome_bits(packed_errors) @ self.syndrome_weights()
+
+    def single_error_corrections(self) -> dict[int, int]:
+        """
+        Map each syndrome caused by a single-qubit error to the lowest-index qubit that causes it
+        """
+        corrections: dict[int, int] = {}
+        for qubit, syndrome in enumerate(self.column_syndromes()):
+            if syndrome:
+                corrections.setdefault(int(syndrome), qubit)
+        return corrections
+
+    def lookup_table(self) -> np.ndarray:
+        """
+        A (2^num_checks, num_bytes) array, where row s is the packed correction applied for syndrome s
+
+        Each syndrome caused by a single-qubit error is corrected by flipping the lowest-index qubit that causes it, and
+          any other syndrome is left alone, exactly as the `apply_*_correction` circuits do
+        """
+        table = np.zeros((2**self.num_checks, self.num_qubits), dtype=np.uint8)
+        for syndrome, qubit in self.single_error_corrections().items():
+            table[syndrome, qubit] = 1
+        return pack_bits(table)
+
+    def reduced_row_echelon_form(self) -> tuple["ParityCheckMatrix", tuple[int, ...]]:
+        """
+        Row-reduce, choosing pivots from the highest-index qubit down, so that each pivot column is zero in every other
+          row, and return the reduced matrix along with each row's pivot
+        """
+        rows = self.dense()
+        pivots: list[int] = []
+        for qubit in reversed(range(self.num_qubits)):
+            candidates = [row for row in range(len(pivots), self.num_checks) if rows[row, qubit]]
+            if not candidates:
+                continue
+            pivot_row = len(pivots)
+            rows[[pivot_row, candidates[0]]] = rows[[candidates[0], pivot_row]]
+            for row in range(self.num_checks):
+                if row != pivot_row and rows[row, qubit]:
+                    rows[row] ^= rows[pivot_row]
+            pivots.append(qubit)
+        return ParityCheckMatrix(rows[: len(pivots)], self.num_qubits), tuple(pivots)
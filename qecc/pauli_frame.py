@@ -0,0 +1,212 @@
+"""
+Pauli frame simulation of the Clifford circuits built by `qecc`
+
+One reference shot is simulated exactly (with a stabilizer tableau), and every other shot is represented by the Pauli
+  frame it differs from the reference by. Frames are propagated through the circuit 64 shots at a time, as the bits
+  of uint64 words, so each gate costs a handful of vectorised XORs over shots / 64 words, regardless of the number of
+  qubits
+
+Measurement results differ from the reference wherever the frame has an X component on the measured qubit. Random
+  measurement outcomes come from randomising the Z component of the frame wherever a qubit is (re)initialised or
+  measured, which has no effect on the state, but becomes a random X component after a basis change
+"""
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Clifford, StabilizerState
+
+from .gate_list import GateList
+from .measurement_record import MeasurementRecord
+from .simulation import get_stabilizer_circuit
+
+SHOTS_PER_WORD = 64
+ALL_ONES = np.uint64(0xFFFF_FFFF_FFFF_FFFF)
+PAULIS = frozenset({"id", "x", "y", "z"})
+
+# A compiled instruction is its name, followed by its qubit (and for measurements, clbit) indexes, except for
+#  conditional Paulis, which are ("if", condition clbits, condition value, true branch Paulis, false branch Paulis)
+type Operation = tuple
+
+
+class PauliFrameSimulator:
+    """
+    Samples measurement records of a Clifford circuit (or gate list), containing only Clifford gates, measurements,
+      resets, and `if_test`s whose bodies are Paulis (as in every `qecc` correction circuit)
+    """
+
+    def __init__(self, qc: QuantumCircuit | GateList, *, seed: int | None = None) -> None:
+        self.gate_list = qc if isinstance(qc, GateList) else GateList.from_circuit(get_stabilizer_circuit(qc))
+        self.num_qubits = self.gate_list.num_qubits
+        self.num_clbits = self.gate_list.num_clbits
+        self.rng = np.random.default_rng(seed)
+        self.operations = self._compile(self.gate_list)
+        self.reference = self._get_reference_sample()
+
+    @staticmethod
+    def _compile(gate_list: GateList) -> list[Operation]:
+        operations: list[Operation] = []
+        for instruction in gate_list:
+            if instruction.condition is not None:
+                if instruction.name not in PAULIS:
+                    raise ValueError("Only Pauli gates are supported inside if_test blocks")
+                condition_bits, condition_value = instruction.condition
+                operations.append(("if", condition_bits, condition_value, ((instruction.name, instruction.qubits[0]),), ()))
+            elif instruction.name == "measure":
+                operations.append(("measure", instruction.qubits[0], instruction.clbits[0]))
+            else:
+                operations.append((instruction.name, *instruction.qubits))
+        return operations
+
+    def _get_reference_sample(self) -> np.ndarray:
+        """
+        Run one shot of the circuit on a stabilizer tableau, returning the value of each clbit
+        """
+        state = StabilizerState(Clifford(QuantumCircuit(self.num_qubits)))
+        state.seed(int(self.rng.integers(2**32)))
+        clbits = np.zeros(self.num_clbits, dtype=np.uint8)
+        for operation in self.operations:
+            name = operation[0]
+            if name == "measure":
+                _, qubit, clbit = operation
+                outcome, state = state.measure([qubit])
+                clbits[clbit] = int(outcome)
+            elif name == "reset":
+                state = state.reset([operation[1]])
+            elif name == "if":
+                _, condition_bits, condition_value, true_paulis, false_paulis = operation
+                condition = all(clbits[clbit] == (condition_value >> i) & 1 for i, clbit in enumerate(condition_bits))
+                for pauli, qubit in true_paulis if condition else false_paulis:
+                    state = state.evolve(_get_gate_circuit(pauli, 1), [qubit])
+            elif name != "id":
+                state = state.evolve(_get_gate_circuit(name, len(operation) - 1), list(operation[1:]))
+        return clbits
+
+    def _random_words(self, num_words: int) -> np.ndarray:
+        return np.frombuffer(self.rng.bytes(8 * num_words), dtype=np.uint64).copy()
+
+    def sample_packed(self, num_shots: int) -> np.ndarray:
+        """
+        Return a (num_clbits, ceil(num_shots / 64)) uint64 array, where bit s % 64 of word s // 64 in row c is the value
+          of clbit c in shot s (bits past num_shots in the last word are meaningless)
+        """
+        num_words = -(-num_shots // SHOTS_PER_WORD)
+        x = np.zeros((self.num_qubits, num_words), dtype=np.uint64)
+        z = np.frombuffer(self.rng.bytes(8 * num_words * self.num_qubits), dtype=np.uint64).reshape(self.num_qubits, num_words).copy()
+        record = np.zeros((self.num_clbits, num_words), dtype=np.uint64)
+        for operation in self.operations:
+            name = operation[0]
+            if name == "measure":
+                _, qubit, clbit = operation
+                record[clbit] = x[qubit] ^ (ALL_ONES if self.reference[clbit] else np.uint64(0))
+                z[qubit] = self._random_words(num_words)
+            elif name == "reset":
+                x[operation[1]] = 0
+                z[operation[1]] = self._random_words(num_words)
+            elif name == "if":
+                apply_conditional_paulis_to_frames(x, z, record, self.reference, operation)
+            else:
+                apply_gate_to_frames(x, z, operation)
+        return record
+
+    def sample(self, num_shots: int) -> np.ndarray:
+        """
+        Return a (num_shots, num_clbits) array of bits
+        """
+        return unpack_shots(self.sample_packed(num_shots), num_shots)
+
+    def sample_record(self, num_shots: int) -> MeasurementRecord:
+        """
+        Return the shots as a measurement record, with the classical registers named c0, c1, ... in order
+        """
+        return MeasurementRecord.from_bits(self.sample(num_shots), {f"c{index}": clreg for index, clreg in enumerate(self.gate_list.clregs)})
+
+    def sample_counts(self, num_shots: int) -> dict[str, int]:
+        """
+        Return counts in the same format as Qiskit's `get_counts()` (see `MeasurementRecord.counts`)
+        """
+        return self.sample_record(num_shots).counts()
+
+
+def pack_shots(bits: np.ndarray) -> np.ndarray:
+    """
+    Pack a (rows, num_shots) array of bits into a (rows, ceil(num_shots / 64)) uint64 array, with shot s as bit s % 64
+      of word s // 64, as in `PauliFrameSimulator.sample_packed`
+    """
+    num_rows, num_shots = bits.shape
+    packed = np.zeros((num_rows, 8 * -(-num_shots // SHOTS_PER_WORD)), dtype=np.uint8)
+    packed[:, : -(-num_shots // 8)] = np.packbits(bits, axis=1, bitorder="little")
+    return packed.view("<u8").astype(np.uint64, copy=False)
+
+
+def unpack_shots(packed: np.ndarray, num_shots: int) -> np.ndarray:
+    """
+    Unpack a (rows, num_words) uint64 array of shots (as in `pack_shots`) into a (num_shots, rows) array of bits
+    """
+    bits = np.unpackbits(packed.astype("<u8", copy=False).view(np.uint8), axis=1, bitorder="little")[:, :num_shots]
+    return np.ascontiguousarray(bits.T)
+
+
+def apply_gate_to_frames(x: np.ndarray, z: np.ndarray, operation: Operation) -> None:
+    """
+    Conjugate the frames (the X and Z components of each qubit, packed over shots) by a Clifford gate, in place
+    """
+    name = operation[0]
+    if name in PAULIS:
+        return
+    if name == "h":
+        qubit = operation[1]
+        x[qubit], z[qubit] = z[qubit].copy(), x[qubit].copy()
+    elif name in {"s", "sdg"}:
+        z[operation[1]] ^= x[operation[1]]
+    elif name in {"sx", "sxdg"}:
+        x[operation[1]] ^= z[operation[1]]
+    elif name == "cx":
+        _, ctrl, targ = operation
+        x[targ] ^= x[ctrl]
+        z[ctrl] ^= z[targ]
+    elif name == "cz":
+        _, a, b = operation
+        z[a] ^= x[b]
+        z[b] ^= x[a]
+    elif name == "cy":
+        _, ctrl, targ = operation
+        # CY = S CX S^dagger on the target
+        z[targ] ^= x[targ]
+        x[targ] ^= x[ctrl]
+        z[ctrl] ^= z[targ]
+        z[targ] ^= x[targ]
+    elif name == "swap":
+        _, a, b = operation
+        x[[a, b]] = x[[b, a]]
+        z[[a, b]] = z[[b, a]]
+    else:
+        raise ValueError(f"Unsupported instruction for Pauli frame simulation: {name}")
+
+
+def apply_conditional_paulis_to_frames(x: np.ndarray, z: np.ndarray, record: np.ndarray, reference: np.ndarray, operation: Operation) -> None:
+    """
+    Apply a compiled `if_test` to the frames, in place, given the packed record of the clbits so far, and the reference
+      sample
+    """
+    _, condition_bits, condition_value, true_paulis, false_paulis = operation
+    condition = np.full(x.shape[1], ALL_ONES)
+    for i, clbit in enumerate(condition_bits):
+        condition &= record[clbit] if (condition_value >> i) & 1 else ~record[clbit]
+    reference_condition = all(reference[clbit] == (condition_value >> i) & 1 for i, clbit in enumerate(condition_bits))
+    # Wherever a shot took a different branch to the reference, its frame picks up both branches' Paulis
+    differs = ~condition if reference_condition else condition
+    for pauli, qubit in (*true_paulis, *false_paulis):
+        if pauli in {"x", "y"}:
+            x[qubit] ^= differs
+        if pauli in {"z", "y"}:
+            z[qubit] ^= differs
+
+
+def _get_gate_circuit(name: str, num_qubits: int) -> QuantumCircuit:
+    out = QuantumCircuit(num_qubits)
+    getattr(out, name)(*range(num_qubits))
+    return out
+
+
+def sample_counts(qc: QuantumCircuit, num_shots: int = 1024, *, seed: int | None = None) -> dict[str, int]:
+    return PauliFrameSimulator(qc, seed=seed).sample_counts(num_shots)
@@ -0,0 +1,128 @@
+"""
+Repetition codes of any distance d, generalising the three qubit bit flip and phase flip codes
+
+Check i compares qubit i with qubit d - 1, so the syndrome of an error is the error itself on the first d - 1 qubits,
+  relative to the last qubit. The most likely (minimum weight) error is then either that, or its complement (if
+  the last qubit was the one in error), whichever has weight at most (d - 1) // 2, i.e. a majority vote
+
+Every circuit has O(d) gates: rather than looking up each syndrome, the correction counts the syndrome bits that are set
+  in a classical register (O(log^2 d) classical operations per bit), and conditions each qubit's correction on its own
+  syndrome bit and that count
+"""
+
+import numpy as np
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+from qiskit.circuit.classical import expr
+
+from .cache import cached_circuit
+from .codes import StabilizerCode
+from .parity_check import ParityCheckMatrix
+
+REPETITION_CODE_KINDS = ("bit_flip", "phase_flip")
+
+
+def _check_kind(kind: str) -> None:
+    if kind not in REPETITION_CODE_KINDS:
+        raise ValueError(f"Unknown repetition code kind: {kind}")
+
+
+def get_repetition_code(distance: int, kind: str = "bit_flip") -> StabilizerCode:
+    """
+    The distance d repetition code, against bit flips (Z checks, like the three qubit bit flip code) or phase flips
+      (X checks, like the three qubit phase flip code)
+    """
+    _check_kind(kind)
+    checks = ParityCheckMatrix.from_supports(((qubit, distance - 1) for qubit in range(distance - 1)), distance)
+    no_checks = ParityCheckMatrix([], distance)
+    zeros, ones = [0] * distance, [1] * distance
+    if kind == "bit_flip":
+        return StabilizerCode(f"repetition_bit_flip_{distance}", checks, no_checks, np.array([ones, zeros], dtype=np.uint8), np.array([zeros, ones], dtype=np.uint8))
+    # |0> is encoded as |+...+>, so the logical operators are swapped relative to the bit flip code
+    return StabilizerCode(f"repetition_phase_flip_{distance}", no_checks, checks, np.array([zeros, ones], dtype=np.uint8), np.array([ones, zeros], dtype=np.uint8))
+
+
+@cached_circuit
+def get_repetition_code_encoding_circuit(distance: int, kind: str = "bit_flip") -> QuantumCircuit:
+    """
+    Encode |0> as |0...0> and |1> as |1...1> (bit flip), or |0> as |+...+> and |1> as |-...-> (phase flip)
+    """
+    _check_kind(kind)
+    out = QuantumCircuit(distance)
+    for qubit in range(1, distance):
+        out.cx(0, qubit)
+    if kind == "phase_flip":
+        out.h(range(distance))
+    return out
+
+
+@cached_circuit
+def get_repetition_code_decoding_circuit(distance: int, kind: str = "bit_flip") -> QuantumCircuit:
+    return get_repetition_code_encoding_circuit(distance, kind).inverse()
+
+
+@cached_circuit
+def get_repetition_code_syndrome_extraction_circuit(distance: int, kind: str = "bit_flip") -> QuantumCircuit:
+    """
+    Measure the parity of each of the first d - 1 qubits with the last onto a syndrome qubit, with qubits ordered data,
+      then syndrome
+    """
+    _check_kind(kind)
+    data, syndrome = QuantumRegister(distance), QuantumRegister(distance - 1)
+    out = QuantumCircuit(data, syndrome)
+    if kind == "bit_flip":
+        for qubit, syndrome_qubit in enumerate(syndrome):
+            out.cx(data[qubit], syndrome_qubit)
+            out.cx(data[-1], syndrome_qubit)
+    else:
+        out.h(syndrome)
+        for qubit, syndrome_qubit in enumerate(syndrome):
+            out.cx(syndrome_qubit, data[qubit])
+            out.cx(syndrome_qubit, data[-1])
+        out.h(syndrome)
+    return out
+
+
+def apply_repetition_code_correction(qc: QuantumCircuit, distance: int, kind: str = "bit_flip") -> None:
+    """
+    Given a circuit laid out like the syndrome extraction circuit, measure the syndrome qubits into the first classical
+      register, and apply the majority vote correction
+
+    The number of syndrome bits set is counted (in binary) in a new, anonymous classical register (so the correction can
+      be applied more than once to the same circuit), and qubit d - 1 is taken to be in error if the count is more than
+      (d - 1) // 2. Each of the other qubits is then in error if its syndrome bit differs
+      from that
+    """
+    _check_kind(kind)
+    syndrome_measurement = qc.cregs[0]
+    qc.measure(qc.qubits[distance : 2 * distance - 1], syndrome_measurement)
+    count = ClassicalRegister(max(1, (distance - 1).bit_length()))
+    qc.add_register(count)
+    for num_counted, syndrome_bit in enumerate(syndrome_measurement):
+        # Add the syndrome bit, from the top bit down, so that each bit's carry is from the bits below it before they're
+        #  updated. Only the bits that the count can have reached need updating
+        for bit in reversed(range((num_counted + 1).bit_length())):
+            carry = syndrome_bit
+            for lower_bit in count[:bit]:
+                carry = expr.logic_and(carry, lower_bit)
+            qc.store(count[bit], expr.bit_xor(count[bit], carry))
+    last_qubit_in_error = expr.greater(count, (distance - 1) // 2)
+    gate = "x" if kind == "bit_flip" else "z"
+    for qubit, syndrome_bit in enumerate(syndrome_measurement):
+        with qc.if_test(expr.bit_xor(syndrome_bit, last_qubit_in_error)):
+            getattr(qc, gate)(qubit)
+    with qc.if_test(last_qubit_in_error):
+        getattr(qc, gate)(distance - 1)
+
+
+def decode_repetition_code_syndromes(syndrome_bits: np.ndarray) -> np.ndarray:
+    """
+    Given a (batch, d - 1) array of syndrome bits, return the (batch, d) array of the majority vote correction for each,
+      the same correction `apply_repetition_code_correction` applies
+    """
+    syndrome_bits = np.asarray(syndrome_bits, dtype=np.uint8)
+    num_shots, num_checks = syndrome_bits.shape
+    last_qubit_in_error = np.count_nonzero(syndrome_bits, axis=1) > num_checks // 2
+    out = np.empty((num_shots, num_checks + 1), dtype=np.uint8)
+    out[:, :-1] = syndrome_bits ^ last_qubit_in_error[:, np.newaxis]
+    out[:, -1] = last_qubit_in_error
+    return out
@@ -0,0 +1,157 @@
+"""
+Opt-in on-disk cache of simulation results, so re-running a seeded simulation of the same circuits with the same number
+  of shots (e.g. re-running the tests, or a sweep) loads the counts rather than simulating them again
+
+Only seeded simulations are cached, since only they're reproducible. Entries are keyed by the fingerprints of the
+  circuits, the simulator and its options (e.g. the noise model), the number of shots, the seed, and the Qiskit and Aer
+  versions, and stored as zlib-compressed JSON of the counts of each circuit. Once the entries take up more than
+  max_bytes, the least recently used are deleted, with each entry's modification time recording when it was last used
+"""
+
+import hashlib
+import json
+import os
+import time
+import zlib
+from collections.abc import Callable, Sequence
+from contextlib import suppress
+from pathlib import Path
+from typing import NamedTuple
+
+import qiskit
+import qiskit_aer
+from qiskit import QuantumCircuit
+
+from .artifact_store import _write_atomically
+from .fingerprint import circuit_fingerprint
+from .instrumentation import span
+
+# Bumped whenever the format of the entries changes, invalidating every existing entry
+RESULT_CACHE_VERSION = 1
+ENTRY_SUFFIX = ".json.z"
+
+
+class ResultCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    max_bytes: int
+    currsize: int
+
+
+def _touch(path: Path) -> None:
+    # File timestamps are only as fine-grained as the kernel's clock tick, too coarse to order entries used in quick
+    #  succession, so the time is set explicitly
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+
+
+class ResultCache:
+    """
+    A directory of cached counts, holding at most max_bytes of entries
+    """
+
+    def __init__(self, directory: Path, *, max_bytes: int = 64 * 2**20) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def get_key(circuits: Sequence[QuantumCircuit], simulator: str, num_shots: int, seed: int, **options: object) -> str:
+        description = (RESULT_CACHE_VERSION, qiskit.__version__, qiskit_aer.__version__, tuple(circuit_fingerprint(qc) for qc in circuits), simulator, num_shots, seed, sorted(options.items()))
+        return hashlib.blake2b(repr(description).encode(), digest_size=16).hexdigest()
+
+    def _get_path(self, key: str) -> Path:
+        return self.directory / f"{key}{ENTRY_SUFFIX}"
+
+    def _get_entries(self) -> list[tuple[int, int, Path]]:
+        """
+        The (last used time, size, path) of every entry, least recently used first
+        """
+        out = []
+        for path in self.directory.glob(f"*{ENTRY_SUFFIX}"):
+            # Another process may evict an entry while we're listing them
+            with suppress(FileNotFoundError):
+                stat = path.stat()
+                out.append((stat.st_mtime_ns, stat.st_size, path))
+        return sorted(out)
+
+    def load(self, key: str) -> list[dict[str, int]] | None:
+        """
+        Load the counts saved under the key, or return None if there aren't any, or they can't be read
+        """
+        path = self._get_path(key)
+        try:
+            out = json.loads(zlib.decompress(path.read_bytes()))
+            _touch(path)
+        except (FileNotFoundError, zlib.error, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return out
+
+    def save(self, key: str, counts: Sequence[dict[str, int]]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._get_path(key)
+        _write_atomically(path, zlib.compress(json.dumps(list(counts), separators=(",", ":")).encode()))
+        _touch(path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = self._get_entries()
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        for _, _, path in self._get_entries():
+            path.unlink(missing_ok=True)
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def info(self) -> ResultCacheInfo:
+        return ResultCacheInfo(self.hits, self.misses, self.evictions, self.max_bytes, sum(size for _, size, _ in self._get_entries()))
+
+
+_result_cache: ResultCache | None = None
+
+
+def use_result_cache(directory: Path | None, *, max_bytes: int = 64 * 2**20) -> ResultCache | None:
+    """
+    Cache the results of seeded simulations in the given directory (or stop caching them, if it's None), returning the
+      cache
+    """
+    global _result_cache
+    _result_cache = None if directory is None else ResultCache(directory, max_bytes=max_bytes)
+    return _result_cache
+
+
+def get_result_cache() -> ResultCache | None:
+    return _result_cache
+
+
+def get_cached_counts(circuits: Sequence[QuantumCircuit], simulator: str, num_shots: int, seed: int | None, simulate: Callable[[], list[dict[str, int]]], **options: object) -> list[dict[str, int]]:
+    """
+    The counts of each circuit, from the result cache if they're in it, otherwise from simulate() (and then saved to the
+      cache), or straight from simulate() if there's no result cache installed, or no seed
+    """
+    if _result_cache is None or seed is None:
+        return simulate()
+    key = _result_cache.get_key(circuits, simulator, num_shots, seed, **options)
+    with span("load_results", key=key) as load_span:
+        out = _result_cache.load(key)
+        if load_span is not None:
+            load_span.args["hit"] = out is not None
+    if out is None:
+        out = simulate()
+        _result_cache.save(key, out)
+    return out
@@ -0,0 +1,107 @@
+"""
+Checking that a circuit's outcomes follow expected ratios with as few shots as the outcomes allow, by sampling in
+  batches and stopping as soon as a sequential probability ratio test (SPRT) accepts or rejects the ratios
+
+For each expected outcome with probability p, one SPRT tests p against p + tolerance, and another against
+  p - tolerance (either is dropped if it would leave [0, 1]), each stopping once its log likelihood ratio leaves
+  (log(beta / (1 - alpha)), log((1 - beta) / alpha)). The ratios are rejected as soon as any test rejects, or any
+  unexpected outcome turns up, and accepted once every test has accepted. Splitting alpha evenly between the tests
+  bounds the chance of rejecting correct ratios by alpha, and each test accepts ratios that are off by the tolerance
+  with probability at most beta
+
+Outcomes that are certain, or far from borderline, are decided within a batch or two, where a fixed shot count would
+  have to be large enough for the hardest case, and ratios that are only just off by the tolerance get more batches,
+  up to max_shots. A single expected outcome is accepted after about log(beta) / log(1 - tolerance) shots (88 by
+  default), the fewest which would have seen another outcome, with probability 1 - beta, if it were wrong a tolerance
+  of the time
+"""
+
+import math
+from collections import Counter
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass
+
+SEQUENTIAL_TEST_DECISIONS = ("accept", "reject", "inconclusive")
+
+
+@dataclass(frozen=True)
+class SequentialTestResult[T: Hashable]:
+    decision: str
+    num_shots: int
+    counts: dict[T, int]
+    # The outcome whose count decided a rejection
+    rejected_outcome: T | None = None
+
+    @property
+    def accepted(self) -> bool:
+        return self.decision == "accept"
+
+
+class _SPRT:
+    """
+    Wald's SPRT of a binomial proportion p0 against p1, frozen once decided
+    """
+
+    def __init__(self, outcome: Hashable, p0: float, p1: float, lower: float, upper: float) -> None:
+        self.outcome = outcome
+        self.success_llr = math.log(p1 / p0)
+        self.failure_llr = math.log((1 - p1) / (1 - p0)) if p0 < 1 else math.inf
+        self.lower = lower
+        self.upper = upper
+        self.decision: str | None = None
+
+    def update(self, num_successes: int, num_trials: int) -> None:
+        if self.decision is not None:
+            return
+        num_failures = num_trials - num_successes
+        llr = num_successes * self.success_llr + (num_failures * self.failure_llr if num_failures else 0.0)
+        if llr >= self.upper:
+            self.decision = "reject"
+        elif llr <= self.lower:
+            self.decision = "accept"
+
+
+def run_sequential_ratio_test[T: Hashable](
+    sample: Callable[[int], Mapping[T, int]],
+    expected_ratios: Mapping[T, float],
+    *,
+    alpha: float = 1e-4,
+    beta: float = 1e-4,
+    tolerance: float = 0.1,
+    batch_size: int = 64,
+    max_shots: int = 16_384,
+) -> SequentialTestResult[T]:
+    """
+    Call sample(num_shots) for counts of batch_size shots at a time, until the counts so far accept or reject the
+      expected ratios (outcomes with a ratio of 0 are treated as unexpected), or max_shots have been used, in which
+      case the result is inconclusive
+
+    Outcomes can be anything hashable, e.g. Qiskit-style bitstrings, or packed measurement records' bytes (see
+      `MeasurementRecord.packed_counts`)
+    """
+    ratio_sum = sum(expected_ratios.values())
+    probabilities = {outcome: ratio / ratio_sum for outcome, ratio in expected_ratios.items() if ratio > 0}
+    alternatives = [(outcome, p0, p1) for outcome, p0 in probabilities.items() for p1 in (p0 + tolerance, p0 - tolerance) if 0 < p1 < 1]
+    test_alpha = alpha / max(len(alternatives), 1)
+    lower, upper = math.log(beta / (1 - test_alpha)), math.log((1 - beta) / test_alpha)
+    tests = [_SPRT(outcome, p0, p1, lower, upper) for outcome, p0, p1 in alternatives]
+    # With a single expected outcome, any other outcome rejects at once, and each shot of it takes the one test the same
+    #  step towards accepting, so the test accepts after exactly this many shots, and the last batch is trimmed to stop
+    #  there, rather than running on to a whole number of batches
+    shots_to_accept = math.ceil(lower / tests[0].success_llr) if len(probabilities) == 1 and len(tests) == 1 else max_shots
+
+    counts: Counter[T] = Counter()
+    num_shots = 0
+    while num_shots < max_shots:
+        counts.update(sample(min(batch_size, max_shots - num_shots, max(shots_to_accept - num_shots, 1))))
+        num_shots = counts.total()
+        for outcome in counts:
+            if outcome not in probabilities:
+                return SequentialTestResult("reject", num_shots, dict(counts), outcome)
+        for test in tests:
+            test.update(counts[test.outcome], num_shots)
+            if test.decision == "reject":
+                return SequentialTestResult("reject", num_shots, dict(counts), test.outcome)
+        if all(test.decision == "accept" for test in tests):
+            return SequentialTestResult("accept", num_shots, dict(counts))
+    return SequentialTestResult("inconclusive", num_shots, dict(counts))
@@ -0,0 +1,199 @@
+"""
+Simulating the circuits built by `qecc`
+
+All the circuits in this package are Clifford (H, CX, X, Z, measurements, and classically controlled Paulis), so
+  they can be simulated with a stabilizer tableau, whose cost grows polynomially in the number of qubits, rather than
+  with a dense statevector, whose cost grows exponentially
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit import ControlFlowOp, Instruction
+from qiskit.result import Result
+from qiskit_aer import AerSimulator
+
+from .instrumentation import span
+from .measurement_record import MeasurementRecord, get_registers
+from .result_cache import get_cached_counts
+from .transpile_cache import transpile_cache
+
+CLIFFORD_GATES = frozenset({"id", "x", "y", "z", "h", "s", "sdg", "sx", "sxdg", "cx", "cy", "cz", "swap", "iswap", "ecr", "dcx"})
+NON_UNITARY_INSTRUCTIONS = frozenset({"measure", "reset", "barrier", "delay", "store"})
+# Gates taking |0> to each single-qubit stabilizer state, keyed by the label `QuantumCircuit.initialize` accepts for it
+STABILIZER_STATE_PREPARATION_GATES: dict[str, tuple[str, ...]] = {"0": (), "1": ("x",), "+": ("h",), "-": ("x", "h"), "r": ("h", "s"), "l": ("h", "sdg")}
+
+# Shot branching simulates the shots together, only splitting them where a measurement's outcome is random, rather than
+#  simulating every shot separately, so circuits with many deterministic mid-circuit measurements (syndrome extraction)
+#  cost little more than one shot
+statevector_simulator = AerSimulator(shot_branching_enable=True)
+stabilizer_simulator = AerSimulator(method="stabilizer")
+
+
+def _get_stabilizer_state_label(params: list) -> str | None:
+    """
+    Given the parameters of a single-qubit `initialize` instruction, return the label of the stabilizer state it
+      initialises to, or None if it isn't a stabilizer state
+    """
+    if isinstance(params[0], str):
+        return params[0]
+    if len(params) == 1:
+        # Initialising from an integer, which is always a computational basis state
+        return str(int(params[0].real))
+    amplitudes = np.asarray(params, dtype=complex)
+    if np.isclose(abs(amplitudes[1]), 0):
+        return "0"
+    if np.isclose(abs(amplitudes[0]), 0):
+        return "1"
+    if not np.isclose(abs(amplitudes[0]), abs(amplitudes[1])):
+        return None
+    relative_phase = amplitudes[1] / amplitudes[0]
+    for label, phase in (("+", 1), ("-", -1), ("r", 1j), ("l", -1j)):
+        if np.isclose(relative_phase, phase):
+            return label
+    return None
+
+
+def _is_clifford_instruction(instruction: Instruction) -> bool:
+    if isinstance(instruction, ControlFlowOp):
+        return all(is_clifford_circuit(block) for block in instruction.blocks)
+    if instruction.name in CLIFFORD_GATES or instruction.name in NON_UNITARY_INSTRUCTIONS:
+        return True
+    if instruction.name == "initialize" and instruction.num_qubits == 1:
+        return _get_stabilizer_state_label(instruction.params) is not None
+    return False
+
+
+def is_clifford_circuit(qc: QuantumCircuit) -> bool:
+    """
+    Whether every instruction in the circuit (including inside `if_test` blocks) can be run on a stabilizer simulator
+    """
+    return all(_is_clifford_instruction(circuit_instruction.operation) for circuit_instruction in qc.data)
+
+
+def get_stabilizer_circuit(qc: QuantumCircuit) -> QuantumCircuit:
+    """
+    Given a Clifford circuit, replace each `initialize` with a reset followed by the Clifford gates preparing the same
+      state, so the circuit can be run on the stabilizer simulator directly
+
+    Transpiling for the stabilizer simulator would also do this, but is far slower than running the circuit, and can
+      leave rotations with floating point angles that the stabilizer simulator rejects
+    """
+    out = qc.copy_empty_like()
+    for circuit_instruction in qc.data:
+        operation = circuit_instruction.operation
+        if operation.name == "initialize":
+            (qubit,) = circuit_instruction.qubits
+            label = _get_stabilizer_state_label(operation.params)
+            if label is None:
+                raise ValueError("Circuit initialises a qubit to a non-stabilizer state")
+            out.reset(qubit)
+            for gate_name in STABILIZER_STATE_PREPARATION_GATES[label]:
+                getattr(out, gate_name)(qubit)
+        elif isinstance(operation, ControlFlowOp):
+            out.append(circuit_instruction.replace(operation=operation.replace_blocks([get_stabilizer_circuit(block) for block in operation.blocks])))
+        else:
+            out.append(circuit_instruction)
+    return out
+
+
+def get_simulator(qc: QuantumCircuit) -> AerSimulator:
+    """
+    The cheapest simulator that can run the given circuit
+    """
+    return stabilizer_simulator if is_clifford_circuit(qc) else statevector_simulator
+
+
+def _run(qc: QuantumCircuit, num_shots: int, *, memory: bool = False, seed: int | None = None) -> Result:
+    if is_clifford_circuit(qc):
+        simulator = stabilizer_simulator
+        with span("transpile", qc, simulator="stabilizer"):
+            qc = get_stabilizer_circuit(qc)
+    else:
+        simulator = statevector_simulator
+        with span("transpile", qc, simulator="statevector"):
+            qc = transpile_cache.transpile(qc, statevector_simulator)
+    with span("run", qc, num_shots=num_shots):
+        return simulator.run(qc, shots=num_shots, memory=memory, seed_simulator=seed).result()
+
+
+def simulate_circuit(qc: QuantumCircuit, num_shots: int = 1024, *, seed: int | None = None) -> dict[str, int]:
+    """
+    Clifford circuits are run on the stabilizer simulator directly, anything else is transpiled (via the transpile
+      cache) and run on the statevector simulator
+
+    Given a seed, the counts are reproducible, and come from the result cache if one is installed (see `result_cache`)
+    """
+
+    def simulate() -> list[dict[str, int]]:
+        result = _run(qc, num_shots, seed=seed)
+        with span("parse_results"):
+            return [result.get_counts()]
+
+    (out,) = get_cached_counts([qc], "simulate_circuit", num_shots, seed, simulate)
+    return out
+
+
+def simulate_circuit_record(qc: QuantumCircuit, num_shots: int = 1024, *, seed: int | None = None) -> MeasurementRecord:
+    """
+    Simulate the circuit as `simulate_circuit` does, but return every shot, in the order they were taken, as a
+      measurement record with the circuit's classical registers
+    """
+    result = _run(qc, num_shots, memory=True, seed=seed)
+    with span("parse_results"):
+        return MeasurementRecord.from_hex_memory(result.data()["memory"], qc.num_clbits, get_registers(qc))
+
+
+def simulate_circuit_grouped_record(qc: QuantumCircuit, num_shots: int = 1024, *, seed: int | None = None) -> MeasurementRecord:
+    """
+    `simulate_circuit_record`, but with the shots grouped by outcome rather than in the order they were taken, for when
+      only their distribution matters
+
+    The record is built from Aer's counts keyed by hex outcomes, which skips both per-shot memory and formatting the
+      counts as bitstrings, and (given a seed) can be cached like any other counts
+    """
+
+    def simulate() -> list[dict[str, int]]:
+        return [_run(qc, num_shots, seed=seed).data()["counts"]]
+
+    (hex_counts,) = get_cached_counts([qc], "simulate_circuit_grouped_record", num_shots, seed, simulate)
+    with span("parse_results"):
+        return MeasurementRecord.from_hex_counts(hex_counts, qc.num_clbits, get_registers(qc))
+
+
+def simulate_circuits(circuits: Sequence[QuantumCircuit], num_shots: int = 1024, *, seed: int | None = None) -> list[dict[str, int]]:
+    """
+    Simulate a batch of circuits, returning the counts for each circuit in order
+
+    The circuits are submitted as one job per simulator (rather than one job per circuit), so the overhead of
+      submitting a job is paid at most twice for the whole batch
+
+    Aer derives each circuit's seed from the job's seed and the circuit's position in it, so a seeded batch is cached as
+      a whole (see `simulate_circuit`)
+    """
+    return get_cached_counts(circuits, "simulate_circuits", num_shots, seed, lambda: _simulate_circuits(circuits, num_shots, seed))
+
+
+def _simulate_circuits(circuits: Sequence[QuantumCircuit], num_shots: int, seed: int | None) -> list[dict[str, int]]:
+    is_clifford = [is_clifford_circuit(qc) for qc in circuits]
+    clifford_indexes = [index for index, clifford in enumerate(is_clifford) if clifford]
+    other_indexes = [index for index, clifford in enumerate(is_clifford) if not clifford]
+    out: list[dict[str, int]] = [{} for _ in circuits]
+    if clifford_indexes:
+        with span("transpile", simulator="stabilizer", num_circuits=len(clifford_indexes)):
+            converted = [get_stabilizer_circuit(circuits[index]) for index in clifford_indexes]
+        with span("run", num_circuits=len(converted), num_shots=num_shots):
+            result = stabilizer_simulator.run(converted, shots=num_shots, seed_simulator=seed).result()
+        with span("parse_results"):
+            for experiment_index, index in enumerate(clifford_indexes):
+                out[index] = result.get_counts(experiment_index)
+    if other_indexes:
+        with span("transpile", simulator="statevector", num_circuits=len(other_indexes)):
+            transpiled = [transpile_cache.transpile(circuits[index], statevector_simulator) for index in other_indexes]
+        with span("run", num_circuits=len(transpiled), num_shots=num_shots):
+            result = statevector_simulator.run(transpiled, shots=num_shots, seed_simulator=seed).result()
+        with span("parse_results"):
+            for experiment_index, index in enumerate(other_indexes):
+                out[index] = result.get_counts(experiment_index)
+    return out
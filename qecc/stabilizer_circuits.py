@@ -0,0 +1,201 @@
+"""
+Generating encoding, syndrome extraction, and correction circuits from a code's parity-check matrices
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit.library import XGate, YGate, ZGate
+from qiskit.circuit.quantumcircuit import QubitSpecifier
+
+from .codes import StabilizerCode
+from .gate_list import GateList
+from .parity_check import ParityCheckMatrix
+
+SINGLE_QUBIT_PAULIS = {"x": XGate, "y": YGate, "z": ZGate}
+
+
+def get_css_encoding_gate_list(x_checks: ParityCheckMatrix, logical_x: np.ndarray) -> GateList:
+    """
+    Given the X-type checks and the (X-type) logical X operator of a code, return a gate list encoding the state of
+      qubit 0 into the code
+
+    |0> is encoded as the equal superposition of every product of X checks applied to |0...0>, by putting a pivot qubit
+      of each check into |+>, then fanning it out over the rest of the check. |1> is encoded as logical X applied to
+      that, by fanning qubit 0 out over a representative of logical X which avoids the pivots
+    """
+    reduced_checks, pivots = x_checks.reduced_row_echelon_form()
+    logical_x = np.array(logical_x, dtype=np.uint8)
+    for row, pivot in zip(reduced_checks.dense(), pivots, strict=True):
+        if logical_x[pivot]:
+            logical_x ^= row
+    if not logical_x[0] or 0 in pivots:
+        raise ValueError("Qubit 0 must be in the support of logical X, and not be needed as a pivot")
+    out = GateList(x_checks.num_qubits)
+    for pivot in sorted(pivots):
+        out.append("h", (pivot,))
+    for target in np.flatnonzero(logical_x[1:]) + 1:
+        out.append("cx", (0, int(target)))
+    for row, pivot in zip(reduced_checks.dense(), pivots, strict=True):
+        for target in reversed(np.flatnonzero(row)):
+            if target != pivot:
+                out.append("cx", (pivot, int(target)))
+    return out
+
+
+def get_css_encoding_circuit(x_checks: ParityCheckMatrix, logical_x: np.ndarray) -> QuantumCircuit:
+    return get_css_encoding_gate_list(x_checks, logical_x).to_circuit()
+
+
+def schedule_check_cnots(checks: ParityCheckMatrix) -> list[list[tuple[int, int]]]:
+    """
+    Split the (check, qubit) pairs of the checks into as few layers as possible, such that no check or qubit is in two
+      pairs of the same layer, so each layer of syndrome extraction CNOTs can run in parallel
+
+    The CNOTs measuring checks of one type all commute (any two either share a control or share a target, or act on
+      different qubits), so they can be run in any order. The fewest layers possible is the largest number of pairs
+      any one check or qubit is in, and this always achieves it, by colouring the edges of the bipartite graph of checks
+      and qubits: each pair is given a colour (layer) free at both ends, after swapping the two colours along an
+      alternating path if there isn't one
+    """
+    dense = checks.dense()
+    num_layers = int(max(dense.sum(axis=1).max(initial=0), dense.sum(axis=0).max(initial=0)))
+    # The node at the other end of each coloured edge, for each colour, with checks as ("check", i), qubits ("qubit", i)
+    neighbours: dict[tuple[str, int], dict[int, tuple[str, int]]] = {}
+    for check, support in enumerate(checks.supports()):
+        for qubit in support:
+            u, v = ("check", check), ("qubit", qubit)
+            u_neighbours, v_neighbours = neighbours.setdefault(u, {}), neighbours.setdefault(v, {})
+            colour_free_at_u = next(colour for colour in range(num_layers) if colour not in u_neighbours)
+            colour_free_at_v = next(colour for colour in range(num_layers) if colour not in v_neighbours)
+            if colour_free_at_u in v_neighbours:
+                # Swap the two colours along the path from v alternating between them. It can't reach u (it would end
+                #  there on an edge coloured colour_free_at_u, which u doesn't have), so afterwards colour_free_at_u is
+                #  free at both
+                path, node, colour = [], v, colour_free_at_u
+                while colour in neighbours[node]:
+                    next_node = neighbours[node][colour]
+                    path.append((node, next_node, colour))
+                    node, colour = next_node, colour_free_at_v if colour == colour_free_at_u else colour_free_at_u
+                for a, b, colour in path:
+                    del neighbours[a][colour], neighbours[b][colour]
+                for a, b, colour in path:
+                    swapped = colour_free_at_v if colour == colour_free_at_u else colour_free_at_u
+                    neighbours[a][swapped], neighbours[b][swapped] = b, a
+            u_neighbours[colour_free_at_u], v_neighbours[colour_free_at_u] = v, u
+    layers: list[list[tuple[int, int]]] = [[] for _ in range(num_layers)]
+    for check in range(checks.num_checks):
+        for colour, (_, qubit) in sorted(neighbours.get(("check", check), {}).items()):
+            layers[colour].append((check, qubit))
+    return layers
+
+
+def append_bit_flip_syndrome_extraction(out: GateList, z_checks: ParityCheckMatrix, data_qubits: Sequence[int], syndrome_qubits: Sequence[int]) -> None:
+    """
+    Measure each Z-type check onto its syndrome qubit, by CNOTing each data qubit in the check onto it, in the fewest
+      parallel layers (see `schedule_check_cnots`)
+    """
+    for layer in schedule_check_cnots(z_checks):
+        for check, ctrl in layer:
+            out.append("cx", (data_qubits[ctrl], syndrome_qubits[check]))
+
+
+def append_phase_flip_syndrome_extraction(out: GateList, x_checks: ParityCheckMatrix, data_qubits: Sequence[int], syndrome_qubits: Sequence[int]) -> None:
+    """
+    Measure each X-type check onto its syndrome qubit, by CNOTing from it (in the Hadamard basis) onto each data qubit
+      in the check, in the fewest parallel layers (see `schedule_check_cnots`)
+    """
+    for syndrome_qubit in syndrome_qubits:
+        out.append("h", (syndrome_qubit,))
+    for layer in schedule_check_cnots(x_checks):
+        for check, targ in layer:
+            out.append("cx", (syndrome_qubits[check], data_qubits[targ]))
+    for syndrome_qubit in syndrome_qubits:
+        out.append("h", (syndrome_qubit,))
+
+
+def append_syndrome_measurement_with_ancilla_reuse(
+    out: GateList,
+    code: StabilizerCode,
+    data_qubits: Sequence[int],
+    ancillas: Sequence[int],
+    bit_flip_clbits: Sequence[int],
+    phase_flip_clbits: Sequence[int],
+) -> None:
+    """
+    Measure every check of the code (Z-type into bit_flip_clbits, then X-type into phase_flip_clbits) one at a time,
+      each on the next ancilla of the pool in turn, which is measured and reset to |0> so it can be reused for a later
+      check
+    """
+    checks = [(support, "z", clbit) for support, clbit in zip(code.z_checks.supports(), bit_flip_clbits, strict=True)]
+    checks += [(support, "x", clbit) for support, clbit in zip(code.x_checks.supports(), phase_flip_clbits, strict=True)]
+    for index, (support, check_type, clbit) in enumerate(checks):
+        ancilla = ancillas[index % len(ancillas)]
+        if check_type == "z":
+            for ctrl in support:
+                out.append("cx", (data_qubits[ctrl], ancilla))
+        else:
+            out.append("h", (ancilla,))
+            for targ in support:
+                out.append("cx", (ancilla, data_qubits[targ]))
+            out.append("h", (ancilla,))
+        out.append("measure", (ancilla,), (clbit,))
+        out.append("reset", (ancilla,))
+
+
+def get_syndrome_extraction_gate_list(code: StabilizerCode, num_ancillas: int | None = None) -> GateList:
+    """
+    Syndrome extraction for both types of check, with qubits ordered data, bit flip syndrome, phase flip syndrome
+
+    Given num_ancillas, the checks are instead measured one at a time on a pool of that many ancillas (see
+      `append_syndrome_measurement_with_ancilla_reuse`), with qubits ordered data, ancillas, and the syndromes measured
+      into a bit flip and a phase flip classical register, so the circuit is only num_ancillas qubits wider than the code
+    """
+    if num_ancillas is not None and num_ancillas < 1:
+        raise ValueError(f"At least one ancilla is needed, not {num_ancillas}")
+    data_qubits = range(code.num_data_qubits)
+    if num_ancillas is not None:
+        out = GateList(code.num_data_qubits + num_ancillas, (code.z_checks.num_checks, code.x_checks.num_checks))
+        bit_flip_clbits, phase_flip_clbits = out.clregs
+        append_syndrome_measurement_with_ancilla_reuse(out, code, data_qubits, range(code.num_data_qubits, out.num_qubits), bit_flip_clbits, phase_flip_clbits)
+        return out
+    bit_flip_syndrome = range(code.num_data_qubits, code.num_data_qubits + code.z_checks.num_checks)
+    phase_flip_syndrome = range(bit_flip_syndrome.stop, bit_flip_syndrome.stop + code.x_checks.num_checks)
+    out = GateList(phase_flip_syndrome.stop)
+    append_bit_flip_syndrome_extraction(out, code.z_checks, data_qubits, bit_flip_syndrome)
+    append_phase_flip_syndrome_extraction(out, code.x_checks, data_qubits, phase_flip_syndrome)
+    return out
+
+
+def get_syndrome_extraction_circuit(code: StabilizerCode, num_ancillas: int | None = None) -> QuantumCircuit:
+    return get_syndrome_extraction_gate_list(code, num_ancillas).to_circuit()
+
+
+def append_lookup_correction(out: GateList, checks: ParityCheckMatrix, data_qubits: Sequence[int], syndrome_qubits: Sequence[int], clbits: Sequence[int], gate: str) -> None:
+    """
+    Measure the syndrome qubits into clbits, and for each syndrome caused by a single-qubit error, apply the given gate
+      ("x" or "z") to the lowest-index qubit that causes it
+    """
+    for syndrome_qubit, clbit in zip(syndrome_qubits, clbits, strict=True):
+        out.append("measure", (syndrome_qubit,), (clbit,))
+    append_measured_lookup_correction(out, checks, data_qubits, clbits, gate)
+
+
+def append_measured_lookup_correction(out: GateList, checks: ParityCheckMatrix, data_qubits: Sequence[int], clbits: Sequence[int], gate: str) -> None:
+    """
+    The correction of `append_lookup_correction`, for a syndrome which has already been measured into clbits
+    """
+    for syndrome, qubit in checks.single_error_corrections().items():
+        out.append(gate, (data_qubits[qubit],), condition=(tuple(clbits), syndrome))
+
+
+def append_coherent_lookup_correction(qc: QuantumCircuit, checks: ParityCheckMatrix, data_qubits: Sequence[QubitSpecifier], syndrome_qubits: Sequence[QubitSpecifier], gate: str) -> None:
+    """
+    The same correction as `append_lookup_correction`, but without measuring: for each syndrome caused by a
+      single-qubit error, apply the given gate ("x" or "z") to the lowest-index qubit that causes it, controlled on the
+      syndrome qubits being in that syndrome, so the circuit stays unitary
+    """
+    for syndrome, qubit in checks.single_error_corrections().items():
+        controlled_gate = SINGLE_QUBIT_PAULIS[gate]().control(len(syndrome_qubits), ctrl_state=syndrome, annotated=False)
+        qc.append(controlled_gate, [*syndrome_qubits, data_qubits[qubit]])
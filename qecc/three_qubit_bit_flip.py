@@ -1,34 +1,40 @@
 from qiskit import QuantumCircuit
 
+from .cache import cached_circuit
+from .codes import THREE_QUBIT_BIT_FLIP_CODE
+from .gate_list import GateList
+from .stabilizer_circuits import append_bit_flip_syndrome_extraction, append_coherent_lookup_correction, append_lookup_correction, get_css_encoding_circuit
 
+
+@cached_circuit
 def get_three_qubit_bit_flip_encoding_decoding_circuit() -> QuantumCircuit:
     """
     Encode |0> as |000> and |1> as |111>
     """
-    out = QuantumCircuit(3)
-    out.cx(0, 1)
-    out.cx(0, 2)
-    return out
+    return get_css_encoding_circuit(THREE_QUBIT_BIT_FLIP_CODE.x_checks, THREE_QUBIT_BIT_FLIP_CODE.logical_x[0])
 
 
+@cached_circuit
 def get_three_qubit_bit_flip_syndrome_extraction_circuit() -> QuantumCircuit:
     """
     Error in qubit 0 gives syndrome 01, qubit 1 10, qubit 2 11
     """
-    out = QuantumCircuit(5)
-    out.cx(0, 3)
-    out.cx(1, 4)
-    out.cx(2, 3)
-    out.cx(2, 4)
-    return out
+    out = GateList(5)
+    append_bit_flip_syndrome_extraction(out, THREE_QUBIT_BIT_FLIP_CODE.z_checks, (0, 1, 2), (3, 4))
+    return out.to_circuit()
 
 
 def apply_three_qubit_bit_flip_correction(qc: QuantumCircuit) -> None:
-    clreg = qc.cregs[0]
-    qc.measure((3, 4), clreg)
-    with qc.if_test((clreg, 0b01)):
-        qc.x(0)
-    with qc.if_test((clreg, 0b10)):
-        qc.x(1)
-    with qc.if_test((clreg, 0b11)):
-        qc.x(2)
+    out = GateList.empty_like(qc)
+    append_lookup_correction(out, THREE_QUBIT_BIT_FLIP_CODE.z_checks, (0, 1, 2), (3, 4), out.clregs[0], "x")
+    out.append_to(qc)
+
+
+@cached_circuit
+def get_three_qubit_bit_flip_coherent_correction_circuit() -> QuantumCircuit:
+    """
+    Correct the error given by the syndrome in qubits 3 and 4 with multi-controlled X gates, rather than measuring it
+    """
+    out = QuantumCircuit(5)
+    append_coherent_lookup_correction(out, THREE_QUBIT_BIT_FLIP_CODE.z_checks, (0, 1, 2), (3, 4), "x")
+    return out
@@ -4,52 +4,50 @@ Reference https://quantum.cloud.ibm.com/learning/en/courses/foundations-of-quant
 
 from qiskit import QuantumCircuit
 
+from .cache import cached_circuit
+from .codes import THREE_QUBIT_PHASE_FLIP_CODE
+from .gate_list import GateList
+from .stabilizer_circuits import append_coherent_lookup_correction, append_lookup_correction, append_phase_flip_syndrome_extraction, get_css_encoding_circuit
 
+
+@cached_circuit
 def get_three_qubit_phase_flip_encoding_circuit() -> QuantumCircuit:
     """
     Encode |0> as (|+++>) and |1> as (|--->)
     """
-    out = QuantumCircuit(3)
-    out.cx(0, 1)
-    out.cx(0, 2)
-    out.h(0)
-    out.h(1)
-    out.h(2)
+    # This is the bit flip code in the Hadamard basis, so encode into that (whose X checks are our Z checks, and whose
+    #  logical X is our logical X's Z part), then change basis
+    out = get_css_encoding_circuit(THREE_QUBIT_PHASE_FLIP_CODE.z_checks, THREE_QUBIT_PHASE_FLIP_CODE.logical_x[1])
+    out.h(range(3))
     return out
 
 
+@cached_circuit
 def get_three_qubit_phase_flip_decoding_circuit() -> QuantumCircuit:
-    out = QuantumCircuit(3)
-    out.h(0)
-    out.h(1)
-    out.h(2)
-    out.cx(0, 1)
-    out.cx(0, 2)
-    return out
+    return get_three_qubit_phase_flip_encoding_circuit().inverse()
 
 
+@cached_circuit
 def get_three_qubit_phase_flip_syndrome_extraction_circuit() -> QuantumCircuit:
     """
     Error in qubit 0 gives syndrome 01, qubit 1 10, qubit 2 11
     """
-    out = QuantumCircuit(5)
-    out.h(3)
-    out.h(4)
-    out.cx(3, 0)
-    out.cx(4, 1)
-    out.cx(3, 2)
-    out.cx(4, 2)
-    out.h(3)
-    out.h(4)
-    return out
+    out = GateList(5)
+    append_phase_flip_syndrome_extraction(out, THREE_QUBIT_PHASE_FLIP_CODE.x_checks, (0, 1, 2), (3, 4))
+    return out.to_circuit()
 
 
 def apply_three_qubit_phase_flip_correction(qc: QuantumCircuit) -> None:
-    clreg = qc.cregs[0]
-    qc.measure((3, 4), clreg)
-    with qc.if_test((clreg, 0b01)):
-        qc.z(0)
-    with qc.if_test((clreg, 0b10)):
-        qc.z(1)
-    with qc.if_test((clreg, 0b11)):
-        qc.z(2)
+    out = GateList.empty_like(qc)
+    append_lookup_correction(out, THREE_QUBIT_PHASE_FLIP_CODE.x_checks, (0, 1, 2), (3, 4), out.clregs[0], "z")
+    out.append_to(qc)
+
+
+@cached_circuit
+def get_three_qubit_phase_flip_coherent_correction_circuit() -> QuantumCircuit:
+    """
+    Correct the error given by the syndrome in qubits 3 and 4 with multi-controlled Z gates, rather than measuring it
+    """
+    out = QuantumCircuit(5)
+    append_coherent_lookup_correction(out, THREE_QUBIT_PHASE_FLIP_CODE.x_checks, (0, 1, 2), (3, 4), "z")
+    return out
@@ -0,0 +1,232 @@
+"""
+Threshold sweeps: logical error rates of each code's full error correction circuit under a noise model, over a grid of
+  physical error rates
+
+The circuit is the one the tests assemble (encode, syndrome extraction, correction, decode), with an `id` on every data
+  qubit between encoding and syndrome extraction, which is where the noise model applies the error channel (in place of
+  the tests' deliberate errors). Grid points are simulated in parallel in a process pool, and each result is written
+  to disk as soon as it's ready
+"""
+
+import csv
+import itertools
+import multiprocessing
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import astuple, dataclass, fields
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+from qiskit_aer.noise import NoiseModel, pauli_error
+
+from .cache import cached_circuit, use_artifact_store
+from .codes import NINE_QUBIT_SHORS_CODE, SEVEN_QUBIT_STEANE_CODE, THREE_QUBIT_BIT_FLIP_CODE, THREE_QUBIT_PHASE_FLIP_CODE
+from .instrumentation import span
+from .logical_error_rate import wilson_interval
+from .nine_qubit_shors_code import (
+    apply_nine_qubit_shors_code_bit_flip_correction,
+    apply_nine_qubit_shors_code_phase_flip_correction,
+    get_nine_qubit_shors_code_decoding_circuit,
+    get_nine_qubit_shors_code_encoding_circuit,
+    get_nine_qubit_shors_code_syndrome_extraction_circuit,
+)
+from .result_cache import get_cached_counts, use_result_cache
+from .seven_qubit_steane_code import (
+    apply_seven_qubit_steane_code_correction,
+    get_seven_qubit_steane_code_decoding_circuit,
+    get_seven_qubit_steane_code_encoding_circuit,
+    get_seven_qubit_steane_code_syndrome_extraction_circuit,
+)
+from .simulation import stabilizer_simulator
+from .three_qubit_bit_flip import apply_three_qubit_bit_flip_correction, get_three_qubit_bit_flip_encoding_decoding_circuit, get_three_qubit_bit_flip_syndrome_extraction_circuit
+from .three_qubit_phase_flip import (
+    apply_three_qubit_phase_flip_correction,
+    get_three_qubit_phase_flip_decoding_circuit,
+    get_three_qubit_phase_flip_encoding_circuit,
+    get_three_qubit_phase_flip_syndrome_extraction_circuit,
+)
+
+NOISE_CHANNELS = ("depolarizing", "bit_flip", "phase_flip")
+# The basis the logical qubit is prepared and measured in: "z" (|0>) detects logical bit flips, "x" (|+>) detects
+#  logical phase flips
+BASES = ("z", "x")
+
+
+class _ErrorCorrectionCircuits(NamedTuple):
+    num_data_qubits: int
+    get_encoding_circuit: Callable[[], QuantumCircuit]
+    get_decoding_circuit: Callable[[], QuantumCircuit]
+    get_syndrome_extraction_circuit: Callable[[], QuantumCircuit]
+    corrections: tuple[Callable[[QuantumCircuit], None], ...]
+    clreg_sizes: tuple[int, ...]
+
+
+_ERROR_CORRECTION_CIRCUITS = {
+    THREE_QUBIT_BIT_FLIP_CODE.name: _ErrorCorrectionCircuits(
+        3,
+        get_three_qubit_bit_flip_encoding_decoding_circuit,
+        get_three_qubit_bit_flip_encoding_decoding_circuit,
+        get_three_qubit_bit_flip_syndrome_extraction_circuit,
+        (apply_three_qubit_bit_flip_correction,),
+        (2,),
+    ),
+    THREE_QUBIT_PHASE_FLIP_CODE.name: _ErrorCorrectionCircuits(
+        3,
+        get_three_qubit_phase_flip_encoding_circuit,
+        get_three_qubit_phase_flip_decoding_circuit,
+        get_three_qubit_phase_flip_syndrome_extraction_circuit,
+        (apply_three_qubit_phase_flip_correction,),
+        (2,),
+    ),
+    NINE_QUBIT_SHORS_CODE.name: _ErrorCorrectionCircuits(
+        9,
+        get_nine_qubit_shors_code_encoding_circuit,
+        get_nine_qubit_shors_code_decoding_circuit,
+        get_nine_qubit_shors_code_syndrome_extraction_circuit,
+        (apply_nine_qubit_shors_code_bit_flip_correction, apply_nine_qubit_shors_code_phase_flip_correction),
+        (6, 2),
+    ),
+    SEVEN_QUBIT_STEANE_CODE.name: _ErrorCorrectionCircuits(
+        7,
+        get_seven_qubit_steane_code_encoding_circuit,
+        get_seven_qubit_steane_code_decoding_circuit,
+        get_seven_qubit_steane_code_syndrome_extraction_circuit,
+        (apply_seven_qubit_steane_code_correction,),
+        (3, 3),
+    ),
+}
+CODE_NAMES = tuple(_ERROR_CORRECTION_CIRCUITS)
+
+
+@dataclass(frozen=True)
+class ThresholdRow:
+    code: str
+    channel: str
+    basis: str
+    physical_error_rate: float
+    num_shots: int
+    num_failures: int
+    logical_error_rate: float
+    ci_low: float
+    ci_high: float
+
+
+@cached_circuit
+def get_noisy_error_correction_circuit(code_name: str, basis: str = "z") -> QuantumCircuit:
+    """
+    Given a code, return its full error correction circuit, with the logical qubit prepared in |0> (basis "z") or |+>
+      (basis "x"), an `id` on every data qubit for the noise to act on, and the decoded qubit measured in the same basis
+      into a final 1-bit register, so a 1 in that register is a logical error
+    """
+    circuits = _ERROR_CORRECTION_CIRCUITS[code_name]
+    syndrome_extraction = circuits.get_syndrome_extraction_circuit()
+    out = QuantumCircuit(QuantumRegister(syndrome_extraction.num_qubits), *(ClassicalRegister(size) for size in circuits.clreg_sizes))
+    data_qubits = out.qubits[: circuits.num_data_qubits]
+    if basis == "x":
+        out.h(0)
+    out.compose(circuits.get_encoding_circuit(), qubits=data_qubits, inplace=True)
+    for qubit in data_qubits:
+        out.id(qubit)
+    out.compose(syndrome_extraction, inplace=True)
+    for apply_correction in circuits.corrections:
+        apply_correction(out)
+    out.compose(circuits.get_decoding_circuit(), qubits=data_qubits, inplace=True)
+    # Added after the corrections, since they find their syndrome registers by position
+    logical_measurement = ClassicalRegister(1)
+    out.add_register(logical_measurement)
+    if basis == "x":
+        out.h(0)
+    out.measure(0, logical_measurement[0])
+    return out
+
+
+def get_noise_model(channel: str, physical_error_rate: float) -> NoiseModel:
+    """
+    A noise model applying the given channel on every `id`, with total error probability p:
+    - depolarizing: X, Y, or Z, each with probability p/3 (as in `estimate_logical_error_rate`)
+    - bit_flip: X with probability p
+    - phase_flip: Z with probability p
+    """
+    p = physical_error_rate
+    paulis = {"depolarizing": ("X", "Y", "Z"), "bit_flip": ("X",), "phase_flip": ("Z",)}[channel]
+    error = pauli_error([*((pauli, p / len(paulis)) for pauli in paulis), ("I", 1 - p)])
+    out = NoiseModel()
+    out.add_all_qubit_quantum_error(error, ["id"])
+    return out
+
+
+def run_threshold_point(code_name: str, channel: str, basis: str, physical_error_rate: float, num_shots: int, *, confidence: float = 0.95, seed: int | None = None) -> ThresholdRow:
+    """
+    Simulate the noisy error correction circuit for one point of the grid, and estimate its logical error rate
+    """
+    qc = get_noisy_error_correction_circuit(code_name, basis)
+
+    def simulate() -> list[dict[str, int]]:
+        # Parallelism comes from the process pool, so each simulation sticks to one thread
+        with span("run", qc, num_shots=num_shots, code=code_name, physical_error_rate=physical_error_rate):
+            result = stabilizer_simulator.run(qc, noise_model=get_noise_model(channel, physical_error_rate), shots=num_shots, seed_simulator=seed, max_parallel_threads=1).result()
+        return [result.get_counts()]
+
+    (counts,) = get_cached_counts([qc], "run_threshold_point", num_shots, seed, simulate, channel=channel, physical_error_rate=physical_error_rate)
+    with span("parse_results"):
+        # The logical measurement register was added last, so comes first in each outcome
+        num_failures = sum(count for outcome, count in counts.items() if outcome.split(" ")[0] == "1")
+    ci_low, ci_high = wilson_interval(num_failures, num_shots, confidence)
+    return ThresholdRow(code_name, channel, basis, physical_error_rate, num_shots, num_failures, num_failures / num_shots, ci_low, ci_high)
+
+
+def _initialize_worker(artifact_dir: Path | None, result_cache_dir: Path | None) -> None:
+    use_artifact_store(artifact_dir)
+    use_result_cache(result_cache_dir)
+
+
+def run_threshold_sweep(
+    output_path: Path,
+    physical_error_rates: Iterable[float],
+    *,
+    code_names: Sequence[str] = CODE_NAMES,
+    channel: str = "depolarizing",
+    bases: Sequence[str] = BASES,
+    num_shots: int = 10_000,
+    confidence: float = 0.95,
+    seed: int | None = None,
+    max_workers: int | None = None,
+    artifact_dir: Path | None = None,
+    result_cache_dir: Path | None = None,
+) -> list[ThresholdRow]:
+    """
+    Run every (code, basis, physical error rate) point of the grid across a process pool (by default one worker per
+      core), appending each row to the CSV file at output_path as soon as it's ready, and return all the rows in grid
+      order
+
+    Rows are written in the order they finish, so a partially written file is still usable if the sweep is interrupted
+
+    Given an artifact_dir, workers share an artifact store there, so only the first worker to need each circuit builds
+      it, and the rest (including those of later sweeps) load it. Similarly, given a result_cache_dir, each point's counts
+      are cached there, so re-running a sweep with the same seed only simulates the points that have changed
+    """
+    grid = list(itertools.product(code_names, bases, physical_error_rates))
+    seeds = [int(seed_sequence.generate_state(1)[0]) for seed_sequence in np.random.SeedSequence(seed).spawn(len(grid))]
+    rows: list[ThresholdRow | None] = [None] * len(grid)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # Workers are spawned rather than forked, since forking a process which has already started Aer's (OpenMP) threads
+    #  isn't safe
+    with (
+        output_path.open("w", newline="") as f,
+        ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"), initializer=_initialize_worker, initargs=(artifact_dir, result_cache_dir)) as executor,
+    ):
+        writer = csv.writer(f)
+        writer.writerow(field.name for field in fields(ThresholdRow))
+        f.flush()
+        futures = {
+            executor.submit(run_threshold_point, code_name, channel, basis, physical_error_rate, num_shots, confidence=confidence, seed=point_seed): index
+            for index, ((code_name, basis, physical_error_rate), point_seed) in enumerate(zip(grid, seeds, strict=True))
+        }
+        for future in as_completed(futures):
+            row = future.result()
+            rows[futures[future]] = row
+            writer.writerow(astuple(row))
+            f.flush()
+    return [row for row in rows if row is not None]
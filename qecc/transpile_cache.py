@@ -0,0 +1,120 @@
+"""
+Cache of transpiled circuits, keyed by circuit fingerprint and backend
+
+Circuits that only differ in the states their qubits are `initialize`d to share an entry, since the simulators run
+  `initialize` natively, so the transpiled circuit is the same apart from those instructions, which are swapped in
+  from the circuit being transpiled
+"""
+
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple
+
+import qiskit
+import qiskit_aer
+from qiskit import QuantumCircuit, transpile
+from qiskit.providers import BackendV2
+from qiskit_aer.noise import NoiseModel
+
+from .artifact_store import ArtifactStore
+from .fingerprint import STATE_PREPARATIONS, circuit_fingerprint
+
+
+class TranspileCacheInfo(NamedTuple):
+    hits: int
+    disk_hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+def _get_backend_description(backend: BackendV2) -> str:
+    """
+    The backend's name, and a hash of everything about it that can change how a circuit is transpiled: its target (the
+      instructions it supports, and on which qubits, so its basis gates and coupling map), every one of its options
+      (such as its method, and noise model), and the versions of Qiskit and Aer
+    """
+    target = backend.target
+    instructions = sorted((name, sorted(tuple(qargs) for qargs in target.qargs_for_operation_name(name) or ())) for name in target.operation_names)
+    options = {name: value.to_dict(serializable=True) if isinstance(value, NoiseModel) else value for name, value in backend.options.items()}
+    description = repr((target.num_qubits, instructions, options, qiskit.__version__, qiskit_aer.__version__))
+    return f"{backend.name}-{hashlib.sha256(description.encode()).hexdigest()[:16]}"
+
+
+def _get_state_preparations(qc: QuantumCircuit) -> list:
+    return [circuit_instruction for circuit_instruction in qc.data if circuit_instruction.operation.name in STATE_PREPARATIONS]
+
+
+def _with_state_preparations(template: QuantumCircuit, qc: QuantumCircuit) -> QuantumCircuit:
+    """
+    Copy the transpiled template, swapping its state preparations for the ones in the given circuit
+    """
+    out = template.copy()
+    state_preparations = iter(_get_state_preparations(qc))
+    for index, circuit_instruction in enumerate(out.data):
+        if circuit_instruction.operation.name in STATE_PREPARATIONS:
+            out.data[index] = circuit_instruction.replace(operation=next(state_preparations).operation)
+    return out
+
+
+class TranspileCache:
+    """
+    In-memory LRU of transpiled circuits, optionally backed by an on-disk artifact store, which persists between
+      processes
+    """
+
+    def __init__(self, maxsize: int | None = 256, cache_dir: Path | None = None) -> None:
+        self.maxsize = maxsize
+        self.artifact_store = None if cache_dir is None else ArtifactStore(cache_dir)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._circuits: OrderedDict[str, QuantumCircuit] = OrderedDict()
+
+    def _get_key(self, qc: QuantumCircuit, backend: BackendV2) -> str:
+        return f"{circuit_fingerprint(qc, ignore_state_preparations=True)}-{_get_backend_description(backend)}"
+
+    def _store(self, key: str, circuit: QuantumCircuit) -> None:
+        self._circuits[key] = circuit
+        if self.maxsize is not None:
+            while len(self._circuits) > self.maxsize:
+                self._circuits.popitem(last=False)
+
+    def transpile(self, qc: QuantumCircuit, backend: BackendV2) -> QuantumCircuit:
+        key = self._get_key(qc, backend)
+        template = self._circuits.get(key)
+        if template is not None:
+            self.hits += 1
+            self._circuits.move_to_end(key)
+        else:
+            template = None if self.artifact_store is None else self.artifact_store.load(key)
+            if template is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                template = transpile(qc, backend)
+                if len(_get_state_preparations(template)) != len(_get_state_preparations(qc)):
+                    # The transpiler got rid of (or added) state preparations, so they can't be swapped out later
+                    return template
+                if self.artifact_store is not None:
+                    self.artifact_store.save(key, template)
+            self._store(key, template)
+        return _with_state_preparations(template, qc)
+
+    def clear(self) -> None:
+        """
+        Clear the in-memory cache (the on-disk cache is left alone)
+        """
+        self._circuits.clear()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def info(self) -> TranspileCacheInfo:
+        return TranspileCacheInfo(self.hits, self.disk_hits, self.misses, self.maxsize, len(self._circuits))
+
+
+transpile_cache = TranspileCache()
@@ -0,0 +1,46 @@
+"""
+Time building, transpiling, simulating, and decoding each code, writing the results as JSON, and comparing them against
+  the stored baseline
+
+Exits with an error if any stage is more than --tolerance times slower than its baseline. Timings depend on the
+  machine, so after a deliberate change (or on a new machine), rewrite the baseline with --update-baseline
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from qecc.benchmark import compare_to_baseline, read_benchmark_results, run_benchmarks, write_benchmark_results
+from qecc.threshold import CODE_NAMES
+
+BASELINE_PATH = Path(__file__).parent.parent / "benchmarks" / "baseline.json"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--codes", nargs="+", choices=CODE_NAMES, default=CODE_NAMES)
+    parser.add_argument("--shots", nargs="+", type=int, default=[100, 1_000, 10_000])
+    parser.add_argument("--trials", nargs="+", type=int, default=[1_000, 100_000, 1_000_000], help="batch sizes to decode")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=Path("benchmarks") / "results.json")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=1.5, help="fail if a stage is this many times slower than its baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+    results = run_benchmarks(args.codes, shot_counts=args.shots, trial_counts=args.trials, repeats=args.repeats)
+    write_benchmark_results(args.output, results)
+    for result in results:
+        print(f"{result.code:<28} {result.stage:<10} {result.size:>9} {result.seconds * 1000:>10.2f}ms")
+    if args.update_baseline:
+        write_benchmark_results(args.baseline, results)
+        return
+    regressions = compare_to_baseline(results, read_benchmark_results(args.baseline), tolerance=args.tolerance)
+    if regressions:
+        for regression in regressions:
+            result = regression.result
+            print(f"{result.code} {result.stage} {result.size}: {regression.baseline_seconds * 1000:.2f}ms -> {result.seconds * 1000:.2f}ms ({regression.slowdown:.1f}x)")
+        sys.exit(f"{len(regressions)} stage(s) regressed by more than {args.tolerance}x")
+
+
+if __name__ == "__main__":
+    main()
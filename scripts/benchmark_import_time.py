@@ -0,0 +1,41 @@
+"""
+Time importing `qecc` in fresh interpreters, printing the median time for each statement as JSON
+
+`import qecc` on its own should stay far cheaper than importing everything, since names are resolved lazily. With
+  --max-seconds, exit with an error if it takes longer than that, to catch something making the import eager again
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "import qecc": "import qecc",
+    "one builder": "from qecc import get_three_qubit_bit_flip_encoding_decoding_circuit",
+    "everything": "import qecc; [getattr(qecc, name) for name in qecc.__all__]",
+}
+
+
+def time_statement(statement: str, repeats: int) -> float:
+    """
+    Median time to run the statement in a fresh interpreter, not counting the interpreter's own start-up
+    """
+    code = f"import time\nstart = time.perf_counter()\n{statement}\nprint(time.perf_counter() - start)"
+    return statistics.median(float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout) for _ in range(repeats))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--max-seconds", type=float, default=None, help="fail if `import qecc` takes longer than this")
+    args = parser.parse_args()
+    times = {name: time_statement(statement, args.repeats) for name, statement in STATEMENTS.items()}
+    print(json.dumps(times, indent=2))
+    if args.max_seconds is not None and times["import qecc"] > args.max_seconds:
+        sys.exit(f"`import qecc` took {times['import qecc']:.3f}s, more than {args.max_seconds}s")
+
+
+if __name__ == "__main__":
+    main()
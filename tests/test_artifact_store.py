@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+import pytest
+from qiskit import QuantumCircuit
+
+from qecc.artifact_store import ArtifactStore
+from qecc.cache import CircuitTemplateCache, circuit_template_cache, use_artifact_store
+from qecc.fingerprint import circuit_fingerprint
+from qecc.seven_qubit_steane_code import get_seven_qubit_steane_code_encoding_circuit
+from qecc.transpile_cache import transpile_cache
+
+from .test_seven_qubit_steane_code import SevenQubitSteaneCodeTest
+from .utils import CompBasisState
+
+
+class TestArtifactStore:
+    def test_round_trip(self, tmp_path: Path):
+        qc = SevenQubitSteaneCodeTest.get_error_correction_circuit(CompBasisState.ONE, 1, 4)
+        store = ArtifactStore(tmp_path)
+        assert store.load("steane") is None
+        store.save("steane", qc)
+        loaded = ArtifactStore(tmp_path).load("steane")
+        assert loaded is not None
+        assert circuit_fingerprint(loaded) == circuit_fingerprint(qc)
+
+    def test_invalid_artifacts_are_ignored(self, tmp_path: Path):
+        store = ArtifactStore(tmp_path)
+        store.save("encoding", get_seven_qubit_steane_code_encoding_circuit())
+        (data_path,) = tmp_path.glob("*.qpy")
+        (metadata_path,) = tmp_path.glob("*.json")
+
+        metadata = json.loads(metadata_path.read_text())
+        metadata_path.write_text(json.dumps({**metadata, "qiskit_version": "0.0.0"}))
+        assert store.load("encoding") is None
+        # Written by a different version of qecc's builders
+        metadata_path.write_text(json.dumps({**metadata, "source_hash": "0" * 32}))
+        assert store.load("encoding") is None
+
+        metadata_path.write_text(json.dumps(metadata))
+        assert store.load("encoding") is not None
+        data_path.write_bytes(data_path.read_bytes()[:-1])
+        assert store.load("encoding") is None
+
+    def test_openqasm_3(self, tmp_path: Path):
+        store = ArtifactStore(tmp_path, artifact_format="qasm3")
+        store.save("encoding", get_seven_qubit_steane_code_encoding_circuit())
+        (data_path,) = tmp_path.glob("*.qasm3")
+        assert data_path.read_text().startswith("OPENQASM 3.0;")
+        pytest.importorskip("qiskit_qasm3_import")
+        loaded = store.load("encoding")
+        assert loaded is not None
+        assert loaded.count_ops() == get_seven_qubit_steane_code_encoding_circuit().count_ops()
+
+    def test_unknown_format(self, tmp_path: Path):
+        with pytest.raises(ValueError, match="Unknown artifact format"):
+            ArtifactStore(tmp_path, artifact_format="json")
+
+
+class TestCircuitTemplateCacheArtifacts:
+    def test_later_caches_load_rather_than_build(self, tmp_path: Path):
+        builds = []
+
+        def build() -> QuantumCircuit:
+            builds.append(None)
+            return get_seven_qubit_steane_code_encoding_circuit()
+
+        CircuitTemplateCache(artifact_store=ArtifactStore(tmp_path)).get("builder", (), build)
+        # e.g. in another process
+        store = ArtifactStore(tmp_path)
+        loaded = CircuitTemplateCache(artifact_store=store).get("builder", (), build)
+        assert len(builds) == 1
+        assert store.loads == 1
+        assert loaded == get_seven_qubit_steane_code_encoding_circuit()
+
+    def test_use_artifact_store(self, tmp_path: Path):
+        try:
+            store = use_artifact_store(tmp_path)
+            assert circuit_template_cache.artifact_store is store
+            assert transpile_cache.artifact_store is store
+        finally:
+            use_artifact_store(None)
+        assert circuit_template_cache.artifact_store is None
+        assert transpile_cache.artifact_store is None
@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from qecc.benchmark import STAGES, BenchmarkResult, compare_to_baseline, read_benchmark_results, run_benchmarks, write_benchmark_results
+from qecc.threshold import CODE_NAMES
+
+
+class TestBenchmark:
+    def test_every_stage_of_every_code_is_timed(self, tmp_path: Path):
+        results = run_benchmarks(shot_counts=(10, 20), trial_counts=(100,), repeats=1)
+        assert [result.key for result in results if result.code == CODE_NAMES[0]] == [
+            (CODE_NAMES[0], "build", 17),
+            (CODE_NAMES[0], "transpile", 17),
+            (CODE_NAMES[0], "simulate", 10),
+            (CODE_NAMES[0], "simulate", 20),
+            (CODE_NAMES[0], "decode", 100),
+        ]
+        assert {(result.code, result.stage) for result in results} == {(code_name, stage) for code_name in CODE_NAMES for stage in STAGES}
+        assert all(result.seconds > 0 for result in results)
+        path = tmp_path / "results.json"
+        write_benchmark_results(path, results)
+        assert read_benchmark_results(path) == results
+
+    def test_compare_to_baseline(self):
+        baseline = [BenchmarkResult("code", "simulate", 100, 0.1), BenchmarkResult("code", "decode", 100, 1e-4)]
+        slower = BenchmarkResult("code", "simulate", 100, 0.2)
+        (regression,) = compare_to_baseline([slower, BenchmarkResult("code", "simulate", 1000, 10.0)], baseline)
+        assert regression.result == slower
+        assert regression.slowdown == 2
+        assert compare_to_baseline([slower], baseline, tolerance=3) == []
+        # Slower relative to the baseline, but by less than timer noise
+        assert compare_to_baseline([BenchmarkResult("code", "decode", 100, 5e-4)], baseline) == []
@@ -0,0 +1,85 @@
+from qiskit import QuantumCircuit
+
+from qecc import cached_circuit, circuit_cache_info, clear_circuit_cache, get_nine_qubit_shors_code_encoding_circuit
+from qecc.cache import CircuitTemplateCache
+from qecc.seven_qubit_steane_code import get_seven_qubit_steane_code_decoding_circuit, get_seven_qubit_steane_code_encoding_circuit
+
+
+class TestCircuitTemplateCache:
+    def test_builds_once(self):
+        cache = CircuitTemplateCache()
+        builds = []
+
+        def build() -> QuantumCircuit:
+            builds.append(None)
+            return QuantumCircuit(1)
+
+        for _ in range(5):
+            cache.get("builder", (), build)
+        assert len(builds) == 1
+        assert cache.info() == (4, 1, None, 1)
+
+    def test_lru_eviction(self):
+        cache = CircuitTemplateCache(maxsize=2)
+        for size in (1, 2, 1, 3):
+            cache.get("builder", size, lambda size=size: QuantumCircuit(size))
+        # 2 was the least recently used, so it was evicted when 3 was added
+        assert cache.info().currsize == 2
+        cache.get("builder", 1, lambda: QuantumCircuit(1))
+        cache.get("builder", 2, lambda: QuantumCircuit(2))
+        assert cache.info().hits == 2
+        assert cache.info().misses == 4
+
+    def test_invalidate(self):
+        cache = CircuitTemplateCache()
+        cache.get("a", (), lambda: QuantumCircuit(1))
+        cache.get("a", 1, lambda: QuantumCircuit(1))
+        cache.get("b", (), lambda: QuantumCircuit(1))
+        assert cache.invalidate("a") == 2
+        assert cache.invalidate() == 1
+        assert cache.info().currsize == 0
+
+
+class TestCachedCircuit:
+    def test_returns_independent_copies(self):
+        first = get_seven_qubit_steane_code_encoding_circuit()
+        first.x(0)
+        second = get_seven_qubit_steane_code_encoding_circuit()
+        assert first != second
+        assert second == get_seven_qubit_steane_code_encoding_circuit()
+
+    def test_decoding_is_inverse_of_encoding(self):
+        assert get_seven_qubit_steane_code_decoding_circuit() == get_seven_qubit_steane_code_encoding_circuit().inverse()
+
+    def test_hits_and_clearing(self):
+        get_nine_qubit_shors_code_encoding_circuit()
+        hits = circuit_cache_info().hits
+        get_nine_qubit_shors_code_encoding_circuit()
+        assert circuit_cache_info().hits == hits + 1
+
+        assert clear_circuit_cache(get_nine_qubit_shors_code_encoding_circuit) == 1
+        misses = circuit_cache_info().misses
+        get_nine_qubit_shors_code_encoding_circuit()
+        assert circuit_cache_info().misses == misses + 1
+
+    def test_arguments_are_part_of_the_key(self):
+        @cached_circuit
+        def get_n_qubit_circuit(num_qubits: int) -> QuantumCircuit:
+            return QuantumCircuit(num_qubits)
+
+        assert get_n_qubit_circuit(2).num_qubits == 2
+        assert get_n_qubit_circuit(3).num_qubits == 3
+        assert clear_circuit_cache(get_n_qubit_circuit) == 2
+
+    def test_call_styles_share_a_template(self):
+        @cached_circuit
+        def get_n_qubit_circuit(num_qubits: int = 3, *, num_clbits: int = 0) -> QuantumCircuit:
+            return QuantumCircuit(num_qubits, num_clbits)
+
+        misses = circuit_cache_info().misses
+        assert get_n_qubit_circuit(3).num_qubits == 3
+        get_n_qubit_circuit(num_qubits=3)
+        get_n_qubit_circuit()
+        get_n_qubit_circuit(3, num_clbits=0)
+        assert circuit_cache_info().misses == misses + 1
+        assert clear_circuit_cache(get_n_qubit_circuit) == 1
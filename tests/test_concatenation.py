@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Clifford, Operator, Pauli, StabilizerState
+
+from qecc import NINE_QUBIT_SHORS_CODE, SEVEN_QUBIT_STEANE_CODE, THREE_QUBIT_BIT_FLIP_CODE, THREE_QUBIT_PHASE_FLIP_CODE, clear_circuit_cache, get_nine_qubit_shors_code_encoding_circuit
+from qecc.concatenation import get_base_code_names, get_concatenated_decoding_circuit, get_concatenated_encoding_circuit
+from qecc.seven_qubit_steane_code import get_seven_qubit_steane_code_encoding_circuit
+
+STEANE = SEVEN_QUBIT_STEANE_CODE.name
+
+
+def pauli_on(num_qubits: int, qubits: list[int], pauli: str) -> Pauli:
+    bits = np.zeros(num_qubits, dtype=bool)
+    bits[qubits] = True
+    empty = np.zeros(num_qubits, dtype=bool)
+    return Pauli((bits, empty) if pauli == "Z" else (empty, bits))
+
+
+class TestConcatenation:
+    def test_shors_code_is_phase_flip_then_bit_flip(self):
+        qc = get_concatenated_encoding_circuit((THREE_QUBIT_PHASE_FLIP_CODE.name, THREE_QUBIT_BIT_FLIP_CODE.name))
+        assert Operator(qc).equiv(Operator(get_nine_qubit_shors_code_encoding_circuit()))
+        assert get_base_code_names((NINE_QUBIT_SHORS_CODE.name,)) == (THREE_QUBIT_PHASE_FLIP_CODE.name, THREE_QUBIT_BIT_FLIP_CODE.name)
+
+    def test_single_level_is_the_code(self):
+        assert Operator(get_concatenated_encoding_circuit((STEANE,))).equiv(Operator(get_seven_qubit_steane_code_encoding_circuit()))
+
+    def test_steane_in_steane_stabilizers(self):
+        for initial_bit in (0, 1):
+            qc = QuantumCircuit(49)
+            if initial_bit:
+                qc.x(0)
+            qc.compose(get_concatenated_encoding_circuit((STEANE, STEANE)), inplace=True)
+            state = StabilizerState(qc)
+            for pauli, checks in (("Z", SEVEN_QUBIT_STEANE_CODE.z_checks), ("X", SEVEN_QUBIT_STEANE_CODE.x_checks)):
+                for support in checks.supports():
+                    # Each check within each block
+                    for block in range(7):
+                        assert state.expectation_value(pauli_on(49, [block * 7 + qubit for qubit in support], pauli)) == 1
+                    # Each outer check, on the inner blocks' logical operators (Z or X on every qubit of the block)
+                    assert state.expectation_value(pauli_on(49, [block * 7 + qubit for block in support for qubit in range(7)], pauli)) == 1
+            assert state.expectation_value(pauli_on(49, list(range(49)), "Z")) == (-1) ** initial_bit
+
+    def test_decoding_undoes_encoding(self):
+        for code_names in ((NINE_QUBIT_SHORS_CODE.name,) * 2, (STEANE, NINE_QUBIT_SHORS_CODE.name), (THREE_QUBIT_BIT_FLIP_CODE.name, STEANE, THREE_QUBIT_PHASE_FLIP_CODE.name)):
+            qc = get_concatenated_encoding_circuit(code_names).compose(get_concatenated_decoding_circuit(code_names))
+            assert Clifford(qc) == Clifford(QuantumCircuit(qc.num_qubits))
+
+    def test_level_3_steane(self):
+        # Build it from scratch, rather than from a template cached by an earlier test
+        clear_circuit_cache(get_concatenated_encoding_circuit)
+        qc = get_concatenated_encoding_circuit((STEANE,) * 3)
+        assert qc.num_qubits == 343
+        # One Steane encoder on level 1, 7 on level 2, and 49 on level 3
+        assert qc.size() == 57 * get_seven_qubit_steane_code_encoding_circuit().size()
+
+    def test_unknown_code(self):
+        with pytest.raises(ValueError, match="Unknown code"):
+            get_concatenated_encoding_circuit(("five_qubit_code",))
+        with pytest.raises(ValueError, match="At least one code"):
+            get_concatenated_encoding_circuit(())
@@ -0,0 +1,27 @@
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+
+from qecc import get_three_qubit_bit_flip_encoding_decoding_circuit, get_three_qubit_bit_flip_syndrome_extraction_circuit
+from qecc.error_sweep import NO_ERROR, ErrorLocation, apply_error, get_single_qubit_error_locations, simulate_error_sweep
+
+
+class TestErrorSweep:
+    def test_error_locations(self):
+        assert get_single_qubit_error_locations(2) == [("x", 0), ("x", 1), ("z", 0), ("z", 1)]
+        assert get_single_qubit_error_locations(1, ("y",), include_no_error=True) == [NO_ERROR, ErrorLocation("y", 0)]
+
+    def test_three_qubit_bit_flip_syndromes(self):
+        def build_circuit(location: ErrorLocation) -> QuantumCircuit:
+            qc = QuantumCircuit(QuantumRegister(5), ClassicalRegister(2))
+            qc.compose(get_three_qubit_bit_flip_encoding_decoding_circuit(), qubits=(0, 1, 2), inplace=True)
+            apply_error(qc, location)
+            qc.compose(get_three_qubit_bit_flip_syndrome_extraction_circuit(), inplace=True)
+            qc.measure((3, 4), (0, 1))
+            return qc
+
+        results = simulate_error_sweep(build_circuit, get_single_qubit_error_locations(3, ("x", "y", "z"), include_no_error=True), num_shots=16)
+        assert len(results) == 10
+        assert results[NO_ERROR] == {"00": 16}
+        for error in ("x", "y"):
+            assert [results[error, qubit] for qubit in range(3)] == [{"01": 16}, {"10": 16}, {"11": 16}]
+        # Phase flips aren't detected by the bit flip code
+        assert all(results["z", qubit] == {"00": 16} for qubit in range(3))
@@ -0,0 +1,104 @@
+import math
+
+import pytest
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+from qiskit.circuit.classical import expr
+from qiskit.circuit.library import ZGate
+from qiskit.quantum_info import Statevector
+
+from qecc.exact_simulation import evolve_statevector, get_outcome_probabilities
+from qecc.repetition_code import REPETITION_CODE_KINDS
+from qecc.simulation import simulate_circuit
+
+from .test_repetition_code import get_error_correction_circuit
+from .test_seven_qubit_steane_code import SevenQubitSteaneCodeTest
+from .utils import CompBasisState
+
+
+def assert_probabilities_close(probabilities: dict[str, float], expected: dict[str, float]) -> None:
+    assert set(probabilities) == set(expected), probabilities
+    assert all(math.isclose(probabilities[outcome], expected[outcome]) for outcome in expected), probabilities
+
+
+class TestGetOutcomeProbabilities:
+    def test_bell_state(self):
+        qc = QuantumCircuit(2)
+        qc.h(0)
+        qc.cx(0, 1)
+        qc.measure_all()
+        assert_probabilities_close(get_outcome_probabilities(qc), {"00": 0.5, "11": 0.5})
+
+    def test_initialize(self):
+        qc = QuantumCircuit(2)
+        qc.initialize(Statevector([0.6, 0.8]), [1])
+        qc.measure_all()
+        assert_probabilities_close(get_outcome_probabilities(qc), {"00": 0.36, "10": 0.64})
+
+    def test_mid_circuit_measurement_and_reset(self):
+        qc = QuantumCircuit(QuantumRegister(2), ClassicalRegister(1), ClassicalRegister(2))
+        qc.h(0)
+        qc.measure(0, qc.cregs[0][0])
+        qc.reset(0)
+        with qc.if_test((qc.cregs[0], 1)):
+            qc.x(1)
+        qc.measure([0, 1], qc.cregs[1])
+        # Registers are in reverse order, each with its highest bit first
+        assert_probabilities_close(get_outcome_probabilities(qc), {"00 0": 0.5, "10 1": 0.5})
+
+    def test_else_branch(self):
+        qc = QuantumCircuit(QuantumRegister(2), ClassicalRegister(2))
+        qc.h(0)
+        qc.measure(0, 0)
+        with qc.if_test((qc.clbits[0], 1)) as else_:
+            qc.x(1)
+        with else_:
+            qc.h(1)
+        qc.measure(1, 1)
+        assert_probabilities_close(get_outcome_probabilities(qc), {"00": 0.25, "10": 0.25, "11": 0.5})
+
+    def test_steane_code_error_correction(self):
+        qc = SevenQubitSteaneCodeTest.get_error_correction_circuit(CompBasisState.ONE, 2, 5)
+        qc.measure_all()
+        assert_probabilities_close(get_outcome_probabilities(qc), {"1100110000001 110 011": 1.0})
+
+    def test_expression_conditions_and_stores(self):
+        # The repetition code counts the syndrome's weight into a register with stores, and corrects with expression
+        #  conditions on it
+        for kind in REPETITION_CODE_KINDS:
+            for error_qubits in ((), (1,), (0, 3), (4,)):
+                qc = get_error_correction_circuit(5, kind, 1, error_qubits)
+                qc.measure_all()
+                probabilities = get_outcome_probabilities(qc)
+                assert_probabilities_close(probabilities, dict.fromkeys(simulate_circuit(qc, 16), 1.0))
+
+    def test_unsupported_expressions_are_rejected(self):
+        qc = QuantumCircuit(QuantumRegister(1), ClassicalRegister(2))
+        with qc.if_test(expr.equal(expr.add(qc.cregs[0], 1), 2)):
+            qc.x(0)
+        with pytest.raises(NotImplementedError, match="only supports expressions on clbits and registers"):
+            get_outcome_probabilities(qc)
+
+
+class TestEvolveStatevector:
+    def test_matches_statevector_evolve(self):
+        qc = QuantumCircuit(4)
+        qc.h(0)
+        qc.cx(0, 2)
+        qc.mcx([0, 2], 3, ctrl_state=1)
+        qc.t(1)
+        initial_state = Statevector.from_label("0+10")
+        assert evolve_statevector(initial_state, qc).equiv(initial_state.evolve(qc))
+
+    def test_non_unitary_circuit_is_rejected(self):
+        qc = QuantumCircuit(1, 1)
+        qc.measure(0, 0)
+        with pytest.raises(ValueError):
+            evolve_statevector(Statevector.from_label("0"), qc)
+
+    def test_controlled_gates(self):
+        qc = QuantumCircuit(4)
+        qc.mcx([0, 1, 2], 3, ctrl_state=5)
+        qc.append(ZGate().control(2, ctrl_state=2, annotated=False), [3, 0, 1])
+        for label in ("0101", "+101", "01+1", "-+++", "1-0+"):
+            initial_state = Statevector.from_label(label)
+            assert evolve_statevector(initial_state, qc).equiv(initial_state.evolve(qc))
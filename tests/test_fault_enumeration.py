@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from qecc import enumerate_faults
+from qecc.fault_enumeration import Fault, FaultEnumerator
+from qecc.gate_list import GateInstruction, GateList
+from qecc.simulation import get_stabilizer_circuit, simulate_circuit
+from qecc.threshold import BASES, get_noisy_error_correction_circuit
+
+
+def simulate_with_faults(code_name: str, basis: str, faults: tuple[Fault, ...], enumerator: FaultEnumerator) -> bool:
+    """
+    Insert the faults into the gadget of the full error correction circuit as gates, follow it with a second, noiseless
+      round of syndrome extraction and correction (on reset ancillas), and return whether the logical qubit is then
+      measured wrongly
+
+    For a code whose correction circuits decode every syndrome (as Steane's do), the noiseless round is an ideal decoder,
+      which leaves the data qubits in the codespace, so the decoding circuit decodes them exactly
+    """
+    gate_list = GateList.from_circuit(get_stabilizer_circuit(get_noisy_error_correction_circuit(code_name, basis)))
+    instructions = list(gate_list)
+    out = GateList(gate_list.num_qubits, [len(clreg) for clreg in gate_list.clregs])
+    # The gadget starts with an `id` on each data qubit, wherever the basis change puts it
+    num_data_qubits = enumerator.code.num_data_qubits
+    start = next(index for index, instruction in enumerate(instructions) if instruction.name == "id")
+    end = start + enumerator.end - enumerator.start
+    second_round = [*(GateInstruction("reset", (qubit,)) for qubit in range(num_data_qubits, gate_list.num_qubits)), *instructions[start + num_data_qubits : end]]
+    for index, instruction in enumerate([*instructions[:end], *second_round, *instructions[end:]]):
+        for fault in faults:
+            if start + fault.position == index:
+                for qubit, pauli in zip(fault.qubits, fault.pauli, strict=True):
+                    if pauli != "I":
+                        out.append(pauli.lower(), (qubit,))
+        out.append(instruction.name, instruction.qubits, instruction.clbits, instruction.condition)
+    # The logical measurement register was added last, so comes first in each outcome
+    logical_outcomes = {outcome.split(" ")[0] for outcome in simulate_circuit(out.to_circuit(), 4)}
+    assert len(logical_outcomes) == 1
+    return logical_outcomes == {"1"}
+
+
+class TestEnumerateFaults:
+    def test_single_data_faults_are_corrected(self):
+        for code_name, num_data_qubits in (("nine_qubit_shors_code", 9), ("seven_qubit_steane_code", 7)):
+            result = enumerate_faults(code_name, 1, max_workers=1)
+            assert result.num_patterns == 3 * num_data_qubits
+            assert result.uncorrectable == []
+
+    def test_single_faults_are_corrected(self):
+        # Including faults on the ancillas, which only reach the data qubits through the corrections
+        for code_name in ("nine_qubit_shors_code", "seven_qubit_steane_code"):
+            result = enumerate_faults(code_name, 1, fault_model="qubits", max_workers=1)
+            assert result.uncorrectable == []
+            assert enumerate_faults(code_name, 2, fault_model="qubits", max_workers=1).min_uncorrectable_weight == 2
+
+    def test_bit_flip_code_fails_on_phase_flips(self):
+        result = enumerate_faults("three_qubit_bit_flip", 1, max_workers=1)
+        assert {(pattern.faults[0].qubits, pattern.faults[0].pauli) for pattern in result.uncorrectable} == {((qubit,), pauli) for qubit in range(3) for pauli in "YZ"}
+        assert {pattern.bases for pattern in result.uncorrectable} == {("x",)}
+
+    def test_shors_code_weight_2_data_faults(self):
+        result = enumerate_faults("nine_qubit_shors_code", 2, max_workers=1)
+        assert result.min_uncorrectable_weight == 2
+        # Two bit flips in the same block are decoded as a logical phase flip (X on a whole block is logical Z), but
+        #  phase flips in the same block aren't errors at all
+        faults = {frozenset((fault.qubits[0], fault.pauli) for fault in pattern.faults): pattern.bases for pattern in result.uncorrectable}
+        assert faults[frozenset({(0, "X"), (1, "X")})] == ("x",)
+        assert frozenset({(0, "Z"), (1, "Z")}) not in faults
+
+    def test_matches_circuit_simulation(self):
+        code_name = "seven_qubit_steane_code"
+        enumerator = FaultEnumerator(code_name, fault_model="circuit")
+        rng = np.random.default_rng(0)
+        for weight in (1, 2):
+            for first in rng.choice(len(enumerator.locations) - 1, 5, replace=False):
+                patterns = enumerator.get_patterns(weight, int(first))
+                patterns = patterns[rng.choice(len(patterns), min(len(patterns), 4), replace=False)]
+                failed = enumerator.find_uncorrectable(patterns)
+                for basis in BASES:
+                    for pattern, pattern_failed in zip(patterns, failed[basis], strict=True):
+                        assert simulate_with_faults(code_name, basis, tuple(enumerator.faults[index] for index in pattern), enumerator) == pattern_failed
+
+    def test_workers_agree(self):
+        in_process = enumerate_faults("three_qubit_phase_flip", 2, fault_model="circuit", max_workers=1)
+        assert enumerate_faults("three_qubit_phase_flip", 2, fault_model="circuit", max_workers=2) == in_process
+
+    def test_unknown_fault_model(self):
+        with pytest.raises(ValueError, match="Unknown fault model"):
+            FaultEnumerator("three_qubit_bit_flip", fault_model="everywhere")
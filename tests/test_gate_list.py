@@ -0,0 +1,101 @@
+import pytest
+from qiskit import ClassicalRegister, QuantumCircuit
+from qiskit.quantum_info import Operator
+
+from qecc import SEVEN_QUBIT_STEANE_CODE, GateList
+from qecc.concatenation import get_concatenated_encoding_circuit, get_concatenated_encoding_gate_list
+from qecc.exact_simulation import get_outcome_probabilities
+from qecc.gate_list import GateInstruction
+from qecc.pauli_frame import PauliFrameSimulator
+from qecc.seven_qubit_steane_code import get_seven_qubit_steane_code_encoding_circuit
+from qecc.simulation import get_stabilizer_circuit, simulate_circuit
+from qecc.stabilizer_circuits import get_css_encoding_gate_list
+
+from .test_seven_qubit_steane_code import SevenQubitSteaneCodeTest
+from .utils import CompBasisState
+
+
+class TestGateList:
+    def test_round_trip(self):
+        qc = get_stabilizer_circuit(SevenQubitSteaneCodeTest.get_error_correction_circuit(CompBasisState.ONE, 2, 5))
+        gate_list = GateList.from_circuit(qc)
+        assert gate_list.clregs == [(0, 1, 2), (3, 4, 5)]
+        lowered = gate_list.to_circuit()
+        assert lowered.count_ops() == qc.count_ops()
+        assert [len(creg) for creg in lowered.cregs] == [3, 3]
+        assert GateList.from_circuit(lowered).instructions == gate_list.instructions
+        assert get_outcome_probabilities(lowered) == get_outcome_probabilities(qc)
+
+    def test_conditions(self):
+        gate_list = GateList(4, (2,))
+        gate_list.append("x", (0,))
+        gate_list.append("measure", (0,), (1,))
+        # On the register, on a single bit, and on bits which aren't a register
+        gate_list.append("x", (1,), condition=((0, 1), 2))
+        gate_list.append("x", (2,), condition=((1,), 1))
+        gate_list.append("x", (3,), condition=((1, 0), 1))
+        qc = gate_list.to_circuit()
+        qc.measure_all()
+        assert simulate_circuit(qc, 100) == {"1111 10": 100}
+
+    def test_compose_and_inverse(self):
+        gate_list = GateList(2)
+        gate_list.append("h", (0,))
+        gate_list.append("s", (0,))
+        gate_list.append("cx", (0, 1))
+        composed = GateList(3)
+        composed.compose(gate_list, qubits=(2, 0))
+        assert composed.instructions == [GateInstruction("h", (2,)), GateInstruction("s", (2,)), GateInstruction("cx", (2, 0))]
+        assert composed.inverse().instructions == [GateInstruction("cx", (2, 0)), GateInstruction("sdg", (2,)), GateInstruction("h", (2,))]
+        assert Operator(gate_list.to_circuit().compose(gate_list.inverse().to_circuit())).equiv(Operator(QuantumCircuit(2)))
+
+    def test_append_to_existing_circuit(self):
+        qc = QuantumCircuit(3, 2)
+        qc.x(0)
+        qc.add_register(ClassicalRegister(1))
+        gate_list = GateList.empty_like(qc)
+        assert gate_list.clregs == [(0, 1), (2,)]
+        gate_list.append("measure", (0,), (2,))
+        gate_list.append("x", (1,), condition=(gate_list.clregs[1], 1))
+        gate_list.append_to(qc)
+        assert len(qc.cregs) == 2
+        # The condition is on the circuit's own register
+        assert qc.data[-1].operation.condition == (qc.cregs[1], 1)
+        qc.measure_all()
+        assert simulate_circuit(qc, 100) == {"011 1 00": 100}
+
+    def test_unsupported_instructions(self):
+        with pytest.raises(ValueError, match="Unsupported instruction"):
+            GateList(1).append("t", (0,))
+        gate_list = GateList(1, (1,))
+        gate_list.append("measure", (0,), (0,))
+        with pytest.raises(ValueError, match="Only unconditional gates"):
+            gate_list.inverse()
+
+    def test_builders_emit_gate_lists(self):
+        gate_list = get_css_encoding_gate_list(SEVEN_QUBIT_STEANE_CODE.x_checks, SEVEN_QUBIT_STEANE_CODE.logical_x[0])
+        assert GateList.from_circuit(get_seven_qubit_steane_code_encoding_circuit()).instructions == gate_list.instructions
+        code_names = ("seven_qubit_steane_code",) * 3
+        assert len(get_concatenated_encoding_gate_list(code_names)) == get_concatenated_encoding_circuit(code_names).size()
+
+    def test_pauli_frame_simulator_consumes_gate_lists(self):
+        # Bit flip code with an error on qubit 1, measured straight from the gate list
+        gate_list = GateList(5, (2, 3))
+        gate_list.append("x", (0,))
+        for target in (1, 2):
+            gate_list.append("cx", (0, target))
+        gate_list.append("x", (1,))
+        for ctrl, syndrome_qubit in ((0, 3), (2, 3), (1, 4), (2, 4)):
+            gate_list.append("cx", (ctrl, syndrome_qubit))
+        for syndrome_qubit, clbit in ((3, 0), (4, 1)):
+            gate_list.append("measure", (syndrome_qubit,), (clbit,))
+        gate_list.append("x", (1,), condition=((0, 1), 2))
+        for qubit in range(3):
+            gate_list.append("measure", (qubit,), (2 + qubit,))
+        assert PauliFrameSimulator(gate_list).sample_counts(100) == {"111 10": 100}
+
+    def test_expression_conditions_are_rejected(self):
+        gate_list = GateList(2, (2,))
+        gate_list.append("x", (1,), condition=((1, 0), 1))
+        with pytest.raises(ValueError, match="Only register and single-bit conditions"):
+            GateList.from_circuit(gate_list.to_circuit())
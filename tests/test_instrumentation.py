@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+from qiskit import QuantumCircuit
+
+from qecc import Instrumentation, clear_circuit_cache, get_three_qubit_bit_flip_encoding_decoding_circuit, instrument
+from qecc.instrumentation import span
+from qecc.simulation import simulate_circuit, simulate_circuits
+
+
+def get_bell_circuit() -> QuantumCircuit:
+    qc = QuantumCircuit(2)
+    qc.h(0)
+    qc.cx(0, 1)
+    qc.measure_all()
+    return qc
+
+
+class TestInstrumentation:
+    def test_spans_are_only_recorded_while_instrumented(self):
+        with span("outside") as outside:
+            assert outside is None
+        with instrument() as instrumentation:
+            simulate_circuit(get_bell_circuit(), 10)
+        simulate_circuit(get_bell_circuit(), 10)
+        assert [span.name for span in instrumentation.spans] == ["transpile", "run", "parse_results"]
+        transpile_span, run_span, _ = instrumentation.spans
+        assert transpile_span.args == {"simulator": "stabilizer", "num_qubits": 2, "size": 4, "depth": 3}
+        assert run_span.args["num_shots"] == 10
+        assert all(span.seconds > 0 for span in instrumentation.spans)
+        assert set(instrumentation.get_total_seconds()) == {"transpile", "run", "parse_results"}
+
+    def test_listeners_and_memory(self):
+        events = []
+        instrumentation = Instrumentation(track_memory=True)
+        instrumentation.add_listener(lambda event, span: events.append((event, span.name)))
+        clear_circuit_cache(get_three_qubit_bit_flip_encoding_decoding_circuit)
+        with instrument(instrumentation):
+            get_three_qubit_bit_flip_encoding_decoding_circuit()
+            with span("outer"), span("inner"):
+                _ = [0] * 100_000
+        assert events == [("start", "build"), ("stop", "build"), ("start", "outer"), ("start", "inner"), ("stop", "inner"), ("stop", "outer")]
+        build_span, outer_span, inner_span = instrumentation.spans
+        assert build_span.args["builder"].endswith("get_three_qubit_bit_flip_encoding_decoding_circuit")
+        assert build_span.args["size"] == 2
+        assert all("allocated_bytes" in span.args for span in (outer_span, inner_span))
+
+    def test_chrome_trace(self, tmp_path: Path):
+        with instrument() as instrumentation:
+            simulate_circuits([get_bell_circuit(), get_bell_circuit()], 10)
+        path = tmp_path / "trace.json"
+        instrumentation.write_chrome_trace(path)
+        events = json.loads(path.read_text())["traceEvents"]
+        assert [event["name"] for event in events] == ["transpile", "run", "parse_results"]
+        assert all(event["ph"] == "X" and event["dur"] > 0 for event in events)
+        assert events[1]["args"] == {"num_circuits": 2, "num_shots": 10}
+        # Consecutive stages don't overlap
+        assert events[0]["ts"] + events[0]["dur"] <= events[1]["ts"]
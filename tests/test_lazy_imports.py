@@ -0,0 +1,28 @@
+import subprocess
+import sys
+
+import pytest
+
+import qecc
+
+
+def run_python(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+
+
+class TestLazyImports:
+    def test_import_doesnt_import_qiskit(self):
+        assert run_python("import sys, qecc; print('qiskit' in sys.modules, 'qecc.cache' in sys.modules)") == "False False"
+
+    def test_only_the_needed_submodules_are_imported(self):
+        code = "import sys, qecc; qecc.ParityCheckMatrix; print('qiskit' in sys.modules, 'qecc.parity_check' in sys.modules)"
+        assert run_python(code) == "False True"
+
+    def test_every_public_name_resolves(self):
+        for name in qecc.__all__:
+            assert getattr(qecc, name) is not None
+        assert set(qecc.__all__) <= set(dir(qecc))
+
+    def test_unknown_name(self):
+        with pytest.raises(AttributeError, match="has no attribute 'not_a_name'"):
+            _ = qecc.not_a_name
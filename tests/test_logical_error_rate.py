@@ -0,0 +1,73 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from qecc.codes import CODES, NINE_QUBIT_SHORS_CODE, SEVEN_QUBIT_STEANE_CODE, THREE_QUBIT_BIT_FLIP_CODE, THREE_QUBIT_PHASE_FLIP_CODE
+from qecc.logical_error_rate import estimate_logical_error_rate, get_logical_failures, wilson_interval
+from qecc.parity_check import pack_bits
+
+
+class TestLogicalFailures:
+    def test_single_qubit_errors_are_corrected(self):
+        for code in (NINE_QUBIT_SHORS_CODE, SEVEN_QUBIT_STEANE_CODE):
+            n = code.num_data_qubits
+            identity, single = pack_bits(np.zeros((n, n))), pack_bits(np.eye(n))
+            for x_errors, z_errors in ((single, identity), (identity, single), (single, single)):
+                assert not get_logical_failures(code, x_errors, z_errors).any()
+
+    def test_uncorrectable_errors(self):
+        no_errors = pack_bits([[0, 0, 0]])
+        one_error = pack_bits([[0, 1, 0]])
+        # The bit flip code can't correct phase flips, and vice versa
+        assert get_logical_failures(THREE_QUBIT_BIT_FLIP_CODE, no_errors, one_error).all()
+        assert get_logical_failures(THREE_QUBIT_PHASE_FLIP_CODE, one_error, no_errors).all()
+        # Two X errors in a Shor block
+        two_errors = pack_bits([[1, 1, 0, 0, 0, 0, 0, 0, 0]])
+        assert get_logical_failures(NINE_QUBIT_SHORS_CODE, two_errors, np.zeros_like(two_errors)).all()
+
+
+class TestEstimateLogicalErrorRate:
+    @staticmethod
+    def exact_three_qubit_bit_flip_failure_rate(p: float) -> float:
+        """
+        The bit flip code fails if there are an odd number of Z components, or at least two X components
+        """
+        probabilities = {"I": 1 - p, "X": p / 3, "Y": p / 3, "Z": p / 3}
+        total = 0.0
+        for paulis in itertools.product("IXYZ", repeat=3):
+            num_x = sum(pauli in "XY" for pauli in paulis)
+            num_z = sum(pauli in "YZ" for pauli in paulis)
+            if num_z % 2 == 1 or num_x >= 2:
+                total += np.prod([probabilities[pauli] for pauli in paulis])
+        return total
+
+    def test_no_errors(self):
+        for code in CODES:
+            estimate = estimate_logical_error_rate(code, 0.0, 1000, seed=0)
+            assert estimate.num_failures == 0
+            assert estimate.ci_low < 1e-12
+            assert estimate.ci_high < 0.01
+
+    def test_matches_exact_rate(self):
+        p = 0.1
+        estimate = estimate_logical_error_rate(THREE_QUBIT_BIT_FLIP_CODE, p, 100_000, confidence=0.9999, seed=1234, batch_size=30_000)
+        assert estimate.num_trials == 100_000
+        assert estimate.ci_low <= self.exact_three_qubit_bit_flip_failure_rate(p) <= estimate.ci_high
+
+    def test_codes_beat_physical_error_rate_when_p_is_small(self):
+        for code in (NINE_QUBIT_SHORS_CODE, SEVEN_QUBIT_STEANE_CODE):
+            assert estimate_logical_error_rate(code, 0.01, 100_000, seed=0).ci_high < 0.01
+
+
+class TestWilsonInterval:
+    def test_contains_rate(self):
+        low, high = wilson_interval(50, 100)
+        assert low < 0.5 < high
+        assert high - low < 0.2
+
+    def test_no_trials(self):
+        with pytest.raises(ValueError, match="At least one trial"):
+            wilson_interval(0, 0)
+        with pytest.raises(ValueError, match="At least one trial"):
+            estimate_logical_error_rate(SEVEN_QUBIT_STEANE_CODE, 0.1, 0)
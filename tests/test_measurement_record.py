@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+
+from qecc import MeasurementRecord
+from qecc.pauli_frame import PauliFrameSimulator
+from qecc.simulation import simulate_circuit, simulate_circuit_grouped_record, simulate_circuit_record, stabilizer_simulator
+
+from .test_seven_qubit_steane_code import SevenQubitSteaneCodeTest
+from .utils import CompBasisState
+
+
+class TestMeasurementRecord:
+    def test_simulated_record(self):
+        qc = SevenQubitSteaneCodeTest.get_error_correction_circuit(CompBasisState.ONE, 2, 5)
+        qc.measure_all()
+        record = simulate_circuit_record(qc, 100).rename(("bit_flip_syndrome", "phase_flip_syndrome", "data"))
+        assert record.num_shots == 100
+        assert record.counts() == simulate_circuit(qc, 100)
+        # Errors on qubits 2 and 5 have syndromes 3 and 6, and the logical qubit decodes back to |1>
+        assert set(record.values("bit_flip_syndrome")) == {3}
+        assert set(record.values("phase_flip_syndrome")) == {6}
+        assert np.array_equal(np.unique(record.bits("data")[:, :7], axis=0), [[1, 0, 0, 0, 0, 0, 0]])
+
+    def test_shots_are_in_order(self):
+        qc = QuantumCircuit(5)
+        qc.h(range(5))
+        qc.measure_all()
+        memory = stabilizer_simulator.run(qc, shots=200, memory=True, seed_simulator=1).result().get_memory()
+        assert simulate_circuit_record(qc, 200, seed=1).values("meas").tolist() == [int(outcome, 2) for outcome in memory]
+        grouped = simulate_circuit_grouped_record(qc, 200, seed=1)
+        assert grouped.counts() == simulate_circuit(qc, 200, seed=1)
+        # Grouped by outcome, so each outcome's shots are together
+        values = grouped.values("meas")
+        assert np.count_nonzero(np.diff(values)) == len(set(values.tolist())) - 1
+
+    def test_histogram_and_marginal(self):
+        rng = np.random.default_rng(0)
+        bits = (rng.random((1000, 11)) < 0.3).astype(np.uint8)
+        record = MeasurementRecord.from_bits(bits, {"a": (0, 1, 2), "b": (3, 4, 5, 6, 7, 8, 9, 10)})
+        assert np.array_equal(record.bits(), bits)
+        outcomes, counts = record.histogram()
+        expected_outcomes, expected_counts = np.unique(bits, axis=0, return_counts=True)
+        # Both are sorted, but by different orders, so compare as sets of (outcome, count)
+        assert {(tuple(outcome), count) for outcome, count in zip(outcomes.tolist(), counts.tolist(), strict=True)} == {
+            (tuple(outcome), count) for outcome, count in zip(expected_outcomes.tolist(), expected_counts.tolist(), strict=True)
+        }
+        marginal = record.marginal("a")
+        assert marginal.registers == {"a": (0, 1, 2)}
+        assert np.array_equal(marginal.values("a"), bits[:, 0] + 2 * bits[:, 1] + 4 * bits[:, 2])
+        assert sum(marginal.counts().values()) == 1000
+        assert marginal.counts()["101"] == np.count_nonzero((bits[:, :3] == [1, 0, 1]).all(axis=1))
+
+    def test_pauli_frame_record(self):
+        qc = SevenQubitSteaneCodeTest.get_error_correction_circuit(CompBasisState.ZERO, 4, 0)
+        qc.measure_all()
+        simulator = PauliFrameSimulator(qc, seed=1)
+        record = simulator.sample_record(200)
+        assert list(record.registers) == ["c0", "c1", "c2"]
+        assert record.counts() == simulate_circuit(qc, 200)
+
+    def test_hex_memory(self):
+        rng = np.random.default_rng(0)
+        for num_clbits in (1, 8, 9, 21):
+            values = [0, *rng.integers(0, 2**num_clbits, 100).tolist()]
+            record = MeasurementRecord.from_hex_memory([hex(value) for value in values], num_clbits, {"a": tuple(range(num_clbits))})
+            assert record.values("a").tolist() == values
+        assert MeasurementRecord.from_hex_memory([], 3, {"a": (0, 1, 2)}).num_shots == 0
+
+    def test_outcomes_and_packed_counts(self):
+        registers = {"a": (0, 1), "b": (2, 3, 4)}
+        record = MeasurementRecord.from_hex_counts({"0x1d": 3, "0x2": 1}, 5, registers)
+        assert record.counts() == {"111 01": 3, "000 10": 1}
+        outcomes = MeasurementRecord.from_outcomes(["111 01", "000 10"], 5, registers)
+        assert record.packed_counts() == {outcomes.packed[0].tobytes(): 3, outcomes.packed[1].tobytes(): 1}
+        assert MeasurementRecord.from_packed_counts(record.packed_counts(), 5, registers).counts() == record.counts()
+
+    def test_values_of_wide_registers(self):
+        record = MeasurementRecord.from_bits(np.zeros((2, 64), dtype=np.uint8), {"wide": tuple(range(64))})
+        with pytest.raises(ValueError, match="at most 63 clbits"):
+            record.values("wide")
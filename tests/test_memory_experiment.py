@@ -0,0 +1,80 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from qecc import SEVEN_QUBIT_STEANE_CODE, MemoryExperiment, get_repetition_code
+from qecc.codes import CODES
+from qecc.memory_experiment import MEMORY_BASES
+from qecc.simulation import stabilizer_simulator
+from qecc.threshold import get_noise_model
+
+
+def get_detector_events_from_memory(experiment: MemoryExperiment, memory: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Work out the detector events and logical flips of each shot from the measurement record of the whole circuit
+    """
+    code = experiment.code
+    checks, offset = (code.z_checks, 0) if experiment.basis == "z" else (code.x_checks, code.z_checks.num_checks)
+    deterministic = np.zeros(experiment.num_checks, dtype=bool)
+    deterministic[offset : offset + checks.num_checks] = True
+    events = np.zeros((len(memory), experiment.num_rounds + 1, experiment.num_checks), dtype=np.uint8)
+    logical_flips = np.zeros(len(memory), dtype=np.uint8)
+    for shot, outcome in enumerate(memory):
+        *rounds, data = (np.array([int(bit) for bit in reversed(register)], dtype=np.uint8) for register in reversed(outcome.split(" ")))
+        final = np.zeros(experiment.num_checks, dtype=np.uint8)
+        final[offset : offset + checks.num_checks] = checks.dense() @ data % 2
+        previous = np.zeros(experiment.num_checks, dtype=np.uint8)
+        for round_index, outcomes in enumerate([*rounds, final]):
+            events[shot, round_index] = outcomes ^ previous
+            previous = outcomes
+        logical_flips[shot] = data[experiment.observable].sum() % 2
+    events[:, 0, ~deterministic] = 0
+    events[:, -1, ~deterministic] = 0
+    return events, logical_flips
+
+
+class TestMemoryExperiment:
+    def test_no_noise_no_detector_events(self):
+        for code, basis in itertools.product(CODES, MEMORY_BASES):
+            rounds = list(MemoryExperiment(code, 3, basis=basis).stream_detector_events(100))
+            assert [detector_round.index for detector_round in rounds] == [0, 1, 2, 3]
+            assert all(detector_round.events.shape == (100, code.z_checks.num_checks + code.x_checks.num_checks) for detector_round in rounds)
+            assert not any(detector_round.events.any() for detector_round in rounds)
+            assert not rounds[-1].logical_flips.any()
+
+    def test_circuit(self):
+        experiment = MemoryExperiment(SEVEN_QUBIT_STEANE_CODE, 5)
+        qc = experiment.get_circuit()
+        assert qc.num_qubits == 7 + 6
+        assert [len(creg) for creg in qc.cregs] == [6] * 5 + [7]
+        assert qc.count_ops()["reset"] == 6 * 5
+        memory = stabilizer_simulator.run(qc, shots=100, memory=True).result().get_memory()
+        events, logical_flips = get_detector_events_from_memory(experiment, memory)
+        assert not events.any()
+        assert not logical_flips.any()
+
+    def test_matches_circuit_simulation(self):
+        physical_error_rate = 0.05
+        for basis in MEMORY_BASES:
+            experiment = MemoryExperiment(SEVEN_QUBIT_STEANE_CODE, 3, basis=basis)
+            rounds = list(experiment.stream_detector_events(10_000, physical_error_rate=physical_error_rate, seed=1))
+            qc = experiment.get_circuit()
+            memory = stabilizer_simulator.run(qc, noise_model=get_noise_model("depolarizing", physical_error_rate), shots=4000, seed_simulator=1, memory=True).result().get_memory()
+            events, logical_flips = get_detector_events_from_memory(experiment, memory)
+            assert np.allclose([detector_round.events.mean(axis=0) for detector_round in rounds], events.mean(axis=0), atol=0.04)
+            assert abs(rounds[-1].logical_flips.mean() - logical_flips.mean()) < 0.04
+
+    def test_repetition_code_detector_rates(self):
+        # A bit flip check's detector fires in a round when exactly one of its two qubits got an X or Y error
+        distance, physical_error_rate = 5, 0.06
+        flip_probability = 2 * physical_error_rate / 3
+        rounds = MemoryExperiment(get_repetition_code(distance), 20).stream_detector_events(20_000, physical_error_rate=physical_error_rate, seed=2)
+        for detector_round in itertools.islice(rounds, 20):
+            assert np.allclose(detector_round.events.mean(axis=0), 2 * flip_probability * (1 - flip_probability), atol=0.01)
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="Unknown basis"):
+            MemoryExperiment(SEVEN_QUBIT_STEANE_CODE, 1, basis="y")
+        with pytest.raises(ValueError, match="At least one round"):
+            MemoryExperiment(SEVEN_QUBIT_STEANE_CODE, 0)
@@ -8,13 +8,14 @@ from qecc.nine_qubit_shors_code import (
     apply_nine_qubit_shors_code_bit_flip_correction,
     apply_nine_qubit_shors_code_phase_flip_correction,
     get_nine_qubit_shors_code_bit_flip_syndrome_extraction_circuit,
+    get_nine_qubit_shors_code_coherent_correction_circuit,
     get_nine_qubit_shors_code_decoding_circuit,
     get_nine_qubit_shors_code_phase_flip_syndrome_extraction_circuit,
     get_nine_qubit_shors_code_syndrome_extraction_circuit,
 )
 
 from . import HadBasisState
-from .utils import CompBasisState, NineQubitEncodingQuantumCircuitTest, combs_of_strings
+from .utils import CompBasisState, NineQubitEncodingQuantumCircuitTest, SampledVerification, combs_of_strings
 
 
 class NineQubitShorsCodeTest(NineQubitEncodingQuantumCircuitTest):
@@ -152,14 +153,11 @@ class TestNineQubitShorsCodeEncodingDecoding(NineQubitShorsCodeTest):
         self.check_results_one_result(qc, "000000001", hadamard_qubits=1)
 
     def test_encoding_decoding_random_state_vector(self):
-        for _ in range(4):
-            vec, prob_zero, prob_one = self.get_random_state_vector_and_exact_probabilities()
-
-            qc = self.get_initialized_qc(vec)
-            self.encode(qc)
-            self.decode(qc)
+        qc = self.get_initialized_qc(None)
+        self.encode(qc)
+        self.decode(qc)
 
-            self.check_results_two_results_ratio(qc, ("000000000", "000000001"), ("", ""), (prob_zero, prob_one))
+        self.check_results_two_results_ratio_for_random_states(qc, ("000000000", "000000001"), ("", ""))
 
 
 class TestNineQubitShorsCodeBitFlipSyndromeExtraction(NineQubitShorsCodeTest):
@@ -276,3 +274,71 @@ class TestRandomNineQubitShorsCodeCompleteErrorCorrection(NineQubitShorsCodeTest
                 (prob_zero, prob_one),
                 num_shots=100,
             )
+
+
+class TestNineQubitShorsCodeCoherentErrorCorrection(NineQubitShorsCodeTest):
+    def test_correcting_deliberate_error(self):
+        for bit_flip_error_index, bit_flip_syndrome in enumerate(self.BIT_FLIP_SYNDROMES):
+            for phase_flip_block, phase_flip_syndrome in enumerate(self.PHASE_FLIP_SYNDROMES):
+                qc = QuantumCircuit(9 + 6 + 2)
+                self.encode(qc)
+                qc.x(bit_flip_error_index)
+                # Any qubit in the block, since they all have the same syndrome
+                qc.z(phase_flip_block * 3 + random.randint(0, 2))
+                self.complete_syndrome_extraction(qc)
+                qc.compose(get_nine_qubit_shors_code_coherent_correction_circuit(), inplace=True)
+                self.decode(qc)
+                self.check_coherent_correction(qc, phase_flip_syndrome + bit_flip_syndrome)
+
+
+class TestNineQubitShorsCodeErrorCorrectionWithAncillaReuse(NineQubitShorsCodeTest):
+    def test_correcting_deliberate_error(self):
+        for initial_state, measurement_outcome in ((CompBasisState.ZERO, "000000000"), (CompBasisState.ONE, "000000001")):
+            for bit_flip_error_index, bit_flip_syndrome in enumerate(self.BIT_FLIP_SYNDROMES):
+                for phase_flip_block, phase_flip_syndrome in enumerate(self.PHASE_FLIP_SYNDROMES):
+                    # 9 data qubits and one ancilla, rather than 9 + 6 + 2 qubits
+                    qc = self.get_initialized_qc(initial_state, num_qubits=9 + 1, clreg_sizes=(6, 2))
+                    self.encode(qc)
+                    qc.x(bit_flip_error_index)
+                    qc.z(phase_flip_block * 3 + random.randint(0, 2))
+                    qc.compose(get_nine_qubit_shors_code_syndrome_extraction_circuit(num_ancillas=1), inplace=True)
+                    apply_nine_qubit_shors_code_bit_flip_correction(qc, syndrome_measured=True)
+                    apply_nine_qubit_shors_code_phase_flip_correction(qc, syndrome_measured=True)
+                    self.decode(qc)
+                    self.check_results_one_result(qc, "0" + measurement_outcome, f"{phase_flip_syndrome} {bit_flip_syndrome}")
+
+
+class TestNineQubitShorsCodeEncodingDecodingSampled(SampledVerification, TestNineQubitShorsCodeEncodingDecoding):
+    pass
+
+
+class TestNineQubitShorsCodeBitFlipSyndromeExtractionSampled(SampledVerification, TestNineQubitShorsCodeBitFlipSyndromeExtraction):
+    pass
+
+
+class TestNineQubitShorsCodeBitFlipErrorCorrectionSampled(SampledVerification, TestNineQubitShorsCodeBitFlipErrorCorrection):
+    pass
+
+
+class TestNineQubitShorsCodePhaseFlipSyndromeExtractionSampled(SampledVerification, TestNineQubitShorsCodePhaseFlipSyndromeExtraction):
+    pass
+
+
+class TestNineQubitShorsCodePhaseFlipErrorCorrectionSampled(SampledVerification, TestNineQubitShorsCodePhaseFlipErrorCorrection):
+    pass
+
+
+class TestNineQubitShorsCodeCompleteErrorCorrectionSampled(SampledVerification, TestNineQubitShorsCodeCompleteErrorCorrection):
+    pass
+
+
+class TestRandomNineQubitShorsCodeCompleteErrorCorrectionSampled(SampledVerification, TestRandomNineQubitShorsCodeCompleteErrorCorrection):
+    pass
+
+
+class TestNineQubitShorsCodeCoherentErrorCorrectionSampled(SampledVerification, TestNineQubitShorsCodeCoherentErrorCorrection):
+    pass
+
+
+class TestNineQubitShorsCodeErrorCorrectionWithAncillaReuseSampled(SampledVerification, TestNineQubitShorsCodeErrorCorrectionWithAncillaReuse):
+    pass
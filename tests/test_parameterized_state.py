@@ -0,0 +1,32 @@
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Statevector, random_statevector
+
+from qecc.parameterized_state import append_parameterized_state_preparation, bind_state, simulate_circuit_for_states
+
+from .utils import CompBasisState, HadBasisState
+
+
+class TestParameterizedState:
+    def test_parameter_values_prepare_state(self):
+        for state in (CompBasisState.ZERO, CompBasisState.ONE, HadBasisState.MINUS, Statevector([0.6, 0.8j]), *(random_statevector(2, seed=seed) for seed in range(10))):
+            qc = QuantumCircuit(1)
+            append_parameterized_state_preparation(qc)
+            prepared = Statevector(bind_state(qc, state))
+            assert np.isclose(abs(prepared.inner(state)), 1)
+
+    def test_one_result_per_state(self):
+        qc = QuantumCircuit(2)
+        append_parameterized_state_preparation(qc)
+        qc.cx(0, 1)
+        qc.measure_all()
+        results = simulate_circuit_for_states(qc, [CompBasisState.ZERO, CompBasisState.ONE, HadBasisState.PLUS], num_shots=1000)
+        assert results[0] == {"00": 1000}
+        assert results[1] == {"11": 1000}
+        assert set(results[2]) == {"00", "11"}
+
+    def test_no_states(self):
+        qc = QuantumCircuit(1)
+        append_parameterized_state_preparation(qc)
+        qc.measure_all()
+        assert simulate_circuit_for_states(qc, []) == []
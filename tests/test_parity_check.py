@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from qecc.codes import NINE_QUBIT_SHORS_CODE, SEVEN_QUBIT_STEANE_CODE
+from qecc.parity_check import ParityCheckMatrix, pack_bits, unpack_bits
+from qecc.stabilizer_circuits import get_css_encoding_circuit
+
+
+class TestPacking:
+    def test_round_trip(self):
+        bits = np.random.default_rng(0).integers(0, 2, size=(100, 19), dtype=np.uint8)
+        packed = pack_bits(bits)
+        assert packed.shape == (100, 3)
+        assert (unpack_bits(packed, 19) == bits).all()
+
+    def test_little_endian(self):
+        assert pack_bits([1, 0, 0, 0, 0, 0, 0, 0, 1]).tolist() == [1, 1]
+
+
+class TestParityCheckMatrix:
+    def test_steane_syndrome_is_error_position(self):
+        errors = pack_bits(np.eye(7))
+        assert list(SEVEN_QUBIT_STEANE_CODE.z_checks.syndromes(errors)) == [1, 2, 3, 4, 5, 6, 7]
+
+    def test_shors_syndromes_match_circuits(self):
+        errors = pack_bits(np.eye(9))
+        assert list(NINE_QUBIT_SHORS_CODE.z_checks.syndromes(errors)) == [0b000001, 0b000010, 0b000011, 0b000100, 0b001000, 0b001100, 0b010000, 0b100000, 0b110000]
+        assert list(NINE_QUBIT_SHORS_CODE.x_checks.syndromes(errors)) == [0b01] * 3 + [0b10] * 3 + [0b11] * 3
+
+    def test_batched_syndromes_match_matrix_product(self):
+        checks = ParityCheckMatrix(np.random.default_rng(1).integers(0, 2, size=(5, 21)), 21)
+        errors = np.random.default_rng(2).integers(0, 2, size=(1000, 21), dtype=np.uint8)
+        assert (checks.syndrome_bits(pack_bits(errors)) == (errors.astype(int) @ checks.dense().T) % 2).all()
+
+    def test_lookup_table_corrects_lowest_qubit(self):
+        table = NINE_QUBIT_SHORS_CODE.x_checks.lookup_table()
+        assert [list(np.flatnonzero(row)) for row in unpack_bits(table, 9)] == [[], [0], [3], [6]]
+
+    def test_reduced_row_echelon_form(self):
+        reduced, pivots = SEVEN_QUBIT_STEANE_CODE.x_checks.reduced_row_echelon_form()
+        assert pivots == (6, 5, 4)
+        assert reduced.supports() == ((0, 1, 3, 6), (0, 2, 3, 5), (1, 2, 3, 4))
+
+    def test_reduced_row_echelon_form_drops_dependent_rows(self):
+        reduced, pivots = ParityCheckMatrix([[1, 1, 0], [0, 1, 1], [1, 0, 1]], 3).reduced_row_echelon_form()
+        assert reduced.num_checks == len(pivots) == 2
+
+
+class TestCssEncodingCircuit:
+    def test_qubit_0_must_be_in_logical_x(self):
+        with pytest.raises(ValueError):
+            get_css_encoding_circuit(ParityCheckMatrix([], 3), np.array([0, 1, 1]))
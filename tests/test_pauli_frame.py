@@ -0,0 +1,61 @@
+import pytest
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+
+from qecc.pauli_frame import PauliFrameSimulator, sample_counts
+
+from .test_nine_qubit_shors_code import NineQubitShorsCodeTest
+from .test_seven_qubit_steane_code import SevenQubitSteaneCodeTest
+from .utils import CompBasisState, HadBasisState
+
+
+class TestPauliFrameSimulator:
+    def test_steane_code_error_correction(self):
+        """
+        Same expected outcomes as the Steane code error correction tests, including the bitstring format
+        """
+        for bit_flip_error_index, bit_flip_syndrome in enumerate(SevenQubitSteaneCodeTest.SYNDROMES):
+            for phase_flip_error_index, phase_flip_syndrome in enumerate(SevenQubitSteaneCodeTest.SYNDROMES):
+                qc = SevenQubitSteaneCodeTest.get_error_correction_circuit(CompBasisState.ONE, bit_flip_error_index, phase_flip_error_index)
+                qc.measure_all()
+                assert sample_counts(qc, 100) == {f"{phase_flip_syndrome}{bit_flip_syndrome}0000001 {phase_flip_syndrome} {bit_flip_syndrome}": 100}
+
+    def test_steane_code_encoding_is_uniform(self):
+        qc = SevenQubitSteaneCodeTest.get_initialized_qc(CompBasisState.ZERO)
+        SevenQubitSteaneCodeTest.encode(qc)
+        qc.measure_all()
+        counts = sample_counts(qc, 80_000, seed=1)
+        assert set(counts) == {state + " " for state in SevenQubitSteaneCodeTest.STEANE_CODE_ZERO_STATES}
+        assert all(abs(count - 10_000) < 500 for count in counts.values())
+
+    def test_shors_code_error_correction_plus(self):
+        qc = NineQubitShorsCodeTest.get_complete_error_correction_circuit(HadBasisState.PLUS, 4, 7)
+        qc.measure_all()
+        counts = sample_counts(qc, 10_000, seed=2)
+        assert set(counts) == {"11001000000000000 11 001000", "11001000000000001 11 001000"}
+        assert abs(counts["11001000000000000 11 001000"] - 5000) < 250
+
+    def test_packed_sample_shape(self):
+        qc = QuantumCircuit(QuantumRegister(2), ClassicalRegister(2))
+        qc.x(0)
+        qc.cx(0, 1)
+        qc.measure([0, 1], [0, 1])
+        simulator = PauliFrameSimulator(qc)
+        assert simulator.sample_packed(1000).shape == (2, 16)
+        assert simulator.sample(1000).sum() == 2000
+
+    def test_single_clbit_condition(self):
+        qc = QuantumCircuit(QuantumRegister(2), ClassicalRegister(2))
+        qc.h(0)
+        qc.measure(0, 0)
+        with qc.if_test((qc.clbits[0], 1)):
+            qc.x(1)
+        qc.measure(1, 1)
+        assert set(sample_counts(qc, 1000)) == {"00", "11"}
+
+    def test_non_pauli_correction_is_rejected(self):
+        qc = QuantumCircuit(QuantumRegister(1), ClassicalRegister(1))
+        qc.measure(0, 0)
+        with qc.if_test((qc.cregs[0], 1)):
+            qc.h(0)
+        with pytest.raises(ValueError):
+            PauliFrameSimulator(qc)
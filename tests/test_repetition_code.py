@@ -0,0 +1,106 @@
+import itertools
+
+import numpy as np
+from qiskit import ClassicalRegister, QuantumCircuit
+from qiskit.quantum_info import Operator
+
+from qecc import (
+    THREE_QUBIT_BIT_FLIP_CODE,
+    THREE_QUBIT_PHASE_FLIP_CODE,
+    apply_repetition_code_correction,
+    decode_repetition_code_syndromes,
+    get_repetition_code,
+    get_repetition_code_decoding_circuit,
+    get_repetition_code_encoding_circuit,
+    get_repetition_code_syndrome_extraction_circuit,
+    get_three_qubit_bit_flip_encoding_decoding_circuit,
+    get_three_qubit_phase_flip_encoding_circuit,
+)
+from qecc.parity_check import pack_bits
+from qecc.repetition_code import REPETITION_CODE_KINDS
+from qecc.simulation import is_clifford_circuit, simulate_circuits
+
+
+def get_error_correction_circuit(distance: int, kind: str, initial_bit: int, error_qubits: tuple[int, ...]) -> QuantumCircuit:
+    """
+    Encode |initial_bit>, apply the error (X for bit flip, Z for phase flip) on each of the given qubits, correct it,
+      decode, and measure the data qubits into the last register
+    """
+    syndrome_extraction = get_repetition_code_syndrome_extraction_circuit(distance, kind)
+    qc = QuantumCircuit(*syndrome_extraction.qregs, ClassicalRegister(distance - 1))
+    if initial_bit:
+        qc.x(0)
+    qc.compose(get_repetition_code_encoding_circuit(distance, kind), qubits=range(distance), inplace=True)
+    for qubit in error_qubits:
+        getattr(qc, "x" if kind == "bit_flip" else "z")(qubit)
+    qc.compose(syndrome_extraction, inplace=True)
+    apply_repetition_code_correction(qc, distance, kind)
+    qc.compose(get_repetition_code_decoding_circuit(distance, kind), qubits=range(distance), inplace=True)
+    data_measurement = ClassicalRegister(distance)
+    qc.add_register(data_measurement)
+    qc.measure(range(distance), data_measurement)
+    return qc
+
+
+class TestRepetitionCode:
+    def test_distance_3_is_the_three_qubit_codes(self):
+        for kind, code, get_encoding_circuit in (
+            ("bit_flip", THREE_QUBIT_BIT_FLIP_CODE, get_three_qubit_bit_flip_encoding_decoding_circuit),
+            ("phase_flip", THREE_QUBIT_PHASE_FLIP_CODE, get_three_qubit_phase_flip_encoding_circuit),
+        ):
+            repetition_code = get_repetition_code(3, kind)
+            assert np.array_equal(repetition_code.z_checks.dense(), code.z_checks.dense())
+            assert np.array_equal(repetition_code.x_checks.dense(), code.x_checks.dense())
+            assert np.array_equal(repetition_code.logical_x, code.logical_x)
+            assert np.array_equal(repetition_code.logical_z, code.logical_z)
+            assert Operator(get_repetition_code_encoding_circuit(3, kind)).equiv(Operator(get_encoding_circuit()))
+
+    def test_corrects_every_error_up_to_half_the_distance(self):
+        distance = 5
+        for kind in REPETITION_CODE_KINDS:
+            cases = [(initial_bit, error_qubits) for initial_bit in (0, 1) for weight in range(distance // 2 + 1) for error_qubits in itertools.combinations(range(distance), weight)]
+            circuits = [get_error_correction_circuit(distance, kind, initial_bit, error_qubits) for initial_bit, error_qubits in cases]
+            assert all(is_clifford_circuit(qc) for qc in circuits)
+            for (initial_bit, _), counts in zip(cases, simulate_circuits(circuits, num_shots=16), strict=True):
+                # Each shot is the decoded data qubits, then the syndrome weight, then the syndrome
+                assert {outcome.split(" ")[0] for outcome in counts} == {"0" * (distance - 1) + str(initial_bit)}
+
+    def test_correcting_twice(self):
+        distance = 5
+        for kind in REPETITION_CODE_KINDS:
+            syndrome_extraction = get_repetition_code_syndrome_extraction_circuit(distance, kind)
+            qc = QuantumCircuit(*syndrome_extraction.qregs, ClassicalRegister(distance - 1))
+            qc.x(0)
+            qc.compose(get_repetition_code_encoding_circuit(distance, kind), qubits=range(distance), inplace=True)
+            for error_qubits in ((0, 3), (2, 4)):
+                for qubit in error_qubits:
+                    getattr(qc, "x" if kind == "bit_flip" else "z")(qubit)
+                qc.reset(range(distance, 2 * distance - 1))
+                qc.compose(syndrome_extraction, inplace=True)
+                apply_repetition_code_correction(qc, distance, kind)
+            qc.compose(get_repetition_code_decoding_circuit(distance, kind), qubits=range(distance), inplace=True)
+            data_measurement = ClassicalRegister(distance)
+            qc.add_register(data_measurement)
+            qc.measure(range(distance), data_measurement)
+            assert {outcome.split(" ")[0] for outcome in simulate_circuits([qc], num_shots=16)[0]} == {"0" * (distance - 1) + "1"}
+
+    def test_circuit_size_is_linear(self):
+        distance = 301
+        assert get_repetition_code_encoding_circuit(distance).size() == distance - 1
+        assert get_repetition_code_syndrome_extraction_circuit(distance).size() == 2 * (distance - 1)
+        qc = get_repetition_code_syndrome_extraction_circuit(distance).copy()
+        qc.add_register(ClassicalRegister(distance - 1))
+        apply_repetition_code_correction(qc, distance)
+        assert sum(qc.count_ops()[name] for name in ("measure", "if_else")) == 2 * distance - 1
+
+    def test_decoder(self):
+        distance = 201
+        code = get_repetition_code(distance)
+        rng = np.random.default_rng(0)
+        errors = (rng.random((1000, distance)) < rng.random((1000, 1))).astype(np.uint8)
+        syndrome_bits = code.z_checks.syndrome_bits(pack_bits(errors))
+        residuals = errors ^ decode_repetition_code_syndromes(syndrome_bits)
+        weights = errors.sum(axis=1)
+        # Correctable errors are corrected, and anything heavier becomes a logical flip
+        assert not residuals[weights <= distance // 2].any()
+        assert residuals[weights > distance // 2].all()
@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from qiskit import QuantumCircuit
+
+from qecc import ResultCache, instrument, use_result_cache
+from qecc.error_sweep import ErrorLocation, apply_error, get_single_qubit_error_locations, simulate_error_sweep
+from qecc.simulation import simulate_circuit
+from qecc.threshold import run_threshold_point
+
+
+def get_circuit(num_qubits: int = 3) -> QuantumCircuit:
+    qc = QuantumCircuit(num_qubits)
+    qc.h(range(num_qubits))
+    qc.measure_all()
+    return qc
+
+
+class TestResultCache:
+    def test_seeded_simulations_are_cached(self, tmp_path: Path):
+        cache = use_result_cache(tmp_path)
+        try:
+            with instrument() as instrumentation:
+                counts = simulate_circuit(get_circuit(), 100, seed=1)
+                assert simulate_circuit(get_circuit(), 100, seed=1) == counts
+                simulate_circuit(get_circuit(), 100, seed=2)
+                simulate_circuit(get_circuit(), 100)
+            assert cache.info()[:3] == (1, 2, 0)
+            assert [span.name for span in instrumentation.spans].count("run") == 3
+            # A new process loads the same counts from disk
+            assert ResultCache(tmp_path).load(cache.get_key([get_circuit()], "simulate_circuit", 100, 1)) == [counts]
+        finally:
+            use_result_cache(None)
+
+    def test_sweeps_are_cached(self, tmp_path: Path):
+        cache = use_result_cache(tmp_path)
+
+        def build_circuit(location: ErrorLocation) -> QuantumCircuit:
+            qc = QuantumCircuit(3)
+            apply_error(qc, location)
+            qc.measure_all()
+            return qc
+
+        try:
+            locations = get_single_qubit_error_locations(3, include_no_error=True)
+            assert simulate_error_sweep(build_circuit, locations, 16, seed=0) == simulate_error_sweep(build_circuit, locations, 16, seed=0)
+            row = run_threshold_point("three_qubit_bit_flip", "bit_flip", "z", 0.2, 100, seed=0)
+            assert run_threshold_point("three_qubit_bit_flip", "bit_flip", "z", 0.2, 100, seed=0) == row
+            assert run_threshold_point("three_qubit_bit_flip", "bit_flip", "z", 0.3, 100, seed=0) != row
+            assert cache.info()[:2] == (2, 3)
+        finally:
+            use_result_cache(None)
+
+    def test_least_recently_used_are_evicted(self, tmp_path: Path):
+        cache = ResultCache(tmp_path)
+        cache.save("a", [{"0": 1}])
+        entry_size = cache.info().currsize
+        cache.max_bytes = 2 * entry_size
+        cache.save("b", [{"0": 1}])
+        assert cache.load("a") == [{"0": 1}]
+        cache.save("c", [{"0": 1}])
+        assert cache.evictions == 1
+        assert cache.load("b") is None
+        assert cache.load("a") == cache.load("c") == [{"0": 1}]
+        assert cache.info().currsize == 2 * entry_size
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path: Path):
+        cache = ResultCache(tmp_path)
+        cache.save("a", [{"0": 1}])
+        (path,) = tmp_path.iterdir()
+        path.write_bytes(path.read_bytes()[:-2])
+        assert cache.load("a") is None
+        cache.clear()
+        assert not list(tmp_path.iterdir())
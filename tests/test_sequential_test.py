@@ -0,0 +1,65 @@
+from collections.abc import Callable
+
+import numpy as np
+
+from qecc import instrument, run_sequential_ratio_test
+
+from .utils import CompBasisState, QuantumCircuitTest
+
+
+def get_sampler(probabilities: dict[str, float], seed: int = 0) -> Callable[[int], dict[str, int]]:
+    rng = np.random.default_rng(seed)
+
+    def sample(num_shots: int) -> dict[str, int]:
+        counts = rng.multinomial(num_shots, list(probabilities.values()))
+        return {outcome: int(count) for outcome, count in zip(probabilities, counts, strict=True) if count}
+
+    return sample
+
+
+class TestRunSequentialRatioTest:
+    def test_certain_outcome_is_accepted_quickly(self):
+        result = run_sequential_ratio_test(get_sampler({"0": 1.0}), {"0": 1})
+        assert result.accepted
+        assert result.num_shots == 88
+        assert result.counts == {"0": 88}
+        # The last batch is trimmed to stop there
+        assert run_sequential_ratio_test(get_sampler({"0": 1.0}), {"0": 1}, batch_size=32).num_shots == 88
+
+    def test_unexpected_outcome_is_rejected(self):
+        result = run_sequential_ratio_test(get_sampler({"0": 0.9, "1": 0.1}), {"0": 1})
+        assert result.decision == "reject"
+        assert result.rejected_outcome == "1"
+        assert result.num_shots == 64
+
+    def test_ratios(self):
+        for seed in range(5):
+            result = run_sequential_ratio_test(get_sampler({"00": 0.25, "01": 0.5, "11": 0.25}, seed), {"00": 1, "01": 2, "11": 1})
+            assert result.accepted
+            assert result.num_shots < 2048
+            result = run_sequential_ratio_test(get_sampler({"0": 0.75, "1": 0.25}, seed), {"0": 1, "1": 1})
+            assert result.decision == "reject"
+            assert result.num_shots <= 512
+
+    def test_borderline_ratios_need_more_shots(self):
+        clear_cut = run_sequential_ratio_test(get_sampler({"0": 0.8, "1": 0.2}), {"0": 1, "1": 1})
+        borderline = run_sequential_ratio_test(get_sampler({"0": 0.55, "1": 0.45}), {"0": 1, "1": 1})
+        assert borderline.num_shots > clear_cut.num_shots
+        inconclusive = run_sequential_ratio_test(get_sampler({"0": 0.55, "1": 0.45}), {"0": 1, "1": 1}, max_shots=256)
+        assert inconclusive.decision == "inconclusive"
+        assert inconclusive.num_shots == 256
+
+
+class TestSampledQuantumCircuitTest:
+    class SampledTest(QuantumCircuitTest):
+        EXACT_VERIFICATION = False
+        # The number of shots a fair coin needs is itself random
+        SIMULATION_SEED = 0
+
+    def test_checks(self):
+        with instrument() as instrumentation:
+            self.SampledTest.check_results_one_result(self.SampledTest.get_initialized_qc(CompBasisState.ONE, num_qubits=2), "01")
+            self.SampledTest.check_results_two_results_50_50(self.SampledTest.get_initialized_qc(CompBasisState.ZERO, num_qubits=1), ("0", "1"), hadamard_qubits=1)
+        num_shots = [span.args["num_shots"] for span in instrumentation.spans if span.name == "sequential_test"]
+        assert num_shots[0] == 88
+        assert num_shots[1] < 1024
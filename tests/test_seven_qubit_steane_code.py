@@ -3,14 +3,16 @@ import random
 from qiskit import QuantumCircuit
 from qiskit.quantum_info import Statevector
 
+from qecc.error_sweep import ErrorLocation, apply_error
 from qecc.seven_qubit_steane_code import (
     apply_seven_qubit_steane_code_correction,
+    get_seven_qubit_steane_code_coherent_correction_circuit,
     get_seven_qubit_steane_code_decoding_circuit,
     get_seven_qubit_steane_code_encoding_circuit,
     get_seven_qubit_steane_code_syndrome_extraction_circuit,
 )
 
-from .utils import CompBasisState, HadBasisState, SevenQubitEncodingQuantumCircuitTest, flip_bit_at_index
+from .utils import CompBasisState, HadBasisState, SampledVerification, SevenQubitEncodingQuantumCircuitTest, flip_bit_at_index
 
 
 class SevenQubitSteaneCodeTest(SevenQubitEncodingQuantumCircuitTest):
@@ -103,14 +105,11 @@ class TestSevenQubitSteaneCodeEncodingDecoding(SevenQubitSteaneCodeTest):
         self.check_results_one_result(qc, "0000001", hadamard_qubits=1)
 
     def test_encoding_decoding_random_state_vector(self):
-        for _ in range(4):
-            vec, prob_zero, prob_one = self.get_random_state_vector_and_exact_probabilities()
-
-            qc = self.get_initialized_qc(vec)
-            self.encode(qc)
-            self.decode(qc)
+        qc = self.get_initialized_qc(None)
+        self.encode(qc)
+        self.decode(qc)
 
-            self.check_results_two_results_ratio(qc, ("0000000", "0000001"), ("", ""), (prob_zero, prob_one))
+        self.check_results_two_results_ratio_for_random_states(qc, ("0000000", "0000001"), ("", ""))
 
 
 class TestSevenQubitSteaneCodeSyndromeExtraction(SevenQubitSteaneCodeTest):
@@ -157,6 +156,38 @@ class TestSevenQubitSteaneCodeSyndromeExtraction(SevenQubitSteaneCodeTest):
         self.do_syndrome_z_error_test(CompBasisState.ONE, self.STEANE_CODE_ONE_STATES)
 
 
+class TestSevenQubitSteaneCodeSyndromeExtractionSweep(SevenQubitSteaneCodeTest):
+    """
+    The same syndromes as `TestSevenQubitSteaneCodeSyndromeExtraction`, with every error location of each state checked
+      as one batch
+    """
+
+    @classmethod
+    def do_syndrome_error_sweep_test(cls, initial_state: Statevector, un_errored_states: tuple[str, ...]) -> None:
+        def build_circuit(location: ErrorLocation) -> QuantumCircuit:
+            qc = cls.get_initialized_qc(initial_state, num_qubits=7 + 3 + 3)
+            cls.encode(qc)
+            # Deliberate error
+            apply_error(qc, location)
+            cls.syndrome_extraction(qc)
+            return qc
+
+        # Correct measurements: for each un-errored state encoding
+        # - X errors: syndromes 000 and the error index in binary, and the state encoding with the correct bit flipped
+        # - Z errors: syndromes the error index in binary and 000, and the state encoding
+        expected = {}
+        for error_index, syndrome in enumerate(cls.SYNDROMES):
+            expected[ErrorLocation("x", error_index)] = tuple("000" + syndrome + flip_bit_at_index(state, error_index) for state in un_errored_states)
+            expected[ErrorLocation("z", error_index)] = tuple(syndrome + "000" + state for state in un_errored_states)
+        cls.check_error_sweep_even_chance(build_circuit, {location: (outcomes, tuple("" for _ in outcomes)) for location, outcomes in expected.items()})
+
+    def test_encoding_0_syndrome_deliberate_error_sweep(self):
+        self.do_syndrome_error_sweep_test(CompBasisState.ZERO, self.STEANE_CODE_ZERO_STATES)
+
+    def test_encoding_1_syndrome_deliberate_error_sweep(self):
+        self.do_syndrome_error_sweep_test(CompBasisState.ONE, self.STEANE_CODE_ONE_STATES)
+
+
 class TestSevenQubitSteaneCodeErrorCorrection(SevenQubitSteaneCodeTest):
     """
     Tests applying each possible X and Z error, and making sure the correction works properly,
@@ -204,3 +235,67 @@ class TestRandomSevenQubitSteaneCodeErrorCorrection(SevenQubitSteaneCodeTest):
                 (prob_zero, prob_one),
                 num_shots=100,
             )
+
+
+class TestSevenQubitSteaneCodeCoherentErrorCorrection(SevenQubitSteaneCodeTest):
+    def test_correcting_deliberate_error(self):
+        for bit_flip_error_index, bit_flip_syndrome in enumerate(self.SYNDROMES):
+            for phase_flip_error_index, phase_flip_syndrome in enumerate(self.SYNDROMES):
+                qc = QuantumCircuit(7 + 3 + 3)
+                self.encode(qc)
+                qc.x(bit_flip_error_index)
+                qc.z(phase_flip_error_index)
+                self.syndrome_extraction(qc)
+                qc.compose(get_seven_qubit_steane_code_coherent_correction_circuit(), inplace=True)
+                self.decode(qc)
+                self.check_coherent_correction(qc, phase_flip_syndrome + bit_flip_syndrome)
+
+
+class TestSevenQubitSteaneCodeErrorCorrectionWithAncillaReuse(SevenQubitSteaneCodeTest):
+    @classmethod
+    def get_error_correction_circuit_with_ancilla_reuse(cls, state_to_initialize: Statevector, bit_flip_error_index: int, phase_flip_error_index: int, num_ancillas: int) -> QuantumCircuit:
+        out = cls.get_initialized_qc(state_to_initialize, num_qubits=7 + num_ancillas, clreg_sizes=(3, 3))
+        cls.encode(out)
+        out.x(bit_flip_error_index)
+        out.z(phase_flip_error_index)
+        out.compose(get_seven_qubit_steane_code_syndrome_extraction_circuit(num_ancillas), inplace=True)
+        apply_seven_qubit_steane_code_correction(out, syndrome_measured=True)
+        cls.decode(out)
+        return out
+
+    def test_correcting_deliberate_error(self):
+        for num_ancillas in (1, 2):
+            for initial_state, measurement_outcome in ((CompBasisState.ZERO, "0000000"), (CompBasisState.ONE, "0000001")):
+                for bit_flip_error_index, bit_flip_syndrome in enumerate(self.SYNDROMES):
+                    for phase_flip_error_index, phase_flip_syndrome in enumerate(self.SYNDROMES):
+                        qc = self.get_error_correction_circuit_with_ancilla_reuse(initial_state, bit_flip_error_index, phase_flip_error_index, num_ancillas)
+                        # The ancillas are reset after each check, so end up back in |0>
+                        self.check_results_one_result(qc, "0" * num_ancillas + measurement_outcome, f"{phase_flip_syndrome} {bit_flip_syndrome}")
+
+
+class TestSevenQubitSteaneCodeEncodingDecodingSampled(SampledVerification, TestSevenQubitSteaneCodeEncodingDecoding):
+    pass
+
+
+class TestSevenQubitSteaneCodeSyndromeExtractionSampled(SampledVerification, TestSevenQubitSteaneCodeSyndromeExtraction):
+    pass
+
+
+class TestSevenQubitSteaneCodeSyndromeExtractionSweepSampled(SampledVerification, TestSevenQubitSteaneCodeSyndromeExtractionSweep):
+    pass
+
+
+class TestSevenQubitSteaneCodeErrorCorrectionSampled(SampledVerification, TestSevenQubitSteaneCodeErrorCorrection):
+    pass
+
+
+class TestRandomSevenQubitSteaneCodeErrorCorrectionSampled(SampledVerification, TestRandomSevenQubitSteaneCodeErrorCorrection):
+    pass
+
+
+class TestSevenQubitSteaneCodeCoherentErrorCorrectionSampled(SampledVerification, TestSevenQubitSteaneCodeCoherentErrorCorrection):
+    pass
+
+
+class TestSevenQubitSteaneCodeErrorCorrectionWithAncillaReuseSampled(SampledVerification, TestSevenQubitSteaneCodeErrorCorrectionWithAncillaReuse):
+    pass
@@ -0,0 +1,65 @@
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+from qiskit.quantum_info import Statevector
+
+from qecc import get_nine_qubit_shors_code_encoding_circuit, get_nine_qubit_shors_code_syndrome_extraction_circuit
+from qecc.simulation import get_simulator, is_clifford_circuit, simulate_circuit, simulate_circuits, stabilizer_simulator, statevector_simulator
+
+from .utils import CompBasisState, HadBasisState
+
+
+class TestIsCliffordCircuit:
+    def test_qecc_circuits_are_clifford(self):
+        assert is_clifford_circuit(get_nine_qubit_shors_code_encoding_circuit())
+        assert is_clifford_circuit(get_nine_qubit_shors_code_syndrome_extraction_circuit())
+
+    def test_stabilizer_state_initialisation_is_clifford(self):
+        for state in (CompBasisState.ZERO, CompBasisState.ONE, HadBasisState.PLUS, HadBasisState.MINUS, Statevector([2**-0.5, 1j * 2**-0.5])):
+            qc = QuantumCircuit(1)
+            qc.initialize(state, [0])
+            assert is_clifford_circuit(qc)
+
+    def test_other_initialisation_is_not_clifford(self):
+        qc = QuantumCircuit(1)
+        qc.initialize(Statevector([0.6, 0.8]), [0])
+        assert not is_clifford_circuit(qc)
+
+    def test_non_clifford_gate_in_if_test(self):
+        qc = QuantumCircuit(QuantumRegister(1), ClassicalRegister(1))
+        qc.measure(0, 0)
+        with qc.if_test((qc.cregs[0], 1)):
+            qc.x(0)
+        assert is_clifford_circuit(qc)
+        with qc.if_test((qc.cregs[0], 1)):
+            qc.t(0)
+        assert not is_clifford_circuit(qc)
+
+
+class TestSimulateCircuit:
+    def test_routing(self):
+        qc = QuantumCircuit(1)
+        qc.h(0)
+        assert get_simulator(qc) is stabilizer_simulator
+        qc.t(0)
+        assert get_simulator(qc) is statevector_simulator
+
+    def test_wide_clifford_circuit(self):
+        # Far too wide for a statevector simulator
+        qc = QuantumCircuit(100)
+        qc.initialize(CompBasisState.ONE, [0])
+        for i in range(99):
+            qc.cx(i, i + 1)
+        qc.measure_all()
+        assert simulate_circuit(qc, num_shots=8) == {"1" * 100: 8}
+
+    def test_batch_keeps_order_across_simulators(self):
+        circuits = []
+        for state in (CompBasisState.ONE, Statevector([0.6, 0.8]), CompBasisState.ZERO):
+            qc = QuantumCircuit(2)
+            qc.initialize(state, [0])
+            qc.cx(0, 1)
+            qc.measure_all()
+            circuits.append(qc)
+        results = simulate_circuits(circuits, num_shots=1000)
+        assert results[0] == {"11": 1000}
+        assert set(results[1]) == {"00", "11"}
+        assert results[2] == {"00": 1000}
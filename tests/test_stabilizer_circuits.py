@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Clifford
+
+from qecc import NINE_QUBIT_SHORS_CODE, SEVEN_QUBIT_STEANE_CODE, get_nine_qubit_shors_code_phase_flip_syndrome_extraction_circuit, get_repetition_code
+from qecc.parity_check import ParityCheckMatrix
+from qecc.seven_qubit_steane_code import get_seven_qubit_steane_code_syndrome_extraction_circuit
+from qecc.stabilizer_circuits import get_syndrome_extraction_circuit, schedule_check_cnots
+
+
+def get_sequential_syndrome_extraction_circuit(z_checks: ParityCheckMatrix, x_checks: ParityCheckMatrix) -> QuantumCircuit:
+    """
+    Syndrome extraction laid out like `get_syndrome_extraction_circuit`, with the CNOTs check by check
+    """
+    num_data_qubits = z_checks.num_qubits
+    out = QuantumCircuit(num_data_qubits + z_checks.num_checks + x_checks.num_checks)
+    for check, support in enumerate(z_checks.supports()):
+        for qubit in support:
+            out.cx(qubit, num_data_qubits + check)
+    phase_flip_syndrome = range(num_data_qubits + z_checks.num_checks, out.num_qubits)
+    for syndrome_qubit in phase_flip_syndrome:
+        out.h(syndrome_qubit)
+    for syndrome_qubit, support in zip(phase_flip_syndrome, x_checks.supports(), strict=True):
+        for qubit in support:
+            out.cx(syndrome_qubit, qubit)
+    for syndrome_qubit in phase_flip_syndrome:
+        out.h(syndrome_qubit)
+    return out
+
+
+class TestScheduleCheckCnots:
+    def test_layers_are_parallel_and_as_few_as_possible(self):
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            dense = (rng.random((rng.integers(1, 8), rng.integers(1, 12))) < 0.5).astype(np.uint8)
+            layers = schedule_check_cnots(ParityCheckMatrix(dense, dense.shape[1]))
+            assert len(layers) == max(dense.sum(axis=0).max(), dense.sum(axis=1).max())
+            assert sorted(pair for layer in layers for pair in layer) == [tuple(pair) for pair in np.argwhere(dense).tolist()]
+            for layer in layers:
+                checks, qubits = zip(*layer, strict=True)
+                assert len(set(checks)) == len(checks)
+                assert len(set(qubits)) == len(qubits)
+
+    def test_no_checks(self):
+        assert schedule_check_cnots(ParityCheckMatrix([], 3)) == []
+
+    def test_scheduled_circuits_are_equivalent(self):
+        for code in (SEVEN_QUBIT_STEANE_CODE, NINE_QUBIT_SHORS_CODE, get_repetition_code(5), get_repetition_code(5, "phase_flip")):
+            assert Clifford(get_syndrome_extraction_circuit(code)) == Clifford(get_sequential_syndrome_extraction_circuit(code.z_checks, code.x_checks))
+
+    def test_depth(self):
+        # Each type of check needs as many layers as the weight of its checks, plus the Hadamards after the phase flip
+        #  checks (the ones before run alongside the bit flip checks)
+        assert get_seven_qubit_steane_code_syndrome_extraction_circuit().depth() == 4 + 4 + 1
+        assert get_nine_qubit_shors_code_phase_flip_syndrome_extraction_circuit().depth() == 1 + 6 + 1
+
+    def test_ancilla_reuse_needs_an_ancilla(self):
+        for num_ancillas in (0, -1):
+            with pytest.raises(ValueError, match="At least one ancilla"):
+                get_syndrome_extraction_circuit(SEVEN_QUBIT_STEANE_CODE, num_ancillas)
@@ -3,12 +3,13 @@ from qiskit.quantum_info import Statevector
 
 from qecc import (
     apply_three_qubit_bit_flip_correction,
+    get_three_qubit_bit_flip_coherent_correction_circuit,
     get_three_qubit_bit_flip_encoding_decoding_circuit,
     get_three_qubit_bit_flip_syndrome_extraction_circuit,
 )
 
 from . import HadBasisState
-from .utils import CompBasisState, ThreeQubitEncodingQuantumCircuitTest
+from .utils import CompBasisState, SampledVerification, ThreeQubitEncodingQuantumCircuitTest
 
 
 class ThreeQubitBitFlipTest(ThreeQubitEncodingQuantumCircuitTest):
@@ -35,7 +36,7 @@ class ThreeQubitBitFlipTest(ThreeQubitEncodingQuantumCircuitTest):
         )
 
     @classmethod
-    def get_error_correction_circuit(cls, state_to_initialize: Statevector, error_index: int | None) -> QuantumCircuit:
+    def get_error_correction_circuit(cls, state_to_initialize: Statevector | None, error_index: int | None) -> QuantumCircuit:
         # Initialise
         out = cls.get_initialized_qc(state_to_initialize, num_qubits=5, clreg_sizes=(2,))
         # Encode
@@ -133,17 +134,69 @@ class TestThreeQubitBitFlipErrorCorrection(ThreeQubitBitFlipTest):
             self.check_results_two_results_50_50(qc, (syndrome + "000", syndrome + "111"), (syndrome, syndrome))
 
 
+class TestThreeQubitBitFlipErrorCorrectionSweep(ThreeQubitBitFlipTest):
+    """
+    The same corrections as `TestThreeQubitBitFlipErrorCorrection`, with every error location of each state checked as
+      one batch
+    """
+
+    def test_correcting_deliberate_error_sweep(self):
+        for initial_state, encoded_states in ((CompBasisState.ZERO, ("000",)), (CompBasisState.ONE, ("111",)), (HadBasisState.PLUS, ("000", "111"))):
+            self.check_error_sweep_even_chance(
+                lambda location, initial_state=initial_state: self.get_error_correction_circuit(initial_state, location.qubit),
+                {
+                    location: (tuple(syndrome + encoded_state for encoded_state in encoded_states), tuple(syndrome for _ in encoded_states))
+                    for location, syndrome in self.get_error_locations_and_syndrome_measurements("x")
+                },
+            )
+
+
 class TestRandomThreeQubitBitFlipErrorCorrectionAndDecoding(ThreeQubitBitFlipTest):
     def test_random_state_vector_correction(self):
         """
         For a random state vector, apply each possible X error, and check the error is corrected, by checking
           the measurement results ratio of 0:1 is roughly the same as just the state vector by itself
-        Repeated 4 times for safety
+        Repeated for 4 random state vectors, run as one batch, for safety
         """
-        for _ in range(4):
-            vec, prob_zero, prob_one = self.get_random_state_vector_and_exact_probabilities()
-            for error_index, syndrome in self.ERROR_INDEXES_AND_SYNDROME_MEASUREMENTS:
-                qc = self.get_error_correction_circuit(vec, error_index)
-                self.encode_or_decode(qc)
+        for error_index, syndrome in self.ERROR_INDEXES_AND_SYNDROME_MEASUREMENTS:
+            qc = self.get_error_correction_circuit(None, error_index)
+            self.encode_or_decode(qc)
+
+            self.check_results_two_results_ratio_for_random_states(qc, (syndrome + "000", syndrome + "001"), (syndrome, syndrome))
+
+
+class TestThreeQubitBitFlipCoherentErrorCorrection(ThreeQubitBitFlipTest):
+    def test_correcting_deliberate_error(self):
+        for error_index, syndrome in self.ERROR_INDEXES_AND_SYNDROME_MEASUREMENTS:
+            qc = QuantumCircuit(5)
+            self.encode_or_decode(qc)
+            if error_index is not None:
+                qc.x(error_index)
+            self.syndrome_extraction(qc)
+            qc.compose(get_three_qubit_bit_flip_coherent_correction_circuit(), inplace=True)
+            self.encode_or_decode(qc)
+            self.check_coherent_correction(qc, syndrome)
+
+
+class TestThreeQubitBitFlipEncodingDecodingSampled(SampledVerification, TestThreeQubitBitFlipEncodingDecoding):
+    pass
+
+
+class TestThreeQubitBitFlipSyndromeExtractionSampled(SampledVerification, TestThreeQubitBitFlipSyndromeExtraction):
+    pass
+
+
+class TestThreeQubitBitFlipErrorCorrectionSampled(SampledVerification, TestThreeQubitBitFlipErrorCorrection):
+    pass
+
+
+class TestThreeQubitBitFlipErrorCorrectionSweepSampled(SampledVerification, TestThreeQubitBitFlipErrorCorrectionSweep):
+    pass
+
+
+class TestRandomThreeQubitBitFlipErrorCorrectionAndDecodingSampled(SampledVerification, TestRandomThreeQubitBitFlipErrorCorrectionAndDecoding):
+    pass
+
 
-                self.check_results_two_results_ratio(qc, (syndrome + "000", syndrome + "001"), (syndrome, syndrome), (prob_zero, prob_one))
+class TestThreeQubitBitFlipCoherentErrorCorrectionSampled(SampledVerification, TestThreeQubitBitFlipCoherentErrorCorrection):
+    pass
@@ -2,9 +2,14 @@ from qiskit import QuantumCircuit
 from qiskit.quantum_info import Statevector
 
 from qecc import get_three_qubit_phase_flip_encoding_circuit
-from qecc.three_qubit_phase_flip import apply_three_qubit_phase_flip_correction, get_three_qubit_phase_flip_decoding_circuit, get_three_qubit_phase_flip_syndrome_extraction_circuit
+from qecc.three_qubit_phase_flip import (
+    apply_three_qubit_phase_flip_correction,
+    get_three_qubit_phase_flip_coherent_correction_circuit,
+    get_three_qubit_phase_flip_decoding_circuit,
+    get_three_qubit_phase_flip_syndrome_extraction_circuit,
+)
 
-from .utils import CompBasisState, HadBasisState, ThreeQubitEncodingQuantumCircuitTest
+from .utils import CompBasisState, HadBasisState, SampledVerification, ThreeQubitEncodingQuantumCircuitTest
 
 
 class ThreeQubitPhaseFlipTest(ThreeQubitEncodingQuantumCircuitTest):
@@ -36,7 +41,7 @@ class ThreeQubitPhaseFlipTest(ThreeQubitEncodingQuantumCircuitTest):
         )
 
     @classmethod
-    def get_error_correction_circuit(cls, state_to_initialize: Statevector, error_index: int | None) -> QuantumCircuit:
+    def get_error_correction_circuit(cls, state_to_initialize: Statevector | None, error_index: int | None) -> QuantumCircuit:
         # Initialise
         out = cls.get_initialized_qc(state_to_initialize, num_qubits=5, clreg_sizes=(2,))
         # Encode
@@ -155,17 +160,70 @@ class TestThreeQubitPhaseFlipErrorCorrection(ThreeQubitPhaseFlipTest):
             self.check_results_two_results_50_50(qc, (syndrome + "000", syndrome + "111"), (syndrome, syndrome), hadamard_qubits=3)
 
 
+class TestThreeQubitPhaseFlipErrorCorrectionSweep(ThreeQubitPhaseFlipTest):
+    """
+    The same corrections as `TestThreeQubitPhaseFlipErrorCorrection`, with every error location of each state checked as
+      one batch
+    """
+
+    def test_correcting_deliberate_error_sweep(self):
+        for initial_state, encoded_states in ((CompBasisState.ZERO, ("000",)), (CompBasisState.ONE, ("111",)), (HadBasisState.PLUS, ("000", "111"))):
+            self.check_error_sweep_even_chance(
+                lambda location, initial_state=initial_state: self.get_error_correction_circuit(initial_state, location.qubit),
+                {
+                    location: (tuple(syndrome + encoded_state for encoded_state in encoded_states), tuple(syndrome for _ in encoded_states))
+                    for location, syndrome in self.get_error_locations_and_syndrome_measurements("z")
+                },
+                hadamard_qubits=3,
+            )
+
+
 class TestRandomThreeQubitPhaseFlipErrorCorrectionAndDecoding(ThreeQubitPhaseFlipTest):
     def test_random_state_vector_correction(self):
         """
         For a random state vector, apply each possible Z error, and check the error is corrected, by checking
           the measurement results ratio of 0:1 is roughly the same as just the state vector by itself
-        Repeated 4 times for safety
+        Repeated for 4 random state vectors, run as one batch, for safety
         """
-        for _ in range(4):
-            vec, prob_zero, prob_one = self.get_random_state_vector_and_exact_probabilities()
-            for error_index, syndrome in self.ERROR_INDEXES_AND_SYNDROME_MEASUREMENTS:
-                qc = self.get_error_correction_circuit(vec, error_index)
-                self.decode(qc)
+        for error_index, syndrome in self.ERROR_INDEXES_AND_SYNDROME_MEASUREMENTS:
+            qc = self.get_error_correction_circuit(None, error_index)
+            self.decode(qc)
+
+            self.check_results_two_results_ratio_for_random_states(qc, (syndrome + "000", syndrome + "001"), (syndrome, syndrome))
+
+
+class TestThreeQubitPhaseFlipCoherentErrorCorrection(ThreeQubitPhaseFlipTest):
+    def test_correcting_deliberate_error(self):
+        for error_index, syndrome in self.ERROR_INDEXES_AND_SYNDROME_MEASUREMENTS:
+            qc = QuantumCircuit(5)
+            self.encode(qc)
+            if error_index is not None:
+                qc.z(error_index)
+            self.syndrome_extraction(qc)
+            qc.compose(get_three_qubit_phase_flip_coherent_correction_circuit(), inplace=True)
+            self.decode(qc)
+            self.check_coherent_correction(qc, syndrome)
+
+
+class TestThreeQubitPhaseFlipEncodingDecodingSampled(SampledVerification, TestThreeQubitPhaseFlipEncodingDecoding):
+    pass
+
+
+class TestThreeQubitPhaseFlipSyndromeExtractionSampled(SampledVerification, TestThreeQubitPhaseFlipSyndromeExtraction):
+    pass
+
+
+class TestThreeQubitPhaseFlipErrorCorrectionSampled(SampledVerification, TestThreeQubitPhaseFlipErrorCorrection):
+    pass
+
+
+class TestThreeQubitPhaseFlipErrorCorrectionSweepSampled(SampledVerification, TestThreeQubitPhaseFlipErrorCorrectionSweep):
+    pass
+
+
+class TestRandomThreeQubitPhaseFlipErrorCorrectionAndDecodingSampled(SampledVerification, TestRandomThreeQubitPhaseFlipErrorCorrectionAndDecoding):
+    pass
+
 
-                self.check_results_two_results_ratio(qc, (syndrome + "000", syndrome + "001"), (syndrome, syndrome), (prob_zero, prob_one))
+class TestThreeQubitPhaseFlipCoherentErrorCorrectionSampled(SampledVerification, TestThreeQubitPhaseFlipCoherentErrorCorrection):
+    pass
@@ -0,0 +1,36 @@
+import csv
+from dataclasses import fields
+from pathlib import Path
+
+from qecc.threshold import BASES, CODE_NAMES, ThresholdRow, run_threshold_point, run_threshold_sweep
+
+
+class TestThresholdPoint:
+    def test_no_noise_no_failures(self):
+        for code_name in CODE_NAMES:
+            for basis in BASES:
+                assert run_threshold_point(code_name, "depolarizing", basis, 0.0, 100).num_failures == 0
+
+    def test_bit_flip_code_is_blind_to_phase_flips(self):
+        assert run_threshold_point("three_qubit_bit_flip", "phase_flip", "z", 0.3, 200, seed=1).num_failures == 0
+        assert run_threshold_point("three_qubit_bit_flip", "phase_flip", "x", 0.3, 200, seed=1).num_failures > 0
+
+    def test_corrects_bit_flips(self):
+        # Fails only on 2 or 3 flips: 3 * 0.1^2 * 0.9 + 0.1^3 = 0.028
+        row = run_threshold_point("three_qubit_bit_flip", "bit_flip", "z", 0.1, 20_000, seed=2)
+        assert row.ci_low < 0.028 < row.ci_high
+
+
+class TestThresholdSweep:
+    def test_rows_are_streamed_to_csv(self, tmp_path: Path):
+        output_path = tmp_path / "sweep" / "rows.csv"
+        artifact_dir = tmp_path / "artifacts"
+        rows = run_threshold_sweep(output_path, [0.0, 0.2], code_names=CODE_NAMES[:2], bases=("z",), num_shots=100, seed=3, max_workers=2, artifact_dir=artifact_dir)
+        assert [(row.code, row.physical_error_rate) for row in rows] == [(CODE_NAMES[0], 0.0), (CODE_NAMES[0], 0.2), (CODE_NAMES[1], 0.0), (CODE_NAMES[1], 0.2)]
+        with output_path.open() as f:
+            written = list(csv.DictReader(f))
+        assert len(written) == 4
+        assert set(written[0]) == {field.name for field in fields(ThresholdRow)}
+        assert {(row["code"], float(row["physical_error_rate"]), int(row["num_failures"])) for row in written} == {(row.code, row.physical_error_rate, row.num_failures) for row in rows}
+        # The workers saved the circuits they built for each other (and later sweeps) to load
+        assert list(artifact_dir.glob("*.qpy"))
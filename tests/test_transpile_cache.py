@@ -0,0 +1,92 @@
+from pathlib import Path
+
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
+from qiskit.quantum_info import Statevector
+from qiskit_aer import AerSimulator
+from qiskit_aer.noise import NoiseModel, depolarizing_error
+
+from qecc.fingerprint import circuit_fingerprint
+from qecc.simulation import statevector_simulator
+from qecc.transpile_cache import TranspileCache
+
+from .utils import CompBasisState
+
+
+def get_circuit(state: Statevector, *, error_index: int = 0) -> QuantumCircuit:
+    qc = QuantumCircuit(QuantumRegister(3), ClassicalRegister(3))
+    qc.initialize(state, [0])
+    qc.cx(0, 1)
+    qc.cx(0, 2)
+    qc.x(error_index)
+    qc.measure(range(3), range(3))
+    return qc
+
+
+class TestCircuitFingerprint:
+    def test_independent_of_register_identity(self):
+        assert circuit_fingerprint(get_circuit(CompBasisState.ZERO)) == circuit_fingerprint(get_circuit(CompBasisState.ZERO))
+
+    def test_depends_on_structure(self):
+        assert circuit_fingerprint(get_circuit(CompBasisState.ZERO)) != circuit_fingerprint(get_circuit(CompBasisState.ZERO, error_index=1))
+
+    def test_depends_on_if_test_condition(self):
+        fingerprints = set()
+        for value in (1, 2):
+            qc = QuantumCircuit(QuantumRegister(1), ClassicalRegister(2))
+            with qc.if_test((qc.cregs[0], value)):
+                qc.x(0)
+            fingerprints.add(circuit_fingerprint(qc))
+        assert len(fingerprints) == 2
+
+    def test_ignoring_state_preparations(self):
+        zero, one = get_circuit(CompBasisState.ZERO), get_circuit(CompBasisState.ONE)
+        assert circuit_fingerprint(zero) != circuit_fingerprint(one)
+        assert circuit_fingerprint(zero, ignore_state_preparations=True) == circuit_fingerprint(one, ignore_state_preparations=True)
+
+
+class TestTranspileCache:
+    def test_hit_swaps_in_new_state(self):
+        cache = TranspileCache()
+        cache.transpile(get_circuit(CompBasisState.ZERO), statevector_simulator)
+        transpiled = cache.transpile(get_circuit(Statevector([0.6, 0.8])), statevector_simulator)
+        assert cache.info()[:3] == (1, 0, 1)
+        (initialize,) = (circuit_instruction.operation for circuit_instruction in transpiled.data if circuit_instruction.operation.name == "initialize")
+        assert list(initialize.params) == [0.6, 0.8]
+
+    def test_results_match_swapped_state(self):
+        cache = TranspileCache()
+        cache.transpile(get_circuit(CompBasisState.ZERO), statevector_simulator)
+        transpiled = cache.transpile(get_circuit(CompBasisState.ONE), statevector_simulator)
+        assert statevector_simulator.run(transpiled, shots=16).result().get_counts() == {"110": 16}
+
+    def test_backend_configuration_is_part_of_the_key(self):
+        cache = TranspileCache()
+        cache.transpile(get_circuit(CompBasisState.ZERO), statevector_simulator)
+        # The same name and method, but different basis gates, or a noise model
+        restricted = AerSimulator(basis_gates=["cx", "u", "measure", "initialize"])
+        transpiled = cache.transpile(get_circuit(CompBasisState.ZERO), restricted)
+        assert cache.info()[:3] == (0, 0, 2)
+        assert set(transpiled.count_ops()) <= {"cx", "u", "measure", "initialize"}
+        noise_model = NoiseModel()
+        noise_model.add_all_qubit_quantum_error(depolarizing_error(0.1, 1), ["x"])
+        cache.transpile(get_circuit(CompBasisState.ZERO), AerSimulator(noise_model=noise_model))
+        cache.transpile(get_circuit(CompBasisState.ZERO), AerSimulator(basis_gates=["cx", "u", "measure", "initialize"]))
+        assert cache.info()[:3] == (1, 0, 3)
+
+    def test_lru_eviction(self):
+        cache = TranspileCache(maxsize=1)
+        cache.transpile(get_circuit(CompBasisState.ZERO), statevector_simulator)
+        cache.transpile(get_circuit(CompBasisState.ZERO, error_index=1), statevector_simulator)
+        cache.transpile(get_circuit(CompBasisState.ZERO), statevector_simulator)
+        assert cache.info().misses == 3
+        assert cache.info().currsize == 1
+
+    def test_disk_layer(self, tmp_path: Path):
+        TranspileCache(cache_dir=tmp_path).transpile(get_circuit(CompBasisState.ZERO), statevector_simulator)
+        assert len(list(tmp_path.glob("*.qpy"))) == 1
+
+        # A fresh cache (e.g. in another process) finds the transpiled circuit on disk
+        cache = TranspileCache(cache_dir=tmp_path)
+        transpiled = cache.transpile(get_circuit(CompBasisState.ONE), statevector_simulator)
+        assert cache.info()[:3] == (0, 1, 0)
+        assert statevector_simulator.run(transpiled, shots=16).result().get_counts() == {"110": 16}
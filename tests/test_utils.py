@@ -1,4 +1,4 @@
-from tests.utils import combs_of_strings, flip, flip_bit_at_index
+from tests.utils import QuantumCircuitTest, combs_of_strings, flip, flip_bit_at_index
 
 
 class TestCombsOfStrings:
@@ -20,3 +20,16 @@ class TestFlipBitAtIndex:
         assert flip_bit_at_index("0000000", 2) == "0000100"
         assert flip_bit_at_index("1010101", 3) == "1011101"
         assert flip_bit_at_index("1111000", 6) == "0111000"
+
+
+class TestRandomStates:
+    class SeededTest(QuantumCircuitTest):
+        SIMULATION_SEED = 0
+
+    def test_seeded_states_restart_for_each_test(self):
+        probabilities = []
+        for _ in range(2):
+            self.SeededTest().setup_method()
+            probabilities.append([self.SeededTest.get_random_state_vector_and_exact_probabilities()[1:] for _ in range(3)])
+        assert probabilities[0] == probabilities[1]
+        assert len(set(probabilities[0])) == 3
@@ -1,12 +1,20 @@
 import itertools
 import math
+from collections.abc import Callable
 from math import sqrt
 
-from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister, transpile
+import numpy as np
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister
 from qiskit.quantum_info import Statevector, random_statevector
-from qiskit_aer import AerSimulator
 
-simulator = AerSimulator()
+from qecc.error_sweep import NO_ERROR, ErrorLocation, simulate_error_sweep
+from qecc.exact_simulation import evolve_statevector, get_outcome_probabilities
+from qecc.instrumentation import span
+from qecc.measurement_record import MeasurementRecord, get_registers
+from qecc.parameterized_state import append_parameterized_state_preparation, bind_state, simulate_circuit_for_states
+from qecc.sequential_test import run_sequential_ratio_test
+from qecc.simulation import simulate_circuit, simulate_circuit_grouped_record, statevector_simulator
+from qecc.transpile_cache import transpile_cache
 
 
 class CompBasisState:
@@ -20,22 +28,59 @@ class HadBasisState:
 
 
 class QuantumCircuitTest:
+    # Check circuits against their exact outcome probabilities, rather than by sampling shots, which is far faster, and
+    #  can't fail by chance. Every test class of the codes also has a `SampledVerification` twin, which checks the same
+    #  circuits on Aer, so a bug in `exact_simulation` can't hide the same bug in a code
+    EXACT_VERIFICATION: bool = True
+    # The expected ratios for random state vectors are only accurate to 1 part in 10000
+    EXACT_TOLERANCE: float = 1e-3
+    # Seeding the sampled simulations makes them, and the number of shots the sequential test needs, reproducible, and
+    #  lets their results be cached (set by the --result-cache option)
+    SIMULATION_SEED: int | None = None
+    # The generator of random state vectors, restarted from the SIMULATION_SEED (if there is one) before each test
+    random_states: np.random.Generator = np.random.default_rng()
+
+    def setup_method(self) -> None:
+        type(self).random_states = np.random.default_rng(self.SIMULATION_SEED)
+
     @staticmethod
-    def get_initialized_qc(state_to_initialize: Statevector, *, num_qubits: int, clreg_sizes: tuple[int, ...] = (0,)) -> QuantumCircuit:
+    def get_initialized_qc(state_to_initialize: Statevector | None, *, num_qubits: int, clreg_sizes: tuple[int, ...] = (0,)) -> QuantumCircuit:
         """
         Given a (normalized) state vector, return a quantum circuit with the specified number of qubits, with the first
           qubit initialised to the input vector
+        If the state vector is None, the first qubit is instead prepared in a parameterised state, to be bound when the
+          circuit is run (see `check_results_two_results_ratio_for_random_states`)
         """
         clregs = [ClassicalRegister(size) for size in clreg_sizes]
         out = QuantumCircuit(QuantumRegister(num_qubits), *clregs)
-        out.initialize(state_to_initialize, [0])
+        if state_to_initialize is None:
+            append_parameterized_state_preparation(out)
+        else:
+            out.initialize(state_to_initialize, [0])
         return out
 
-    @staticmethod
-    def simulate_circuit(qc: QuantumCircuit, num_shots: int = 1024) -> dict[str, int]:
-        compiled_circuit = transpile(qc, simulator)
-        result = simulator.run(compiled_circuit, shots=num_shots).result()
-        return result.get_counts()
+    @classmethod
+    def get_seed(cls, batch_index: int = 0) -> int | None:
+        """
+        With a `SIMULATION_SEED`, each batch of shots of the same circuit is given its own seed, drawn from a
+          `SeedSequence` rather than counting up, since Aer seeds each shot with the job's seed plus the shot's index, so
+          jobs with nearby seeds would share most of their shots
+        """
+        return None if cls.SIMULATION_SEED is None else int(np.random.SeedSequence((cls.SIMULATION_SEED, batch_index)).generate_state(1)[0])
+
+    @classmethod
+    def simulate_circuit(cls, qc: QuantumCircuit, num_shots: int = 1024, *, batch_index: int = 0) -> dict[str, int]:
+        """
+        Clifford circuits (i.e. all of them, unless initialised with a non-stabilizer state) are run on a stabilizer
+          simulator, everything else falls back to a statevector simulator
+        """
+        with span("simulate", qc, num_shots=num_shots):
+            return simulate_circuit(qc, num_shots=num_shots, seed=cls.get_seed(batch_index))
+
+    @classmethod
+    def simulate_circuit_grouped_record(cls, qc: QuantumCircuit, num_shots: int = 1024, *, batch_index: int = 0) -> MeasurementRecord:
+        with span("simulate", qc, num_shots=num_shots):
+            return simulate_circuit_grouped_record(qc, num_shots=num_shots, seed=cls.get_seed(batch_index))
 
     @classmethod
     def _check_results_ratio(
@@ -47,13 +92,16 @@ class QuantumCircuitTest:
         *,
         num_std_devs: float = 4.0,
         hadamard_qubits: int = 0,
-        num_shots: int = 1024,
+        num_shots: int | None = None,
     ) -> None:
         """
         Generic function to check quantum circuit measurement results against expected ratios.
 
-        Uses binomial distribution to determine acceptable variance. With num_std_devs=4.0,
-        a correct implementation has ~99.99% chance of passing.
+        With EXACT_VERIFICATION, the exact outcome probabilities are compared against the expected ratios.
+        Otherwise, if num_shots is given, that many shots are sampled, and a binomial distribution is used to determine
+        acceptable variance. With num_std_devs=4.0, a correct implementation has ~99.99% chance of passing. Without
+        num_shots, shots are sampled in batches until a sequential test accepts or rejects the ratios (see
+        `_check_results_ratio_sequentially`).
 
         Args:
             qc: The quantum circuit to measure
@@ -62,20 +110,73 @@ class QuantumCircuitTest:
             expected_ratios: Tuple of ints representing the expected ratios (e.g., (1, 1) for 50/50, (1, 1, 1, 1) for even 4-way)
             num_std_devs: Number of standard deviations for tolerance (default 4.0)
         """
-        for qb_index in range(hadamard_qubits):
-            qc.h(qb_index)
-        qc.measure_all()
-        measurements = cls.simulate_circuit(qc, num_shots=num_shots)
+        with span("check_results_ratio", qc, exact=cls.EXACT_VERIFICATION):
+            with span("build"):
+                for qb_index in range(hadamard_qubits):
+                    qc.h(qb_index)
+                qc.measure_all()
+            if not cls.EXACT_VERIFICATION and num_shots is None:
+                cls._check_results_ratio_sequentially(qc, qreg_results, clreg_results, expected_ratios)
+                return
+            measurements = get_outcome_probabilities(qc) if cls.EXACT_VERIFICATION else cls.simulate_circuit(qc, num_shots=num_shots)
+            with span("check"):
+                cls._check_measurements_ratio(measurements, qreg_results, clreg_results, expected_ratios, num_std_devs=num_std_devs)
 
+    @classmethod
+    def _check_results_ratio_sequentially(cls, qc: QuantumCircuit, qreg_results: tuple[str, ...], clreg_results: tuple[str, ...], expected_ratios: tuple[int, ...]) -> None:
+        """
+        Sample the measured circuit in batches until a sequential probability ratio test accepts or rejects the expected
+          ratios, so a single certain result is confirmed in a couple of batches, and only outcomes close to being off
+          by the test's tolerance need many shots (see `qecc.sequential_test`)
+        """
+        registers = get_registers(qc)
+        # The expected outcomes as packed measurement records, compared with the sampled shots' without formatting either
+        #  as strings
+        correct_results = MeasurementRecord.from_outcomes([qreg_results[i] + " " + clreg_results[i] for i in range(len(qreg_results))], qc.num_clbits, registers)
+        with span("sequential_test") as test_span:
+            batch_indexes = itertools.count()
+            result = run_sequential_ratio_test(
+                lambda num_shots: cls.simulate_circuit_grouped_record(qc, num_shots=num_shots, batch_index=next(batch_indexes)).packed_counts(),
+                {outcome.tobytes(): ratio for outcome, ratio in zip(correct_results.packed, expected_ratios, strict=True)},
+            )
+            if test_span is not None:
+                test_span.args |= {"decision": result.decision, "num_shots": result.num_shots}
+        assert result.accepted, (
+            f"Sequential test was {result.decision} after {result.num_shots} shots "
+            f"(rejected result: {result.rejected_outcome and MeasurementRecord.from_packed_counts({result.rejected_outcome: 1}, qc.num_clbits, registers).counts()}): "
+            f"{MeasurementRecord.from_packed_counts(result.counts, qc.num_clbits, registers).counts()}"
+        )
+
+    @classmethod
+    def _check_measurements_ratio(
+        cls,
+        measurements: dict[str, int] | dict[str, float],
+        qreg_results: tuple[str, ...],
+        clreg_results: tuple[str, ...],
+        expected_ratios: tuple[int, ...],
+        *,
+        num_std_devs: float = 4.0,
+    ) -> None:
+        """
+        Check measurement counts (or with `EXACT_VERIFICATION`, outcome probabilities) against expected ratios (see
+          `_check_results_ratio`)
+        """
         # Add a space, because adding an empty classical register adds a space to the output
         correct_results_little_endian = [qreg_results[i] + " " + clreg_results[i] for i in range(len(qreg_results))]
 
         # Check we only have the expected results
         assert set(measurements.keys()) == set(correct_results_little_endian), f"Measurements : {measurements}"
 
-        total_shots = sum(measurements.values())
         ratio_sum = sum(expected_ratios)
 
+        if cls.EXACT_VERIFICATION:
+            for i, result in enumerate(correct_results_little_endian):
+                expected_prob = expected_ratios[i] / ratio_sum
+                assert abs(measurements[result] - expected_prob) <= cls.EXACT_TOLERANCE, f"Result '{result}': expected probability {expected_prob:.4f}, got {measurements[result]:.4f}"
+            return
+
+        total_shots = sum(measurements.values())
+
         for i, result in enumerate(correct_results_little_endian):
             expected_prob = expected_ratios[i] / ratio_sum
             expected_count = total_shots * expected_prob
@@ -92,8 +193,7 @@ class QuantumCircuitTest:
         Given a quantum circuit and a single correct result, measure the circuit, and check the results of the
           measurement match the inputted correct result
         """
-        # Only run 8 shots, because we only expect one result, so we don't care about ratios at all
-        cls._check_results_ratio(qc, (qreg_result,), (clreg_result,), (1,), hadamard_qubits=hadamard_qubits, num_shots=8)
+        cls._check_results_ratio(qc, (qreg_result,), (clreg_result,), (1,), hadamard_qubits=hadamard_qubits)
 
     @classmethod
     def check_results_two_results_ratio(
@@ -105,7 +205,7 @@ class QuantumCircuitTest:
         *,
         num_std_devs: float = 4.0,
         hadamard_qubits: int = 0,
-        num_shots: int = 1024,
+        num_shots: int | None = None,
     ) -> None:
         """
         Given a quantum circuit and two expected results, measure the circuit and check the results
@@ -113,6 +213,61 @@ class QuantumCircuitTest:
         """
         cls._check_results_ratio(qc, qreg_results, clreg_results, expected_ratio, num_std_devs=num_std_devs, hadamard_qubits=hadamard_qubits, num_shots=num_shots)
 
+    @classmethod
+    def check_results_two_results_ratio_for_random_states(
+        cls,
+        qc: QuantumCircuit,
+        qreg_results: tuple[str, str],
+        clreg_results: tuple[str, str],
+        *,
+        num_states: int = 4,
+        num_std_devs: float = 4.0,
+        num_shots: int = 1024,
+    ) -> None:
+        """
+        Given a quantum circuit initialised with a parameterised state, and the two results expected for the first
+          qubit being |0> and |1>, run the circuit once for a batch of random state vectors, and check the results
+          for each state match its probabilities within statistical tolerance
+        """
+        states_and_probabilities = [cls.get_random_state_vector_and_exact_probabilities() for _ in range(num_states)]
+        qc.measure_all()
+        states = [state for state, _, _ in states_and_probabilities]
+        if cls.EXACT_VERIFICATION:
+            all_measurements = [get_outcome_probabilities(bind_state(qc, state)) for state in states]
+        else:
+            all_measurements = simulate_circuit_for_states(qc, states, num_shots=num_shots, seed=cls.SIMULATION_SEED)
+        for (_, prob_zero, prob_one), measurements in zip(states_and_probabilities, all_measurements, strict=True):
+            cls._check_measurements_ratio(measurements, qreg_results, clreg_results, (prob_zero, prob_one), num_std_devs=num_std_devs)
+
+    @classmethod
+    def check_error_sweep_even_chance(
+        cls,
+        build_circuit: Callable[[ErrorLocation], QuantumCircuit],
+        expected_results: dict[ErrorLocation, tuple[tuple[str, ...], tuple[str, ...]]],
+        *,
+        num_std_devs: float = 4.0,
+        hadamard_qubits: int = 0,
+    ) -> None:
+        """
+        Given a function building a quantum circuit with a deliberate error at a given location, and for each error
+          location the (qreg results, clreg results) expected with even chance, build the circuit for every location,
+          simulate them all as one batch, and check each location's results
+        """
+
+        def build_measured_circuit(location: ErrorLocation) -> QuantumCircuit:
+            qc = build_circuit(location)
+            for qb_index in range(hadamard_qubits):
+                qc.h(qb_index)
+            qc.measure_all()
+            return qc
+
+        if cls.EXACT_VERIFICATION:
+            all_measurements = {location: get_outcome_probabilities(build_measured_circuit(location)) for location in expected_results}
+        else:
+            all_measurements = simulate_error_sweep(build_measured_circuit, expected_results, seed=cls.SIMULATION_SEED)
+        for location, (qreg_results, clreg_results) in expected_results.items():
+            cls._check_measurements_ratio(all_measurements[location], qreg_results, clreg_results, tuple(1 for _ in qreg_results), num_std_devs=num_std_devs)
+
     @classmethod
     def check_results_n_results_even_chance(
         cls, qc: QuantumCircuit, qreg_results: tuple[str, ...], clreg_results: tuple[str, ...] | None = None, *, num_std_devs: float = 4.0, hadamard_qubits: int = 0
@@ -134,8 +289,34 @@ class QuantumCircuitTest:
         """
         cls.check_results_two_results_ratio(qc, qreg_results, clreg_results, expected_ratio=(1, 1), hadamard_qubits=hadamard_qubits)
 
-    @staticmethod
-    def get_random_state_vector_and_exact_probabilities(min_probability: float = 0.1) -> tuple[Statevector, int, int]:
+    @classmethod
+    def check_coherent_correction(cls, qc: QuantumCircuit, syndrome: str) -> None:
+        """
+        Given a unitary circuit which encodes qubit 0, applies a deliberate error, extracts the syndrome, corrects it
+          coherently, and decodes, check the circuit takes a random state on qubit 0 (with every other qubit in |0>)
+          back to the same state, with the given syndrome left on the highest qubits, and the rest back in |0>
+        """
+        state, _, _ = cls.get_random_state_vector_and_exact_probabilities()
+        initial_state = Statevector.from_label("0" * (qc.num_qubits - 1)).tensor(state)
+        expected_state = Statevector.from_label(syndrome.ljust(qc.num_qubits - 1, "0")).tensor(state)
+        assert cls.evolve_statevector(initial_state, qc).equiv(expected_state)
+
+    @classmethod
+    def evolve_statevector(cls, state: Statevector, qc: QuantumCircuit) -> Statevector:
+        """
+        With EXACT_VERIFICATION, evolve the state through the unitary circuit with `exact_simulation`, otherwise on Aer's
+          statevector simulator
+        """
+        if cls.EXACT_VERIFICATION:
+            return evolve_statevector(state, qc)
+        out = QuantumCircuit(qc.num_qubits)
+        out.set_statevector(state)
+        out.compose(qc, inplace=True)
+        out.save_statevector()
+        return statevector_simulator.run(transpile_cache.transpile(out, statevector_simulator)).result().get_statevector()
+
+    @classmethod
+    def get_random_state_vector_and_exact_probabilities(cls, min_probability: float = 0.1) -> tuple[Statevector, int, int]:
         """
         Generate a random 1-qubit state vector and return exact probabilities as integers.
         Returns (statevector, prob_zero_scaled, prob_one_scaled) where probabilities are
@@ -143,9 +324,11 @@ class QuantumCircuitTest:
 
         Filters out extreme states where either probability is below min_probability,
         to ensure both outcomes are reliably observed with limited shot counts.
+
+        The states are drawn from `random_states`, so with a `SIMULATION_SEED` each test gets the same states every run.
         """
         while True:
-            vec = random_statevector(2)
+            vec = random_statevector(2, seed=cls.random_states)
             probs = vec.probabilities()
             if probs[0] >= min_probability and probs[1] >= min_probability:
                 break
@@ -153,23 +336,42 @@ class QuantumCircuitTest:
         return vec, int(probs[0] * 10000), int(probs[1] * 10000)
 
 
+class SampledVerification:
+    """
+    Mixed in before a `QuantumCircuitTest` subclass to re-run its tests on Aer, by sampling shots (and evolving
+      statevectors), rather than against exact outcome probabilities, so the codes are checked against an independent
+      simulator, and the sampling paths (the sequential test, batched and swept simulation, and with --result-cache,
+      the result cache) are tested end-to-end against the codes too
+    """
+
+    EXACT_VERIFICATION = False
+    SIMULATION_SEED = 0
+
+
 class ThreeQubitEncodingQuantumCircuitTest(QuantumCircuitTest):
     ERROR_INDEXES_AND_SYNDROME_MEASUREMENTS: tuple[tuple[int | None, str], ...] = ((None, "00"), (0, "01"), (1, "10"), (2, "11"))
 
+    @classmethod
+    def get_error_locations_and_syndrome_measurements(cls, error: str) -> list[tuple[ErrorLocation, str]]:
+        """
+        `ERROR_INDEXES_AND_SYNDROME_MEASUREMENTS`, with each error index given as the location of the given error type
+        """
+        return [(NO_ERROR if error_index is None else ErrorLocation(error, error_index), syndrome) for error_index, syndrome in cls.ERROR_INDEXES_AND_SYNDROME_MEASUREMENTS]
+
     @staticmethod
-    def get_initialized_qc(state_to_initialize: Statevector, *, num_qubits: int = 3, clreg_sizes: tuple[int, ...] = (0,)) -> QuantumCircuit:
+    def get_initialized_qc(state_to_initialize: Statevector | None, *, num_qubits: int = 3, clreg_sizes: tuple[int, ...] = (0,)) -> QuantumCircuit:
         return QuantumCircuitTest.get_initialized_qc(state_to_initialize, num_qubits=num_qubits, clreg_sizes=clreg_sizes)
 
 
 class NineQubitEncodingQuantumCircuitTest(QuantumCircuitTest):
     @staticmethod
-    def get_initialized_qc(state_to_initialize: Statevector, *, num_qubits: int = 9, clreg_sizes: tuple[int, ...] = (0,)) -> QuantumCircuit:
+    def get_initialized_qc(state_to_initialize: Statevector | None, *, num_qubits: int = 9, clreg_sizes: tuple[int, ...] = (0,)) -> QuantumCircuit:
         return QuantumCircuitTest.get_initialized_qc(state_to_initialize, num_qubits=num_qubits, clreg_sizes=clreg_sizes)
 
 
 class SevenQubitEncodingQuantumCircuitTest(QuantumCircuitTest):
     @staticmethod
-    def get_initialized_qc(state_to_initialize: Statevector, *, num_qubits: int = 7, clreg_sizes: tuple[int, ...] = (0,)) -> QuantumCircuit:
+    def get_initialized_qc(state_to_initialize: Statevector | None, *, num_qubits: int = 7, clreg_sizes: tuple[int, ...] = (0,)) -> QuantumCircuit:
         return QuantumCircuitTest.get_initialized_qc(state_to_initialize, num_qubits=num_qubits, clreg_sizes=clreg_sizes)
 
 